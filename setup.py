@@ -18,17 +18,17 @@ setup(
         "Intended Audience :: Developers",
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
 
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.7",
     install_requires=[
         "requests",
         "websocket-client",
-        "websockets"
+        "websockets",
+        "numpy"
     ],
 )
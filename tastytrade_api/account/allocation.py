@@ -0,0 +1,128 @@
+from typing import Dict, List, Optional
+
+from tastytrade_api.concurrency import fan_out
+
+
+def _whole_quantity(value, name: str) -> int:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise Exception(f"{name} must be a positive integer, got {value!r}")
+    if number <= 0 or not number.is_integer():
+        raise Exception(f"{name} must be a positive integer, got {value!r}")
+    return int(number)
+
+
+def scale_order(order: dict, quantity) -> dict:
+    """
+    Returns a copy of an order with every leg quantity multiplied by `quantity`. The order is left unchanged.
+
+    Args:
+        order (dict): The order template, with leg quantities for one unit of the strategy. Quantities may be
+            numbers or numeric strings, as in orders returned by the API.
+        quantity (int): The number of units.
+
+    Returns:
+        dict: The scaled order, with integer leg quantities.
+
+    Raises:
+        Exception: If `quantity` or a leg quantity is not a positive integer.
+    """
+    units = _whole_quantity(quantity, "Quantity")
+    return dict(order, legs=[
+        dict(leg, quantity=_whole_quantity(leg["quantity"], f"Quantity of leg {leg.get('symbol')}") * units)
+        for leg in order["legs"]
+    ])
+
+
+class AccountOrder:
+    """
+    The order sent to one account of an allocation.
+
+    Args:
+        account_number (str): The account number.
+        quantity (int): The number of strategy units allocated to the account.
+        order (dict): The order that is sent to the account.
+    """
+
+    def __init__(self, account_number, quantity, order):
+        self.account_number = account_number
+        self.quantity = quantity
+        self.order = order
+        self.handle = None
+        # Raised while submitting, so no order exists for the account
+        self.error: Optional[Exception] = None
+        # Raised while waiting for an accepted order, whose status may be stale
+        self.wait_error: Optional[Exception] = None
+
+    @property
+    def order_id(self):
+        """The ID of the account's order, or None if it was not accepted."""
+        return self.handle.order_id if self.handle else None
+
+    @property
+    def status(self) -> Optional[str]:
+        """str: The latest known status of the account's order, or "error" if it was not accepted."""
+        if self.error is not None:
+            return "error"
+        return self.handle.status
+
+    @property
+    def net_fill_amount(self) -> Optional[float]:
+        """float: The net fill amount per unit of order size, or None if the order has no fills."""
+        if self.handle is None or not self.handle.fills:
+            return None
+        return self.handle.net_fill_amount()
+
+    def __str__(self):
+        return f"Account: {self.account_number}, Quantity: {self.quantity}, Order: {self.order_id}, Status: {self.status}"
+
+
+class Allocation:
+    """
+    The orders of one strategy allocated across several accounts.
+
+    Args:
+        orders (list of AccountOrder): One order per account, in the order the accounts were given.
+    """
+
+    def __init__(self, orders: List[AccountOrder]):
+        self.orders = orders
+
+    def __getitem__(self, account_number) -> AccountOrder:
+        for order in self.orders:
+            if order.account_number == account_number:
+                return order
+        raise KeyError(account_number)
+
+    @property
+    def failed(self) -> List[AccountOrder]:
+        """list: The account orders that were not accepted, or whose wait failed so their status may be stale."""
+        return [order for order in self.orders if order.error is not None or order.wait_error is not None]
+
+    @property
+    def statuses(self) -> Dict[str, Optional[str]]:
+        """dict: Account number -> latest known order status."""
+        return {order.account_number: order.status for order in self.orders}
+
+    def wait(self, timeout: float = 10.0):
+        """
+        Waits until every accepted order reaches a final status or the timeout expires. The handles wait on the
+        same streamer events, so the total wait is that of the slowest order. An account whose wait raised, e.g.
+        because its order could not be fetched, keeps the error in its wait_error and is listed in failed.
+
+        Args:
+            timeout (float): Seconds to wait for each order. Defaults to 10.0.
+
+        Returns:
+            Allocation: This allocation.
+        """
+        calls = {
+            order.account_number: (lambda handle=order.handle: handle.wait(timeout))
+            for order in self.orders if order.handle is not None
+        }
+        _, errors = fan_out(calls, max(len(calls), 1))
+        for order in self.orders:
+            if order.account_number in errors:
+                order.wait_error = errors[order.account_number]
+        return self
@@ -0,0 +1,132 @@
+import datetime
+import os
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from tastytrade_api.account.balances_positions import TastytradeAccountPositions
+from tastytrade_api.concurrency import DEFAULT_MAX_WORKERS, fan_out
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class BalanceSnapshotExporter:
+    """
+    Exports balance snapshots for date ranges to typed columnar NumPy .npz files, one file per account and time of
+    day. Snapshots are fetched concurrently, and dates that are already on disk are not requested again.
+
+    Numeric fields are stored as float64 columns, other fields as fixed-width string columns, and the requested
+    date as a datetime64[D] "date" column sorted ascending. A numeric column that later receives a value that is
+    not a number is converted to a string column as a whole.
+
+    Args:
+        session_token (str): The session token used to authenticate API requests.
+        api_url (str): The base URL of the API.
+        directory (str): The directory the .npz files are written to.
+        max_workers (int): The maximum number of requests in flight at once. Defaults to 16.
+    """
+
+    def __init__(self, session_token, api_url, directory: str, max_workers=DEFAULT_MAX_WORKERS):
+        self.positions = TastytradeAccountPositions(session_token, api_url)
+        self.directory = directory
+        self.max_workers = max_workers
+
+    def path_for(self, account_number: str, time_of_day: str = "EOD") -> str:
+        """
+        Returns the path of the .npz file holding an account's snapshots.
+        """
+        return os.path.join(self.directory, f"{account_number}_{time_of_day}.npz")
+
+    def load(self, account_number: str, time_of_day: str = "EOD") -> Dict[str, np.ndarray]:
+        """
+        Loads an account's exported snapshots.
+
+        Args:
+            account_number (str): The account number.
+            time_of_day (str): "EOD" or "BOD". Defaults to "EOD".
+
+        Returns:
+            dict: Dictionary of column name -> array, empty if nothing was exported yet.
+        """
+        path = self.path_for(account_number, time_of_day)
+        if not os.path.exists(path):
+            return {}
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+
+    def export(self, account_numbers: List[str], start_date: datetime.date, end_date: datetime.date,
+               time_of_day: str = "EOD", weekdays_only: bool = True) -> Tuple[Dict[str, int], Dict]:
+        """
+        Fetches the snapshots of every account for every date in the range that is not on disk yet, and appends
+        them to the accounts' .npz files.
+
+        Args:
+            account_numbers (list of str): The accounts to export.
+            start_date (datetime.date): The first date to export.
+            end_date (datetime.date): The last date to export.
+            time_of_day (str): "EOD" (End of Day) or "BOD" (Beginning of Day). Defaults to "EOD".
+            weekdays_only (bool): Whether to skip Saturdays and Sundays. Defaults to True.
+
+        Returns:
+            tuple: A (written, errors) pair. written maps each account number to the number of new rows; errors
+            maps (account number, date) to the exception raised for snapshots that could not be fetched.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        dates = [start_date + datetime.timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        if weekdays_only:
+            dates = [d for d in dates if d.weekday() < 5]
+
+        existing = {}
+        calls = {}
+        for account_number in account_numbers:
+            existing[account_number] = self.load(account_number, time_of_day)
+            stored = set(existing[account_number].get("date", np.empty(0, dtype="datetime64[D]")).tolist())
+            for date in dates:
+                if date not in stored:
+                    calls[(account_number, date)] = lambda n=account_number, d=date: \
+                        self.positions.get_balance_snapshots(n, d.isoformat(), time_of_day)["data"]
+
+        results, errors = fan_out(calls, self.max_workers)
+
+        written = {}
+        for account_number in account_numbers:
+            rows = {date: data for (n, date), data in results.items() if n == account_number}
+            written[account_number] = len(rows)
+            if rows:
+                columns = self._merge(existing[account_number], rows)
+                np.savez(self.path_for(account_number, time_of_day), **columns)
+        return written, errors
+
+    @staticmethod
+    def _merge(existing: Dict[str, np.ndarray], rows: Dict[datetime.date, dict]) -> Dict[str, np.ndarray]:
+        dates = sorted(rows)
+        count = len(existing["date"]) if existing else 0
+        columns = {"date": np.concatenate([existing.get("date", np.empty(0, dtype="datetime64[D]")),
+                                           np.array(dates, dtype="datetime64[D]")])}
+        fields = sorted(({field for data in rows.values() for field in data} | set(existing)) - {"date"})
+        for field in fields:
+            values = [rows[date].get(field) for date in dates]
+            floats = [_to_float(value) for value in values]
+            old = existing.get(field)
+            # A column stays numeric only while every value parses; otherwise the whole column, including the
+            # values already on disk, is converted to strings rather than losing the new values as NaN
+            numeric = (old is None or old.dtype.kind == "f") and \
+                all(f is not None or v is None for f, v in zip(floats, values))
+            if numeric:
+                new = np.array([np.nan if f is None else f for f in floats], dtype=np.float64)
+                old = np.full(count, np.nan) if old is None else old
+            else:
+                new = np.array(["" if v is None else str(v) for v in values], dtype=str)
+                if old is None:
+                    old = np.full(count, "", dtype=str)
+                elif old.dtype.kind == "f":
+                    old = np.array(["" if np.isnan(f) else repr(float(f)) for f in old], dtype=str)
+            columns[field] = np.concatenate([old, new])
+
+        order = np.argsort(columns["date"], kind="stable")
+        return {field: column[order] for field, column in columns.items()}
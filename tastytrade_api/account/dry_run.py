@@ -0,0 +1,98 @@
+from typing import List, Optional
+
+import numpy as np
+
+from tastytrade_api.account.transactions import signed_amount
+from tastytrade_api.concurrency import DEFAULT_MAX_WORKERS, RateLimiter, fan_out
+
+
+class DryRunResults:
+    """
+    The parsed dry runs of a batch of candidate orders, one array entry per candidate in the order given.
+
+    Attributes:
+        orders (list): The candidate orders.
+        buying_power_change (np.ndarray): Signed change in buying power; negative values use buying power. NaN
+            for failed candidates.
+        margin_change (np.ndarray): Signed change in margin requirement. NaN for failed candidates.
+        fees (np.ndarray): Total fees paid, positive when the order costs fees. NaN for failed candidates.
+        warnings (np.ndarray): Object array holding the list of warning messages of each candidate.
+        errors (list): The exception of each failed candidate, or None.
+    """
+
+    def __init__(self, orders: List[dict], responses: List[Optional[dict]], errors: List[Optional[Exception]]):
+        self.orders = orders
+        self.errors = errors
+        size = len(orders)
+        self.buying_power_change = np.full(size, np.nan)
+        self.margin_change = np.full(size, np.nan)
+        self.fees = np.full(size, np.nan)
+        self.warnings = np.empty(size, dtype=object)
+        for i, response in enumerate(responses):
+            self.warnings[i] = []
+            if response is None:
+                continue
+            data = response.get("data", {})
+            effect = data.get("buying-power-effect") or {}
+            self.buying_power_change[i] = signed_amount(effect.get("change-in-buying-power"),
+                                                        effect.get("change-in-buying-power-effect"))
+            self.margin_change[i] = signed_amount(effect.get("change-in-margin-requirement"),
+                                                  effect.get("change-in-margin-requirement-effect"))
+            fees = data.get("fee-calculation") or {}
+            self.fees[i] = -signed_amount(fees.get("total-fees"), fees.get("total-fees-effect"))
+            self.warnings[i] = [warning.get("message") or warning.get("code") for warning in data.get("warnings", [])]
+
+    @property
+    def ok(self) -> np.ndarray:
+        """np.ndarray: Boolean mask of the candidates whose dry run succeeded."""
+        return np.array([error is None for error in self.errors], dtype=bool)
+
+    def rank(self, fee_weight: float = 1.0, allow_warnings: bool = True) -> np.ndarray:
+        """
+        Returns the indices of the successful candidates, cheapest first by buying power used plus weighted fees.
+
+        Args:
+            fee_weight (float): The weight of fees against buying power. Defaults to 1.0.
+            allow_warnings (bool): Whether candidates with warnings are ranked. Defaults to True.
+
+        Returns:
+            np.ndarray: The candidate indices.
+        """
+        mask = self.ok
+        if not allow_warnings:
+            mask &= np.array([not warnings for warnings in self.warnings], dtype=bool)
+        cost = -self.buying_power_change + fee_weight * np.nan_to_num(self.fees)
+        indices = np.flatnonzero(mask)
+        return indices[np.argsort(cost[indices], kind="stable")]
+
+    def __len__(self):
+        return len(self.orders)
+
+
+def dry_run_many(order_client, account_number, orders: List[dict], max_workers=DEFAULT_MAX_WORKERS,
+                 requests_per_second: float = None) -> DryRunResults:
+    """
+    Runs dry_run_new_order for many candidate orders concurrently.
+
+    Args:
+        order_client (TastytradeOrder): The client used to send the dry runs.
+        account_number (str): The account number.
+        orders (list of dict): The candidate orders.
+        max_workers (int): The maximum number of requests in flight at once. Defaults to 16.
+        requests_per_second (float, optional): The maximum number of requests started per second. Defaults to
+            None (no limit).
+
+    Returns:
+        DryRunResults: The parsed dry runs.
+    """
+    rate_limiter = RateLimiter(requests_per_second) if requests_per_second else None
+    calls = {
+        i: lambda order=order: order_client.dry_run_new_order(account_number, order)
+        for i, order in enumerate(orders)
+    }
+    results, errors = fan_out(calls, max_workers, rate_limiter)
+    return DryRunResults(
+        list(orders),
+        [results.get(i) for i in range(len(orders))],
+        [errors.get(i) for i in range(len(orders))]
+    )
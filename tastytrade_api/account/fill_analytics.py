@@ -0,0 +1,142 @@
+import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from tastytrade_api.account.order_builder import leg_sign
+
+
+def parse_times(values: List[Optional[str]]) -> np.ndarray:
+    """
+    Converts API timestamps such as "2023-10-19T14:00:00.123+00:00" to epoch seconds.
+
+    UTC timestamps, which is what the API returns, are parsed by NumPy in one pass; other offsets fall back to
+    datetime.fromisoformat.
+
+    Args:
+        values (list of str): The timestamps. Missing values become NaN.
+
+    Returns:
+        np.ndarray: The timestamps in seconds since the epoch, as float64.
+    """
+    stripped = []
+    for value in values:
+        if not value:
+            stripped.append("NaT")
+        elif value.endswith("+00:00") or value.endswith("Z"):
+            stripped.append(value[:-6] if value.endswith("+00:00") else value[:-1])
+        else:
+            parsed = datetime.datetime.fromisoformat(value).astimezone(datetime.timezone.utc)
+            stripped.append(parsed.replace(tzinfo=None).isoformat())
+    times = np.array(stripped, dtype="datetime64[ms]")
+    seconds = times.astype(np.int64) / 1000.0
+    seconds[np.isnat(times)] = np.nan
+    return seconds
+
+
+class FillAnalytics:
+    """
+    Fill and slippage statistics of many orders, computed with NumPy over one flat array of every fill.
+
+    Prices are signed like net_fill_amount: credits are positive and debits negative, so a positive slippage is
+    always in our favor.
+
+    Args:
+        orders (list of dict): Order objects, as returned by get_order, get_orders or the account streamer.
+        reference_prices (dict, optional): Dictionary of order id -> signed net price per unit of order size at
+            submit time, for example the mid from net_prices. Defaults to None.
+
+    Attributes:
+        order_ids (np.ndarray): The order IDs.
+        net_fill (np.ndarray): Signed net fill price per unit of order size, NaN for orders without fills.
+        vwap (np.ndarray): Signed net price per unit of order size of the filled part of the order, like
+            net_prices: every leg's fills are weighted by quantity, with sell legs positive and buy legs negative.
+            Equal to net_fill for fully filled orders. NaN for orders without fills.
+        leg_vwap (list of np.ndarray): Per order, the unsigned quantity-weighted average fill price of every leg,
+            in leg order. NaN for legs without fills.
+        filled_quantity (np.ndarray): Total filled quantity over all legs.
+        limit_price (np.ndarray): Signed limit price, NaN for orders without a price.
+        slippage_vs_limit (np.ndarray): net_fill - limit_price.
+        slippage_vs_reference (np.ndarray): net_fill - reference price, NaN without a reference price.
+        time_to_first_fill (np.ndarray): Seconds from received-at to the first fill.
+        time_to_fill (np.ndarray): Seconds from received-at to the last fill.
+    """
+
+    def __init__(self, orders: List[dict], reference_prices: Dict = None):
+        self.orders = orders
+        count = len(orders)
+        self.order_ids = np.array([order["id"] for order in orders])
+        self.size = np.array([float(order.get("size") or 1) for order in orders])
+        self.received_at = parse_times([order.get("received-at") for order in orders])
+        limit_sign = np.array([-1.0 if order.get("price-effect") == "Debit" else 1.0 for order in orders])
+        prices = [order.get("price") for order in orders]
+        self.limit_price = limit_sign * np.array([np.nan if p in (None, "") else p for p in prices], dtype=float)
+
+        legs = [(i, leg) for i, order in enumerate(orders) for leg in order.get("legs", [])]
+        # Leg quantity per unit of order size summed over the legs, to turn filled quantity into filled units
+        units_quantity = np.bincount(np.array([i for i, _ in legs], dtype=np.int64),
+                                     np.array([float(leg.get("quantity") or 0) for _, leg in legs]), minlength=count)
+        fills = [
+            (i, j, leg_sign(leg["action"]), fill["quantity"], fill["fill-price"], fill.get("filled-at"))
+            for j, (i, leg) in enumerate(legs) for fill in leg.get("fills", [])
+        ]
+        if fills:
+            order_index, leg_index, sign, quantity, price, filled_at = zip(*fills)
+        else:
+            order_index, leg_index, sign, quantity, price, filled_at = (), (), (), (), (), ()
+        self.fill_order_index = np.array(order_index, dtype=np.int64)
+        self.fill_leg_index = np.array(leg_index, dtype=np.int64)
+        self.fill_quantity = np.array(quantity, dtype=float)
+        self.fill_price = np.array(price, dtype=float)
+        self.fill_time = parse_times(list(filled_at))
+        fill_sign = np.array(sign, dtype=float)
+
+        notional = self.fill_quantity * self.fill_price
+        self.filled_quantity = np.bincount(self.fill_order_index, self.fill_quantity, minlength=count)
+        has_fills = self.filled_quantity > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            signed = np.bincount(self.fill_order_index, fill_sign * notional, minlength=count)
+            self.net_fill = np.where(has_fills, signed / self.size, np.nan)
+            filled_units = self.filled_quantity / (units_quantity / self.size)
+            self.vwap = np.where(has_fills, signed / filled_units, np.nan)
+            leg_vwap = (np.bincount(self.fill_leg_index, notional, minlength=len(legs))
+                        / np.bincount(self.fill_leg_index, self.fill_quantity, minlength=len(legs)))
+        leg_counts = [len(order.get("legs", [])) for order in orders]
+        leg_starts = np.concatenate(([0], np.cumsum(leg_counts, dtype=np.int64)))
+        self.leg_vwap = [leg_vwap[start:end] for start, end in zip(leg_starts[:-1], leg_starts[1:])]
+
+        first = np.full(count, np.inf)
+        last = np.full(count, -np.inf)
+        valid = ~np.isnan(self.fill_time)
+        np.minimum.at(first, self.fill_order_index[valid], self.fill_time[valid])
+        np.maximum.at(last, self.fill_order_index[valid], self.fill_time[valid])
+        first[np.isinf(first)] = np.nan
+        last[np.isinf(last)] = np.nan
+        self.time_to_first_fill = first - self.received_at
+        self.time_to_fill = last - self.received_at
+
+        reference_prices = reference_prices or {}
+        self.reference_price = np.array(
+            [reference_prices.get(order["id"], reference_prices.get(str(order["id"]), np.nan)) for order in orders],
+            dtype=float
+        )
+        self.slippage_vs_limit = self.net_fill - self.limit_price
+        self.slippage_vs_reference = self.net_fill - self.reference_price
+
+    def __len__(self):
+        return len(self.orders)
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        Returns the count, mean, median and 90th percentile of the slippage and fill time arrays, ignoring NaN.
+        """
+        summary = {}
+        for name in ("slippage_vs_limit", "slippage_vs_reference", "time_to_first_fill", "time_to_fill"):
+            values = getattr(self, name)
+            values = values[~np.isnan(values)]
+            if len(values) == 0:
+                summary[name] = {"count": 0}
+                continue
+            summary[name] = {"count": len(values), "mean": float(values.mean()),
+                             "median": float(np.median(values)), "p90": float(np.percentile(values, 90))}
+        return summary
@@ -0,0 +1,230 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("Filled", "Cancelled", "Rejected", "Expired", "Removed")
+
+
+def net_fill_amount(order: dict) -> float:
+    """
+    Returns the net fill amount of an order per unit of order size: sell fills count positive and buy fills
+    negative.
+
+    Args:
+        order (dict): The order object, as returned by get_order or an account streamer Order message.
+
+    Returns:
+        float: The net fill amount, rounded to 2 decimals.
+    """
+    net_amount = 0
+    for leg in order['legs']:
+        for fill in leg['fills']:
+            if 'Buy' in leg['action']:
+                net_amount = net_amount + (-1) * float(fill['fill-price']) * float(fill['quantity'])
+            elif 'Sell' in leg['action']:
+                net_amount = net_amount + float(fill['fill-price']) * float(fill['quantity'])
+    return round(net_amount / order['size'], 2)
+
+
+def leg_fill_price(leg: dict) -> float:
+    """
+    Returns the quantity-weighted average fill price of an order leg, or 0.0 if the leg has no fills.
+
+    Args:
+        leg (dict): The order leg object.
+
+    Returns:
+        float: The average fill price.
+    """
+    quantity = sum(float(fill['quantity']) for fill in leg['fills'])
+    if not quantity:
+        return 0.0
+    return sum(float(fill['fill-price']) * float(fill['quantity']) for fill in leg['fills']) / quantity
+
+
+class OrderHandle:
+    """
+    A submitted order that resolves when the order reaches a final status (filled, cancelled, rejected, ...).
+
+    Handles are created by a FillTracker and updated from account streamer Order messages for their order id,
+    so the fills belong to exactly this order. The tracker releases a handle as soon as it reaches a final status,
+    whichever way the status arrived.
+
+    Args:
+        tracker (FillTracker): The tracker that owns the handle.
+        account_number (str): The account number of the order.
+        order_id (int): The ID of the order.
+        response (dict, optional): The create_order response. Defaults to None.
+    """
+
+    def __init__(self, tracker, account_number, order_id, response=None):
+        self.tracker = tracker
+        self.account_number = account_number
+        self.order_id = order_id
+        self.response = response
+        self.order: Optional[dict] = None
+        self._done = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        """bool: True once the order reached a final status."""
+        return self._done.is_set()
+
+    @property
+    def status(self) -> Optional[str]:
+        """str: The latest known order status."""
+        return self.order.get("status") if self.order else None
+
+    @property
+    def fills(self) -> List[dict]:
+        """list: The fills of every leg, each with the leg's symbol and action added."""
+        if not self.order:
+            return []
+        return [dict(fill, symbol=leg["symbol"], action=leg["action"])
+                for leg in self.order.get("legs", []) for fill in leg.get("fills", [])]
+
+    def update(self, order: dict):
+        """Stores the latest order object and resolves the handle if the order is final."""
+        if self.done:
+            return
+        self.order = order
+        if order.get("status") in TERMINAL_STATUSES:
+            self._done.set()
+            self.tracker.release(self)
+
+    def wait(self, timeout: float = 10.0) -> Optional[dict]:
+        """
+        Waits for the order to reach a final status. If no streamer event resolved the order within the timeout,
+        the order is fetched once with get_order as a fallback.
+
+        Args:
+            timeout (float): Seconds to wait. Defaults to 10.0.
+
+        Returns:
+            dict: The latest order object, which is still working if the order did not finish in time.
+        """
+        if self.tracker.attached:
+            if not self._done.wait(timeout):
+                self.update(self.tracker.fetch(self))
+        else:
+            deadline = time.monotonic() + timeout
+            while True:
+                self.update(self.tracker.fetch(self))
+                if self.done or time.monotonic() >= deadline:
+                    break
+                time.sleep(min(self.tracker.poll_interval, max(deadline - time.monotonic(), 0)))
+        return self.order
+
+    def net_fill_amount(self) -> float:
+        """float: The net fill amount per unit of order size, see net_fill_amount."""
+        return net_fill_amount(self.order)
+
+    def __str__(self):
+        return f"Order: {self.order_id}, Account: {self.account_number}, Status: {self.status}, Fills: {len(self.fills)}"
+
+
+class FillTracker:
+    """
+    Resolves submitted orders to their exact fills from account streamer Order events, matched by order id.
+
+    Without an attached streamer, handles poll get_order every `poll_interval` seconds while waiting and are not
+    registered with the tracker, since no event will ever be routed to them. Registered handles are released once
+    their order reaches a final status, from a streamer event, the create response or a get_order fallback.
+
+    Args:
+        order_client (TastytradeOrder): The client used to submit and fetch orders.
+        poll_interval (float): Seconds between get_order calls when no streamer is attached. Defaults to 0.5.
+    """
+
+    def __init__(self, order_client, poll_interval: float = 0.5):
+        self.order_client = order_client
+        self.poll_interval = poll_interval
+        self.attached = False
+        self.handles: Dict[str, OrderHandle] = {}
+        self._early_orders = OrderedDict()
+        self._lock = threading.Lock()
+
+    def attach(self, streamer):
+        """
+        Resolves handles from Order messages of an account streamer. The streamer must already be connected to
+        the accounts with 'connect_account'.
+
+        Args:
+            streamer (TastytradeStreamer): The account streamer.
+        """
+        streamer.add_listener("Order", self.on_order_message)
+        self.attached = True
+
+    def on_order_message(self, message: dict):
+        """Updates the handle of the order in an Order message."""
+        order = message.get("data") or {}
+        if order.get("id") is None:
+            return
+        order_id = str(order["id"])
+        with self._lock:
+            handle = self.handles.get(order_id)
+            if handle is None:
+                # The event can arrive before create_order returns
+                self._early_orders[order_id] = order
+                while len(self._early_orders) > 1000:
+                    self._early_orders.popitem(last=False)
+                return
+        handle.update(order)
+
+    def release(self, handle: OrderHandle):
+        """Stops routing Order messages to a handle. Called by the handle when its order reaches a final status."""
+        with self._lock:
+            if self.handles.get(str(handle.order_id)) is handle:
+                del self.handles[str(handle.order_id)]
+
+    def track(self, account_number, order_id, response=None) -> OrderHandle:
+        """
+        Returns a handle for an order that was already submitted.
+
+        Args:
+            account_number (str): The account number of the order.
+            order_id (int): The ID of the order.
+            response (dict, optional): The create_order response. Defaults to None.
+
+        Returns:
+            OrderHandle: The handle.
+        """
+        handle = OrderHandle(self, account_number, order_id, response)
+        if response is not None:
+            handle.update(response["data"]["order"])
+        if not self.attached:
+            return handle
+        with self._lock:
+            early = self._early_orders.pop(str(order_id), None)
+            if not handle.done:
+                self.handles[str(order_id)] = handle
+        if early is not None:
+            handle.update(early)
+        return handle
+
+    def submit(self, account_number, order: dict) -> OrderHandle:
+        """
+        Sends an order with create_order and returns a handle for it.
+
+        Args:
+            account_number (str): The account number.
+            order (dict): The order details.
+
+        Returns:
+            OrderHandle: The handle.
+
+        Raises:
+            Exception: If the order was not accepted.
+        """
+        response = self.order_client.create_order(account_number, order)
+        if "error" in response:
+            raise Exception(f"Error creating order: {response['error']}")
+        return self.track(account_number, response["data"]["order"]["id"], response)
+
+    def fetch(self, handle: OrderHandle) -> dict:
+        """Fetches the order of a handle with get_order."""
+        return self.order_client.get_order(handle.account_number, handle.order_id)["data"]
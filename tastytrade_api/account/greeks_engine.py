@@ -0,0 +1,261 @@
+import logging
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+from tastytrade_api.account.position_book import signed_quantity
+from tastytrade_api.streamer.dx_mapping import Greeks, Quote, parse_events
+from tastytrade_api.symbology import to_streamer_symbol
+
+logger = logging.getLogger(__name__)
+
+GREEKS = ("delta", "gamma", "theta", "vega")
+OPTION_INSTRUMENT_TYPES = ("Equity Option", "Future Option")
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class PortfolioGreeksEngine:
+    """
+    Keeps live portfolio Greeks and P&L per underlying by joining positions with dxfeed Quote and Greeks events.
+
+    Positions, multipliers, marks and Greeks are held in aligned NumPy arrays, one row per position. Each event
+    only touches the rows of its symbol and adds the change in their contribution to the per-underlying totals,
+    so a tick costs the same regardless of the portfolio size. Non-option positions have a delta of 1 and no
+    other Greeks.
+
+    P&L is reported both against the average open price ("pnl") and against the previous close ("day-pnl").
+
+    Equity option symbols are converted to streamer symbols locally. Futures and future options need the
+    exchange-qualified streamer symbol of their instrument: it is taken from the position's "streamer-symbol", from
+    `streamer_symbols`, or fetched with resolve_streamer_symbols. Until then they are listed in `unresolved` and
+    left out of subscription_symbols, since no events would arrive for them.
+
+    Args:
+        position_book (TastytradePositionBook, optional): A position book to load and follow. Defaults to None.
+        streamer_symbols (dict, optional): Tastytrade symbol -> streamer symbol. Defaults to None.
+    """
+
+    def __init__(self, position_book=None, streamer_symbols: Dict[str, str] = None):
+        self._lock = threading.RLock()
+        self.streamer_symbols = dict(streamer_symbols or {})
+        self.load_positions([])
+        if position_book is not None:
+            self.attach(position_book)
+
+    def attach(self, position_book):
+        """
+        Loads the positions of a position book and reloads them whenever the book changes.
+
+        Args:
+            position_book (TastytradePositionBook): The position book.
+        """
+        self.position_book = position_book
+        position_book.add_listener(self._on_book_change)
+        self.load_positions(position_book.get_positions())
+
+    def _on_book_change(self, kind, key, data):
+        if kind in ("position", "resync"):
+            self.load_positions(self.position_book.get_positions())
+
+    def load_positions(self, positions: List[dict]):
+        """
+        Rebuilds the arrays from a list of positions, keeping the marks and Greeks already received for symbols
+        that are still held.
+
+        Args:
+            positions (list): List of position objects, as returned by the API or a position book.
+        """
+        with self._lock:
+            previous_rows = {symbol: i for i, symbol in enumerate(getattr(self, "symbols", []))}
+            previous_mark = getattr(self, "mark", None)
+            previous_greeks = getattr(self, "greeks", None)
+
+            previous_unresolved = getattr(self, "unresolved", [])
+            self.positions = list(positions)
+            self.symbols = [self._streamer_symbol(p) for p in positions]
+            self.unresolved = sorted({p["symbol"] for p, symbol in zip(positions, self.symbols) if symbol is None})
+            if self.unresolved and self.unresolved != previous_unresolved:
+                logger.warning("No streamer symbol for %s, call resolve_streamer_symbols", self.unresolved)
+            self.symbols = [symbol or p["symbol"] for p, symbol in zip(positions, self.symbols)]
+            self.underlyings = sorted({p.get("underlying-symbol") or p["symbol"] for p in positions})
+            underlying_index = {u: i for i, u in enumerate(self.underlyings)}
+            self.underlying = np.array(
+                [underlying_index[p.get("underlying-symbol") or p["symbol"]] for p in positions], dtype=np.intp
+            )
+            self.quantity = np.array([signed_quantity(p) for p in positions], dtype=np.float64)
+            self.multiplier = np.array([float(p.get("multiplier") or 1) for p in positions], dtype=np.float64)
+            self.open_price = np.array([float(p.get("average-open-price") or 0) for p in positions], dtype=np.float64)
+            self.close_price = np.array([float(p.get("close-price") or 0) for p in positions], dtype=np.float64)
+            is_option = np.array([p.get("instrument-type") in OPTION_INSTRUMENT_TYPES for p in positions], dtype=bool)
+
+            self.rows: Dict[str, np.ndarray] = {}
+            for i, symbol in enumerate(self.symbols):
+                self.rows.setdefault(symbol, []).append(i)
+            self.rows = {symbol: np.array(rows, dtype=np.intp) for symbol, rows in self.rows.items()}
+
+            count = len(positions)
+            self.mark = np.full(count, np.nan)
+            self.greeks = {name: np.full(count, np.nan) for name in GREEKS}
+            self.greeks["delta"][~is_option] = 1.0
+            for name in ("gamma", "theta", "vega"):
+                self.greeks[name][~is_option] = 0.0
+            for i, symbol in enumerate(self.symbols):
+                j = previous_rows.get(symbol)
+                if j is not None:
+                    self.mark[i] = previous_mark[j]
+                    if is_option[i]:
+                        for name in GREEKS:
+                            self.greeks[name][i] = previous_greeks[name][j]
+
+            self._recompute_totals()
+
+    def _streamer_symbol(self, position):
+        symbol = position["symbol"]
+        streamer_symbol = position.get("streamer-symbol") or self.streamer_symbols.get(symbol)
+        if streamer_symbol:
+            return streamer_symbol
+        if symbol.startswith("/") or symbol.startswith("./"):
+            # Futures streamer symbols carry an exchange code that cannot be derived from the symbol
+            return None
+        return to_streamer_symbol(symbol)
+
+    def resolve_streamer_symbols(self, instruments) -> List[str]:
+        """
+        Fetches the streamer symbols of the futures and future options in `unresolved` and reloads the positions.
+
+        Args:
+            instruments (TastytradeInstruments): The instruments client.
+
+        Returns:
+            list: The symbols that are still unresolved.
+
+        Raises:
+            Exception: If there was an error in the GET requests.
+        """
+        with self._lock:
+            unresolved = list(self.unresolved)
+        future_options = [symbol for symbol in unresolved if symbol.startswith("./")]
+        futures = [symbol for symbol in unresolved if not symbol.startswith("./")]
+        items = (instruments.get_future_options(future_options) if future_options else []) + \
+            (instruments.get_futures(futures) if futures else [])
+        with self._lock:
+            self.streamer_symbols.update({item["symbol"]: item["streamer-symbol"] for item in items
+                                          if item.get("streamer-symbol")})
+            self.load_positions(self.positions)
+            return list(self.unresolved)
+
+    def _recompute_totals(self):
+        size = len(self.underlyings)
+        weight = self.quantity * self.multiplier
+        self.totals = {}
+        for name in GREEKS:
+            self.totals[name] = np.bincount(self.underlying, np.nan_to_num(self.greeks[name]) * weight, size)
+        self.totals["pnl"] = np.bincount(self.underlying, self._pnl(self.mark, self.open_price) * weight, size)
+        self.totals["day-pnl"] = np.bincount(self.underlying, self._pnl(self.mark, self.close_price) * weight, size)
+
+    @staticmethod
+    def _pnl(mark, reference):
+        return np.where(np.isnan(mark), 0.0, mark - reference)
+
+    def subscription_symbols(self) -> List[str]:
+        """
+        Returns the streamer symbols whose Quote and Greeks events the engine needs.
+        """
+        with self._lock:
+            unresolved = set(self.unresolved)
+            return sorted(symbol for symbol in self.rows if symbol not in unresolved)
+
+    def on_quote(self, symbol: str, bid_price: float, ask_price: float):
+        """
+        Updates the mark of a symbol to the mid price and adjusts the P&L totals of the affected underlyings.
+
+        Args:
+            symbol (str): The streamer symbol.
+            bid_price (float): The bid price.
+            ask_price (float): The ask price.
+        """
+        bid, ask = _to_float(bid_price), _to_float(ask_price)
+        if np.isnan(bid) and np.isnan(ask):
+            return
+        mark = ask if np.isnan(bid) else bid if np.isnan(ask) else (bid + ask) / 2
+        with self._lock:
+            rows = self.rows.get(symbol)
+            if rows is None:
+                return
+            weight = self.quantity[rows] * self.multiplier[rows]
+            old = self.mark[rows]
+            new = np.full(len(rows), mark)
+            underlying = self.underlying[rows]
+            np.add.at(self.totals["pnl"], underlying,
+                      (self._pnl(new, self.open_price[rows]) - self._pnl(old, self.open_price[rows])) * weight)
+            np.add.at(self.totals["day-pnl"], underlying,
+                      (self._pnl(new, self.close_price[rows]) - self._pnl(old, self.close_price[rows])) * weight)
+            self.mark[rows] = mark
+
+    def on_greeks(self, symbol: str, delta: float, gamma: float, theta: float, vega: float):
+        """
+        Updates the Greeks of a symbol and adjusts the Greek totals of the affected underlyings.
+
+        Args:
+            symbol (str): The streamer symbol.
+            delta (float): The option delta.
+            gamma (float): The option gamma.
+            theta (float): The option theta.
+            vega (float): The option vega.
+        """
+        values = {"delta": delta, "gamma": gamma, "theta": theta, "vega": vega}
+        with self._lock:
+            rows = self.rows.get(symbol)
+            if rows is None:
+                return
+            weight = self.quantity[rows] * self.multiplier[rows]
+            underlying = self.underlying[rows]
+            for name, value in values.items():
+                value = _to_float(value)
+                if np.isnan(value):
+                    continue
+                old = np.nan_to_num(self.greeks[name][rows])
+                np.add.at(self.totals[name], underlying, (value - old) * weight)
+                self.greeks[name][rows] = value
+
+    def on_event(self, event):
+        """
+        Applies a Quote or Greeks event.
+
+        Args:
+            event (Quote or Greeks): The dxfeed event.
+        """
+        if isinstance(event, Quote):
+            self.on_quote(event.symbol, event.bid_price, event.ask_price)
+        elif isinstance(event, Greeks):
+            self.on_greeks(event.symbol, event.delta, event.gamma, event.theta, event.vega)
+
+    def handle_data(self, data):
+        """
+        Applies a data message received from the CometdWebsocketClient data queue.
+
+        Args:
+            data (list): The data message, in the form [event type, event data].
+        """
+        for event in parse_events(data):
+            self.on_event(event)
+
+    def get_totals(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the portfolio Greeks and P&L per underlying.
+
+        Returns:
+            dict: Dictionary of underlying symbol -> {"delta", "gamma", "theta", "vega", "pnl", "day-pnl"}.
+        """
+        with self._lock:
+            return {
+                underlying: {name: float(values[i]) for name, values in self.totals.items()}
+                for i, underlying in enumerate(self.underlyings)
+            }
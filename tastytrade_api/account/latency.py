@@ -0,0 +1,260 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+METRICS = ("build_to_send", "submit_to_ack", "submit_to_fill", "ack_to_first_fill", "ack_to_fill", "edit_to_ack")
+
+
+class OrderTrace:
+    """
+    The timestamps of one order's lifecycle, in seconds of time.monotonic(), except `created_at`, which is the
+    wall-clock time.time() at which the trace was created, for display.
+
+    An edited order gets a new order id from the API; the trace follows it, so `order_ids` lists every id the
+    order had and `order_id` is the latest one.
+
+    Args:
+        order_id (int): The ID of the order.
+    """
+
+    def __init__(self, order_id):
+        self.order_id = order_id
+        self.order_ids = [order_id]
+        self.created_at = time.time()
+        self.built_at: Optional[float] = None
+        self.sent_at: Optional[float] = None
+        self.acked_at: Optional[float] = None
+        self.edits: List[tuple] = []
+        self.first_fill_at: Optional[float] = None
+        self.final_fill_at: Optional[float] = None
+        self.status: Optional[str] = None
+
+    @staticmethod
+    def _elapsed(start, end):
+        return end - start if start is not None and end is not None else None
+
+    @property
+    def build_to_send(self) -> Optional[float]:
+        """float: Seconds from building the order to sending it, or None if not known."""
+        return self._elapsed(self.built_at, self.sent_at)
+
+    @property
+    def submit_to_ack(self) -> Optional[float]:
+        """float: Seconds from sending create_order to its response, or None if not known."""
+        return self._elapsed(self.sent_at, self.acked_at)
+
+    @property
+    def submit_to_fill(self) -> Optional[float]:
+        """float: Seconds from sending create_order to the Filled event, or None if not known."""
+        return self._elapsed(self.sent_at, self.final_fill_at)
+
+    @property
+    def filled_before_ack(self) -> bool:
+        """bool: True if the first fill event arrived before the create_order response."""
+        return self.first_fill_at is not None and self.acked_at is not None and self.first_fill_at < self.acked_at
+
+    @property
+    def ack_to_first_fill(self) -> Optional[float]:
+        """
+        float: Seconds from the create_order response to the first fill event, or None if not known. 0.0 if the
+        fill arrived first, see filled_before_ack.
+        """
+        elapsed = self._elapsed(self.acked_at, self.first_fill_at)
+        return max(elapsed, 0.0) if elapsed is not None else None
+
+    @property
+    def ack_to_fill(self) -> Optional[float]:
+        """
+        float: Seconds from the create_order response to the Filled event, or None if not known. 0.0 if the fill
+        arrived first, see filled_before_ack.
+        """
+        elapsed = self._elapsed(self.acked_at, self.final_fill_at)
+        return max(elapsed, 0.0) if elapsed is not None else None
+
+    @property
+    def edit_to_ack(self) -> List[float]:
+        """list: Seconds from sending each edit_order to its response."""
+        return [acked - sent for sent, acked, _ in self.edits]
+
+    def __str__(self):
+        return (f"Order: {self.order_id}, Status: {self.status}, Submit to ack: {self.submit_to_ack}, "
+                f"Edits: {len(self.edits)}, Ack to fill: {self.ack_to_fill}")
+
+
+class OrderLatencyTracer:
+    """
+    Records the lifecycle timestamps of orders sent by a TastytradeOrder: build, send, create_order response,
+    every edit_order and the first and final fill. Fill times come from account streamer Order events matched
+    by order id, so they measure the exchange and not our polling. A fill event can arrive before the create_order
+    response; the ack-to-fill metrics are 0.0 for such orders, which are counted as "filled_before_ack" in the
+    summary, and submit_to_fill measures them without depending on the ack.
+
+    Args:
+        max_traces (int): The number of most recent traces kept. Defaults to 10000.
+    """
+
+    def __init__(self, max_traces: int = 10000):
+        self.max_traces = max_traces
+        self.traces: Dict[str, OrderTrace] = OrderedDict()
+        self._aliases: Dict[str, OrderTrace] = {}
+        self._built = OrderedDict()
+        self._early_events = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def now() -> float:
+        """Returns the current time.monotonic() timestamp."""
+        return time.monotonic()
+
+    def attach(self, streamer):
+        """
+        Records fill times from Order messages of an account streamer. The streamer must already be connected to
+        the accounts with 'connect_account'.
+
+        Args:
+            streamer (TastytradeStreamer): The account streamer.
+        """
+        streamer.add_listener("Order", self.on_order_message)
+
+    def on_build(self, order: dict):
+        """Records that an order dict was built. The time is attached to its trace when the order is sent."""
+        with self._lock:
+            self._built[id(order)] = (order, self.now())
+            while len(self._built) > 1000:
+                self._built.popitem(last=False)
+
+    def on_submit(self, order: dict, sent_at: float, response: dict):
+        """Records a create_order call that was sent at `sent_at` and returned `response`."""
+        acked_at = self.now()
+        with self._lock:
+            built = self._built.pop(id(order), None)
+            order_id = (response.get("data") or {}).get("order", {}).get("id")
+            if order_id is None:
+                return
+            trace = OrderTrace(order_id)
+            trace.built_at = built[1] if built is not None and built[0] is order else None
+            trace.sent_at = sent_at
+            trace.acked_at = acked_at
+            trace.status = response["data"]["order"].get("status")
+            self._add(trace, order_id)
+            early = self._early_events.pop(str(order_id), [])
+        for received_at, event in early:
+            self._apply(trace, event, received_at)
+
+    def on_edit(self, order_id, sent_at: float, response: dict):
+        """Records an edit_order call of `order_id` that was sent at `sent_at` and returned `response`."""
+        acked_at = self.now()
+        with self._lock:
+            trace = self._aliases.get(str(order_id))
+            new_id = (response.get("data") or {}).get("id")
+            if trace is None or new_id is None:
+                return
+            trace.edits.append((sent_at, acked_at, new_id))
+            trace.order_id = new_id
+            trace.order_ids.append(new_id)
+            self._aliases[str(new_id)] = trace
+            early = self._early_events.pop(str(new_id), [])
+        for received_at, event in early:
+            self._apply(trace, event, received_at)
+
+    def on_order_message(self, message: dict):
+        """Records fill times from an Order message."""
+        received_at = self.now()
+        order = message.get("data") or {}
+        if order.get("id") is None:
+            return
+        order_id = str(order["id"])
+        with self._lock:
+            trace = self._aliases.get(order_id)
+            if trace is None:
+                # The event can arrive before create_order or edit_order returns
+                self._early_events.setdefault(order_id, []).append((received_at, order))
+                while len(self._early_events) > 1000:
+                    self._early_events.popitem(last=False)
+                return
+        self._apply(trace, order, received_at)
+
+    def _apply(self, trace: OrderTrace, order: dict, received_at: float):
+        status = order.get("status")
+        if status == "Filled" or any(leg.get("fills") for leg in order.get("legs", [])):
+            if trace.first_fill_at is None:
+                trace.first_fill_at = received_at
+        if status == "Filled" and trace.final_fill_at is None:
+            trace.final_fill_at = received_at
+        if order.get("replacing-order-id") and status != "Filled":
+            # The replaced order's cancel is part of an edit, not the order's outcome
+            return
+        trace.status = status
+
+    def _add(self, trace: OrderTrace, order_id):
+        self.traces[str(order_id)] = trace
+        self._aliases[str(order_id)] = trace
+        while len(self.traces) > self.max_traces:
+            _, dropped = self.traces.popitem(last=False)
+            for dropped_id in dropped.order_ids:
+                self._aliases.pop(str(dropped_id), None)
+
+    def get_trace(self, order_id) -> Optional[OrderTrace]:
+        """
+        Returns the trace of an order by any of its order ids, or None if it is not traced.
+        """
+        with self._lock:
+            return self._aliases.get(str(order_id))
+
+    def samples(self, metric: str) -> np.ndarray:
+        """
+        Returns every recorded value of a latency metric.
+
+        Args:
+            metric (str): One of "build_to_send", "submit_to_ack", "submit_to_fill", "ack_to_first_fill",
+                "ack_to_fill" or "edit_to_ack".
+
+        Returns:
+            np.ndarray: The latencies in seconds.
+        """
+        if metric not in METRICS:
+            raise Exception(f"Unknown latency metric: {metric}")
+        with self._lock:
+            traces = list(self.traces.values())
+        if metric == "edit_to_ack":
+            values = [value for trace in traces for value in trace.edit_to_ack]
+        else:
+            values = [getattr(trace, metric) for trace in traces]
+        return np.array([value for value in values if value is not None], dtype=float)
+
+    def histogram(self, metric: str, bins=None):
+        """
+        Returns a histogram of a latency metric.
+
+        Args:
+            metric (str): The metric, see samples.
+            bins (array-like, optional): Bin edges in seconds. Defaults to a bin from 0 to 1 ms followed by
+                logarithmic bins up to 100 s, so that fills clamped to 0.0 are counted.
+
+        Returns:
+            tuple: A (counts, bin edges) pair as returned by numpy.histogram.
+        """
+        if bins is None:
+            bins = np.concatenate(([0.0], np.logspace(-3, 2, 26)))
+        return np.histogram(self.samples(metric), bins=bins)
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        Returns the count, mean and 50th/90th/99th percentiles in seconds of every latency metric, and the number
+        of orders whose fill arrived before the create_order response under "filled_before_ack".
+        """
+        with self._lock:
+            traces = list(self.traces.values())
+        summary = {"filled_before_ack": sum(trace.filled_before_ack for trace in traces)}
+        for metric in METRICS:
+            values = self.samples(metric)
+            if len(values) == 0:
+                summary[metric] = {"count": 0}
+                continue
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            summary[metric] = {"count": len(values), "mean": float(values.mean()), "p50": float(p50),
+                               "p90": float(p90), "p99": float(p99)}
+        return summary
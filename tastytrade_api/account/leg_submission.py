@@ -0,0 +1,88 @@
+from typing import List, Optional
+
+from tastytrade_api.account.fills import leg_fill_price
+
+
+class LegResult:
+    """
+    The outcome of one leg sent as its own order.
+
+    Args:
+        leg (dict): The order leg.
+        multiply (int): The sign applied to the leg's fill price in the net fill price.
+        order (dict): The order that was sent for the leg.
+    """
+
+    def __init__(self, leg, multiply, order):
+        self.leg = leg
+        self.multiply = multiply
+        self.order = order
+        self.handle = None
+        # Raised while submitting, so no order exists for the leg
+        self.error: Optional[Exception] = None
+        # Raised while waiting for an accepted order, which may still be working
+        self.wait_error: Optional[Exception] = None
+
+    @property
+    def order_id(self):
+        """The ID of the leg's order, or None if it was not accepted."""
+        return self.handle.order_id if self.handle else None
+
+    @property
+    def status(self) -> Optional[str]:
+        """str: The latest known status of the leg's order, or "error" if it was not accepted."""
+        if self.handle is None:
+            return "error"
+        return self.handle.status
+
+    @property
+    def working(self) -> bool:
+        """bool: True if the leg's order was accepted and has not reached a final status."""
+        return self.handle is not None and not self.handle.done
+
+    @property
+    def fill_price(self) -> float:
+        """float: The average fill price of the leg, 0.0 if it did not fill."""
+        if self.handle is None or not self.handle.order:
+            return 0.0
+        return sum(leg_fill_price(leg) for leg in self.handle.order.get("legs", []))
+
+    def __str__(self):
+        return f"Symbol: {self.leg['symbol']}, Order: {self.order_id}, Status: {self.status}, Fill price: {self.fill_price}"
+
+
+class LegSubmission:
+    """
+    The outcome of a set of legs sent concurrently as separate orders.
+
+    Args:
+        results (list of LegResult): One result per leg, in the order the legs were given.
+    """
+
+    def __init__(self, results: List[LegResult]):
+        self.results = results
+
+    @property
+    def order_ids(self) -> list:
+        """list: The order IDs of the accepted legs."""
+        return [result.order_id for result in self.results if result.order_id is not None]
+
+    @property
+    def working(self) -> List[LegResult]:
+        """list: The legs whose orders were accepted but are not final, e.g. to cancel them after a failure."""
+        return [result for result in self.results if result.working]
+
+    @property
+    def failed(self) -> List[LegResult]:
+        """list: The legs that were not accepted or did not fill."""
+        return [result for result in self.results if result.status != "Filled"]
+
+    @property
+    def ok(self) -> bool:
+        """bool: True if every leg filled."""
+        return not self.failed
+
+    @property
+    def net_fill_price(self) -> float:
+        """float: The sum of each leg's fill price multiplied by its sign."""
+        return sum(result.multiply * result.fill_price for result in self.results)
@@ -0,0 +1,137 @@
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from tastytrade_api.account.account_handler import TastytradeAccount
+from tastytrade_api.concurrency import DEFAULT_MAX_WORKERS, fan_out
+
+
+class EffectiveMarginCache:
+    """
+    A short-TTL cache of effective margin requirements keyed by (account number, underlying symbol), with a batch
+    lookup that fetches all missing underlyings concurrently.
+
+    When attached to an account streamer, every cached entry of an account is dropped as soon as a fill or a
+    position change arrives for that account, so pre-trade checks never see requirements from before a fill.
+
+    Args:
+        session_token (str): The session token used to authenticate API requests.
+        api_url (str): The base URL of the API.
+        ttl (float): Seconds a cached requirement stays valid. Defaults to 5.0.
+        max_workers (int): The maximum number of requests in flight at once. Defaults to 16.
+    """
+
+    def __init__(self, session_token, api_url, ttl: float = 5.0, max_workers=DEFAULT_MAX_WORKERS):
+        self.account = TastytradeAccount(session_token, api_url)
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self._entries: Dict[Tuple[str, str], Tuple[float, dict]] = {}
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def _cached(self, key, now):
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def get(self, account_number: str, underlying_symbol: str) -> dict:
+        """
+        Returns the effective margin requirements for an underlying, from the cache when fresh.
+
+        Args:
+            account_number (str): The account number.
+            underlying_symbol (str): The underlying symbol.
+
+        Returns:
+            dict: Dictionary containing the effective margin requirements, as returned by the API.
+
+        Raises:
+            Exception: If there was an error in the GET request.
+        """
+        results, errors = self.get_many(account_number, [underlying_symbol])
+        if errors:
+            raise errors[underlying_symbol]
+        return results[underlying_symbol]
+
+    def get_many(self, account_number: str, underlying_symbols: List[str]) -> Tuple[Dict[str, dict], Dict]:
+        """
+        Returns the effective margin requirements for several underlyings, fetching every stale or missing entry
+        concurrently.
+
+        Args:
+            account_number (str): The account number.
+            underlying_symbols (list of str): The underlying symbols.
+
+        Returns:
+            tuple: A (results, errors) pair of dictionaries keyed by underlying symbol.
+        """
+        now = time.monotonic()
+        results = {}
+        with self._lock:
+            generation = (self._epoch, self._generations.get(account_number, 0))
+            for symbol in underlying_symbols:
+                cached = self._cached((account_number, symbol), now)
+                if cached is not None:
+                    results[symbol] = cached
+
+        calls = {
+            symbol: lambda s=symbol: self.account.get_effective_margin_requirements(account_number, s)
+            for symbol in underlying_symbols if symbol not in results
+        }
+        fetched, errors = fan_out(calls, self.max_workers)
+        with self._lock:
+            # Responses that raced with an invalidation may predate a fill, so they are returned but not cached
+            if (self._epoch, self._generations.get(account_number, 0)) == generation:
+                for symbol, requirements in fetched.items():
+                    self._entries[(account_number, symbol)] = (now, requirements)
+        results.update(fetched)
+        return results, errors
+
+    def invalidate(self, account_number: str, underlying_symbol: str = None):
+        """
+        Drops cached entries of an account, or of one underlying of the account.
+
+        Args:
+            account_number (str): The account number.
+            underlying_symbol (str, optional): The underlying symbol. Defaults to every underlying of the account.
+        """
+        with self._lock:
+            self._generations[account_number] = self._generations.get(account_number, 0) + 1
+            if underlying_symbol is not None:
+                self._entries.pop((account_number, underlying_symbol), None)
+            else:
+                for key in [key for key in self._entries if key[0] == account_number]:
+                    del self._entries[key]
+
+    def clear(self):
+        """Drops every cached entry."""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+    def attach(self, streamer):
+        """
+        Invalidates cached entries from account streamer messages. The streamer must already be connected to the
+        accounts with 'connect_account'.
+
+        Args:
+            streamer (TastytradeStreamer): The account streamer.
+        """
+        streamer.add_listener("Order", self.on_order_message)
+        streamer.add_listener("CurrentPosition", self.on_position_message)
+        streamer.add_connection_listener(lambda state: self.clear() if state in ("close", "error") else None)
+
+    def on_order_message(self, message: dict):
+        """Invalidates the order's account when the order reports fills."""
+        order = message.get("data") or {}
+        filled = order.get("status") == "Filled" or any(leg.get("fills") for leg in order.get("legs", []))
+        if filled and order.get("account-number"):
+            self.invalidate(order["account-number"])
+
+    def on_position_message(self, message: dict):
+        """Invalidates the position's account."""
+        position = message.get("data") or {}
+        if position.get("account-number"):
+            self.invalidate(position["account-number"])
@@ -0,0 +1,328 @@
+import asyncio
+import logging
+import math
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+from typing import Callable, Dict, List, Optional
+
+from tastytrade_api.account.fills import TERMINAL_STATUSES
+from tastytrade_api.account.order_builder import net_prices
+from tastytrade_api.concurrency import DEFAULT_MAX_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+class Negotiation:
+    """
+    The state of one order being walked towards the market by an OrderNegotiator.
+
+    Args:
+        account_number (str): The account number of the order.
+        order_id (int): The ID of the working order.
+        order_data (dict): The order as sent to create_order. Its price is updated on every step.
+        step (float): The price change per step. Credit orders step down, debit orders step up.
+        interval (float): Seconds to wait for a fill before each step.
+        max_steps (int): The maximum number of edits.
+        limit_price (float, optional): The worst acceptable price: a floor for credit orders and a ceiling for
+            debit orders. Defaults to None (no limit).
+        tick_size (float): Prices are rounded to a multiple of this value. Defaults to 0.01.
+    """
+
+    def __init__(self, account_number, order_id, order_data, step, interval, max_steps, limit_price=None,
+                 tick_size=0.01):
+        self.account_number = account_number
+        self.order_id = order_id
+        self.original_order_id = order_id
+        self.order_data = dict(order_data)
+        self.step = step
+        self.interval = interval
+        self.max_steps = max_steps
+        self.limit_price = limit_price
+        self.tick_size = tick_size
+        self.edits = 0
+        self.status = "working"
+        self.order_status = None
+        self.error = None
+        self.editing = False
+        self._event = None
+
+    @property
+    def is_credit(self) -> bool:
+        """bool: True if the order receives a credit, so that walking it lowers the price."""
+        return self.order_data.get("price-effect") == "Credit"
+
+    @property
+    def price(self) -> float:
+        """float: The current limit price of the order."""
+        return float(self.order_data["price"])
+
+    def round_price(self, price: float) -> float:
+        """
+        Rounds a price to the tick size and clamps it to the limit price. Prices are never below one tick: the
+        price effect of a working order cannot change, so a credit order stops at the smallest credit.
+        """
+        price = round(round(price / self.tick_size) * self.tick_size, 10)
+        if self.limit_price is not None:
+            price = max(price, self.limit_price) if self.is_credit else min(price, self.limit_price)
+        return max(price, self.tick_size)
+
+    def __str__(self):
+        return (f"Order: {self.order_id} (originally {self.original_order_id}), Status: {self.status}, "
+                f"Price: {self.order_data.get('price')}, Edits: {self.edits}")
+
+
+def fixed_step_pricer(negotiation: Negotiation) -> Optional[float]:
+    """
+    Moves the price by the negotiation's step towards the market.
+
+    Args:
+        negotiation (Negotiation): The negotiation.
+
+    Returns:
+        float: The next price.
+    """
+    step = -negotiation.step if negotiation.is_credit else negotiation.step
+    return negotiation.price + step
+
+
+class QuoteAwarePricer:
+    """
+    Prices each step from the live bid and ask of the order's legs instead of a fixed step.
+
+    An order priced further from the market than the spread's mid jumps straight to the mid. From there, each step
+    gives up an equal share of the remaining distance to the natural price, so that the last allowed step reaches
+    the natural price. This takes fewer edits than a fixed step when the order starts far from the market, and it
+    does not give away edge when the order is already close. If a leg has no recent quote, the fallback pricer is
+    used. When the natural price is at or past zero, e.g. a credit spread that can only be closed for a debit, the
+    price stops at one tick (see Negotiation.round_price) and the negotiation ends as "limit-reached".
+
+    Args:
+        quote_book (QuoteBook): The quote book fed from the dxfeed stream. It must receive Quote events for the
+            order's leg symbols.
+        max_quote_age (float): Quotes older than this many seconds are not used. Defaults to 5.0.
+        fallback (callable): The pricer used without quotes. Defaults to fixed_step_pricer.
+    """
+
+    def __init__(self, quote_book, max_quote_age: float = 5.0,
+                 fallback: Callable[[Negotiation], Optional[float]] = fixed_step_pricer):
+        self.quote_book = quote_book
+        self.max_quote_age = max_quote_age
+        self.fallback = fallback
+
+    def prices(self, order_data: dict) -> Optional[tuple]:
+        """
+        Returns the (natural, mid) price of an order in its own price terms, positive for both credit and debit
+        orders, or None if a leg has no recent quote.
+
+        Args:
+            order_data (dict): The order, as sent to create_order.
+        """
+        quotes = {}
+        for leg in order_data["legs"]:
+            quote = self.quote_book.get(leg["symbol"], self.max_quote_age)
+            if quote is None:
+                return None
+            quotes[leg["symbol"]] = quote
+        # The order price is per unit of the spread, whose leg ratios are the quantities over their common divisor
+        size = reduce(math.gcd, (int(leg.get("quantity", 1)) for leg in order_data["legs"]))
+        natural, mid = net_prices(order_data["legs"], quotes, size)
+        sign = -1 if order_data.get("price-effect") == "Debit" else 1
+        return sign * natural, sign * mid
+
+    def __call__(self, negotiation: Negotiation) -> Optional[float]:
+        prices = self.prices(negotiation.order_data)
+        if prices is None:
+            return self.fallback(negotiation)
+        natural, mid = prices
+        price = negotiation.price
+        direction = -1 if negotiation.is_credit else 1
+
+        remaining = (natural - price) * direction
+        if remaining <= 0:
+            # Already at or through the natural price: follow the market
+            return natural
+        if (mid - price) * direction > 0:
+            target = mid
+        else:
+            steps_left = max(negotiation.max_steps - negotiation.edits, 1)
+            target = price + direction * max(remaining / steps_left, negotiation.tick_size)
+        if negotiation.round_price(target) == negotiation.round_price(price):
+            target = price + direction * negotiation.tick_size
+        return target
+
+
+class OrderNegotiator:
+    """
+    Walks many working limit orders towards the market concurrently on one asyncio event loop.
+
+    Each order waits for its interval and is then edited to the next price, until it fills, is cancelled, runs
+    out of steps or reaches its limit price. When attached to an account streamer, a fill or cancel stops the
+    order's negotiation immediately instead of at the end of the current interval, and no further edits are sent.
+    The blocking REST calls run on a bounded thread pool so a slow request never stalls the loop. Call close, or
+    use the negotiator as a context manager, to shut the pool down.
+
+    Args:
+        order_client (TastytradeOrder): The client used to edit orders.
+        max_workers (int): The maximum number of edit requests in flight at once. Defaults to 16.
+        pricer (callable, optional): Function returning the next price of a Negotiation, or None to stop stepping.
+            Defaults to fixed_step_pricer.
+    """
+
+    def __init__(self, order_client, max_workers=DEFAULT_MAX_WORKERS,
+                 pricer: Callable[[Negotiation], Optional[float]] = fixed_step_pricer):
+        self.order_client = order_client
+        self.pricer = pricer
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.loop = None
+        self.negotiations: Dict[object, Negotiation] = {}
+        self._early_statuses = OrderedDict()
+
+    def close(self, wait: bool = True):
+        """
+        Shuts down the thread pool. Edits already in flight complete when `wait` is True.
+
+        Args:
+            wait (bool): Whether to wait for in-flight edits. Defaults to True.
+        """
+        self.executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def attach(self, streamer):
+        """
+        Stops negotiations from Order messages of an account streamer. The streamer must already be connected to
+        the accounts with 'connect_account'.
+
+        Args:
+            streamer (TastytradeStreamer): The account streamer.
+        """
+        streamer.add_listener("Order", self.on_order_message)
+
+    def on_order_message(self, message: dict):
+        """Handles an Order message. Safe to call from the streamer thread."""
+        order = message.get("data") or {}
+        if self.loop is None or order.get("id") is None:
+            return
+        status = order.get("status")
+        if status != "Filled" and order.get("replacing-order-id"):
+            # The order was cancelled because one of our edits replaced it
+            return
+        self.loop.call_soon_threadsafe(self._apply_order_status, str(order["id"]), status)
+
+    def _apply_order_status(self, order_id: str, status: str):
+        negotiation = self.negotiations.get(order_id)
+        if negotiation is None:
+            # The event can arrive before the edit that created the order returns
+            self._early_statuses[order_id] = status
+            while len(self._early_statuses) > 1000:
+                self._early_statuses.popitem(last=False)
+            return
+        if negotiation.editing and status != "Filled":
+            # Cancels of the order being replaced are expected while an edit is in flight
+            return
+        negotiation.order_status = status
+        if status in TERMINAL_STATUSES and negotiation._event is not None:
+            negotiation._event.set()
+
+    def _track(self, negotiation: Negotiation):
+        order_id = str(negotiation.order_id)
+        self.negotiations[order_id] = negotiation
+        status = self._early_statuses.pop(order_id, None)
+        if status is not None:
+            self._apply_order_status(order_id, status)
+
+    async def negotiate(self, account_number, order_id, order_data: dict, step: float, interval: float,
+                        max_steps: int, limit_price: float = None, tick_size: float = 0.01) -> Negotiation:
+        """
+        Walks one working order towards the market. See Negotiation for the arguments.
+
+        Returns:
+            Negotiation: The finished negotiation. Its status is "filled", "cancelled", "rejected", "expired",
+            "removed", "limit-reached", "max-steps" or "error".
+        """
+        negotiation = Negotiation(account_number, order_id, order_data, step, interval, max_steps, limit_price,
+                                  tick_size)
+        return await self.run(negotiation)
+
+    async def negotiate_many(self, negotiations: List[Negotiation]) -> List[Negotiation]:
+        """
+        Walks several working orders towards the market concurrently.
+
+        Args:
+            negotiations (list of Negotiation): The negotiations to run.
+
+        Returns:
+            list: The finished negotiations, in the same order.
+        """
+        return list(await asyncio.gather(*(self.run(negotiation) for negotiation in negotiations)))
+
+    async def run(self, negotiation: Negotiation) -> Negotiation:
+        """
+        Runs a negotiation to completion.
+
+        Args:
+            negotiation (Negotiation): The negotiation to run.
+
+        Returns:
+            Negotiation: The finished negotiation.
+        """
+        self.loop = asyncio.get_event_loop()
+        negotiation._event = asyncio.Event()
+        self._track(negotiation)
+        try:
+            while negotiation.status == "working":
+                if await self._wait_for_terminal(negotiation, negotiation.interval):
+                    break
+                if negotiation.edits >= negotiation.max_steps:
+                    negotiation.status = "max-steps"
+                    break
+                price = self.pricer(negotiation)
+                price = None if price is None else negotiation.round_price(price)
+                if price is None or price == negotiation.price:
+                    negotiation.status = "limit-reached"
+                    break
+                await self._edit(negotiation, price)
+        finally:
+            if negotiation.status == "working" or negotiation.order_status in TERMINAL_STATUSES:
+                negotiation.status = (negotiation.order_status or "error").lower()
+            self.negotiations.pop(str(negotiation.order_id), None)
+        return negotiation
+
+    async def _wait_for_terminal(self, negotiation: Negotiation, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(negotiation._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return negotiation._event.is_set()
+
+    async def _edit(self, negotiation: Negotiation, price: float):
+        order_data = dict(negotiation.order_data, price=str(price))
+        negotiation.editing = True
+        try:
+            response = await self.loop.run_in_executor(
+                self.executor, self.order_client.edit_order, negotiation.account_number, negotiation.order_id,
+                order_data
+            )
+        except Exception as e:
+            # Editing fails when the order filled or was cancelled while the request was in flight
+            if not negotiation._event.is_set():
+                negotiation.status = "error"
+                negotiation.error = e
+                logger.warning("Error editing order %s: %s", negotiation.order_id, e)
+            return
+        finally:
+            negotiation.editing = False
+
+        negotiation.edits += 1
+        negotiation.order_data = order_data
+        self.negotiations.pop(str(negotiation.order_id), None)
+        negotiation.order_id = response["data"]["id"]
+        negotiation.order_status = response["data"].get("status")
+        self._track(negotiation)
+        if negotiation.order_status in TERMINAL_STATUSES:
+            negotiation._event.set()
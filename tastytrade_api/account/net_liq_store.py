@@ -0,0 +1,261 @@
+import datetime
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tastytrade_api.account.account_handler import TastytradeAccount
+
+NET_LIQ_FIELDS = ("open", "high", "low", "close", "total-open", "total-high", "total-low", "total-close")
+
+
+def parse_net_liq_time(value: str) -> int:
+    """
+    Converts a net liq history timestamp such as "2023-05-12 13:30:00+00" to epoch seconds.
+
+    Args:
+        value (str): The timestamp, as returned by the API.
+
+    Returns:
+        int: The timestamp in seconds since the epoch.
+    """
+    value = re.sub(r"([+-]\d\d)$", r"\1:00", value.replace("Z", "+00:00"))
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return int(parsed.timestamp())
+
+
+def _infer_interval(times: np.ndarray) -> Optional[int]:
+    diffs = np.diff(np.unique(times))
+    if len(diffs) == 0:
+        return None
+    return int(np.median(diffs))
+
+
+def aggregate_bars(times: np.ndarray, values: np.ndarray, interval: int):
+    """
+    Aggregates time-ordered net liq points into bars of `interval` seconds. Open fields take the first value of each
+    bar, close fields the last, high fields the maximum and low fields the minimum.
+
+    Args:
+        times (np.ndarray): Epoch seconds, in the order the points should be combined.
+        values (np.ndarray): One row of NET_LIQ_FIELDS per point.
+        interval (int): The bar size in seconds.
+
+    Returns:
+        tuple: The (bar start times, bar values) arrays.
+    """
+    if len(times) == 0:
+        return times, values
+    buckets = times // interval
+    order = np.lexsort((np.arange(len(buckets)), buckets))
+    buckets, values = buckets[order], values[order]
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+    result = np.empty((len(starts), len(NET_LIQ_FIELDS)), dtype=np.float64)
+    for i, field in enumerate(NET_LIQ_FIELDS):
+        column = values[:, i]
+        if field.endswith("high"):
+            result[:, i] = np.fmax.reduceat(column, starts)
+        elif field.endswith("low"):
+            result[:, i] = np.fmin.reduceat(column, starts)
+        elif field.endswith("open"):
+            result[:, i] = column[starts]
+        else:
+            result[:, i] = column[ends]
+    return buckets[starts] * interval, result
+
+
+class NetLiqHistoryStore:
+    """
+    Local time series of an account's net liq history, held in NumPy arrays and optionally persisted to an .npz
+    file. Refreshing only downloads the points after the last stored timestamp, so repeated refreshes of a long
+    window cost one small request each.
+
+    The API returns bars whose size depends on the request (e.g. 5 minutes for time_back="1d", coarser for longer
+    windows, finer for start_time requests), so the store keeps one series per bar size. A time_back download
+    starts the series of its granularity, and every incremental download is aggregated into each stored series at
+    that series' own bar size, so no series mixes granularities.
+
+    Args:
+        session_token (str): The session token used to authenticate API requests.
+        api_url (str): The base URL of the API.
+        account_number (str): The account to track.
+        path (str, optional): The .npz file used to persist the series. Defaults to None (memory only).
+    """
+
+    def __init__(self, session_token, api_url, account_number: str, path: str = None):
+        self.account = TastytradeAccount(session_token, api_url)
+        self.account_number = account_number
+        self.path = path
+        self.series: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return sum(len(times) for times, _ in self.series.values())
+
+    @property
+    def intervals(self) -> List[int]:
+        """list: The bar sizes of the stored series in seconds, finest first."""
+        return sorted(self.series)
+
+    @property
+    def last_time(self) -> Optional[int]:
+        """int: The epoch seconds of the newest stored bar in any series, or None if the store is empty."""
+        last = [int(times[-1]) for times, _ in self.series.values() if len(times)]
+        return max(last) if last else None
+
+    def load(self):
+        """Loads the series from the .npz file."""
+        with np.load(self.path) as data:
+            self.series = {
+                int(key[len("times_"):]): (data[key], data["values_" + key[len("times_"):]])
+                for key in data.files if key.startswith("times_")
+            }
+
+    def save(self):
+        """Writes the series to the .npz file."""
+        arrays = {}
+        for interval, (times, values) in self.series.items():
+            arrays[f"times_{interval}"] = times
+            arrays[f"values_{interval}"] = values
+        np.savez(self.path, **arrays)
+
+    def refresh(self, time_back: str = "1y", interval: int = None) -> int:
+        """
+        Downloads the window `time_back` into its own series if the store is empty or has no series of bar size
+        `interval`. Otherwise downloads the points from the oldest of the series' last bars on and merges them into
+        every series.
+
+        Args:
+            time_back (str): The window to download for a new series. Defaults to "1y".
+            interval (int, optional): The bar size of the time_back window in seconds. Defaults to the median
+                spacing of the downloaded points. Without it, a window of fewer than two points, e.g. for a new or
+                idle account, cannot start a series and nothing is stored until a later refresh.
+
+        Returns:
+            int: The number of new bars across all series.
+
+        Raises:
+            Exception: If there was an error in the GET request.
+        """
+        before = len(self)
+        if self.last_time is None or (interval is not None and interval not in self.series):
+            response = self.account.get_account_net_liq_history(self.account_number, time_back=time_back)
+            times, values = self._parse(response["data"]["items"])
+            interval = interval or _infer_interval(times)
+            if interval is None:
+                return 0
+            self._merge(times, values, interval)
+        else:
+            # Start at the oldest last bar, so that every series receives all points after its own last bar
+            first_last_time = min(int(times[-1]) for times, _ in self.series.values() if len(times))
+            start_time = datetime.datetime.fromtimestamp(first_last_time, datetime.timezone.utc)
+            response = self.account.get_account_net_liq_history(
+                self.account_number, start_time=start_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+            )
+            times, values = self._parse(response["data"]["items"])
+            for series_interval in list(self.series):
+                self._merge(times, values, series_interval)
+        if self.path:
+            self.save()
+        return len(self) - before
+
+    @staticmethod
+    def _parse(items):
+        times = np.fromiter((parse_net_liq_time(item["time"]) for item in items), dtype=np.int64, count=len(items))
+        values = np.array(
+            [[float(item[field]) if item.get(field) is not None else np.nan for field in NET_LIQ_FIELDS]
+             for item in items],
+            dtype=np.float64,
+        ).reshape(len(items), len(NET_LIQ_FIELDS))
+        return times, values
+
+    def merge(self, items, interval: int):
+        """
+        Merges net liq history items into the series of bar size `interval`, creating it if needed. Items are
+        aggregated into the series' bars; a bar that is already stored keeps its open and combines the rest, since
+        the newest bar may still have been forming when it was first downloaded.
+
+        Args:
+            items (list): List of net liq history items, as returned by the API.
+            interval (int): The bar size of the series in seconds.
+        """
+        self._merge(*self._parse(items), interval)
+
+    def _merge(self, times, values, interval):
+        stored_times, stored_values = self.series.get(
+            interval, (np.empty(0, dtype=np.int64), np.empty((0, len(NET_LIQ_FIELDS)), dtype=np.float64))
+        )
+        if len(times) == 0:
+            self.series[interval] = (stored_times, stored_values)
+            return
+        # Only the stored bars from the first new bucket on can change
+        split = np.searchsorted(stored_times, times.min() // interval * interval, side="left")
+        order = np.argsort(times, kind="stable")
+        bar_times, bar_values = aggregate_bars(
+            np.concatenate([stored_times[split:], times[order]]),
+            np.concatenate([stored_values[split:], values[order]]),
+            interval,
+        )
+        self.series[interval] = (np.concatenate([stored_times[:split], bar_times]),
+                                 np.concatenate([stored_values[:split], bar_values]))
+
+    def _select(self, interval):
+        if not self.series:
+            return np.empty(0, dtype=np.int64), np.empty((0, len(NET_LIQ_FIELDS)), dtype=np.float64)
+        if interval is None:
+            interval = self.intervals[0]
+        if interval not in self.series:
+            raise Exception(f"No net liq series with {interval} second bars, stored: {self.intervals}")
+        return self.series[interval]
+
+    def get_range(self, start: int = None, end: int = None, interval: int = None) -> Dict[str, np.ndarray]:
+        """
+        Returns the stored bars of one series between two timestamps.
+
+        Args:
+            start (int, optional): The first epoch second to include. Defaults to the start of the series.
+            end (int, optional): The last epoch second to include. Defaults to the end of the series.
+            interval (int, optional): The bar size of the series. Defaults to the finest stored series.
+
+        Returns:
+            dict: Dictionary with a "time" array and one array per net liq field.
+
+        Raises:
+            Exception: If no series has the requested bar size.
+        """
+        times, values = self._select(interval)
+        lo = 0 if start is None else np.searchsorted(times, start, side="left")
+        hi = len(times) if end is None else np.searchsorted(times, end, side="right")
+        series = {"time": times[lo:hi]}
+        for i, field in enumerate(NET_LIQ_FIELDS):
+            series[field] = values[lo:hi, i]
+        return series
+
+    def downsample(self, interval: int, start: int = None, end: int = None,
+                   source_interval: int = None) -> Dict[str, np.ndarray]:
+        """
+        Returns the bars of one series between two timestamps aggregated into bars of `interval` seconds. See
+        aggregate_bars.
+
+        Args:
+            interval (int): The bar size in seconds.
+            start (int, optional): The first epoch second to include. Defaults to the start of the series.
+            end (int, optional): The last epoch second to include. Defaults to the end of the series.
+            source_interval (int, optional): The bar size of the series to aggregate. Defaults to the finest
+                stored series.
+
+        Returns:
+            dict: Dictionary with a "time" array of bar start times and one array per net liq field.
+        """
+        series = self.get_range(start, end, source_interval)
+        values = np.stack([series[field] for field in NET_LIQ_FIELDS], axis=1)
+        times, values = aggregate_bars(series["time"], values, interval)
+        result = {"time": times}
+        for i, field in enumerate(NET_LIQ_FIELDS):
+            result[field] = values[:, i]
+        return result
@@ -4,9 +4,16 @@ import datetime
 #from datetime import datetime
 from datetime import timedelta
 import time
-import pandas as pd
 import threading
-from tastytrade_api.symbology import to_tastytrade_option_symbol
+from requests.adapters import HTTPAdapter
+from tastytrade_api.account.allocation import AccountOrder, Allocation, scale_order
+from tastytrade_api.account.dry_run import dry_run_many
+from tastytrade_api.account.fills import FillTracker, net_fill_amount
+from tastytrade_api.account.latency import OrderLatencyTracer
+from tastytrade_api.account.leg_submission import LegResult, LegSubmission
+from tastytrade_api.account.order_builder import IRON_CONDOR, STRANGLE, build_leg, build_order, option_symbol, \
+    template_for
+from tastytrade_api.concurrency import DEFAULT_MAX_WORKERS, fan_out
 #import pdb
 
 class TastytradeOrder:
@@ -16,6 +23,35 @@ class TastytradeOrder:
         self.headers = {
             "Authorization": f"{self.session_token}"
         }
+        # One pooled session per thread, since requests.Session is not safe to share across threads
+        self._local = threading.local()
+        # Resolves submitted orders to their fills; call fill_tracker.attach(streamer) to use push events
+        self.fill_tracker = FillTracker(self)
+        # Records build/send/ack/edit/fill timestamps of every order; fill times need attach(streamer)
+        self.tracer = OrderLatencyTracer()
+        # Local pre-trade checks per account number, run by create_order before any request is sent
+        self.risk_gates = {}
+
+    @property
+    def session(self) -> requests.Session:
+        """requests.Session: The calling thread's session, which keeps its connections alive between requests."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_maxsize=DEFAULT_MAX_WORKERS))
+            self._local.session = session
+        return session
+
+    def attach(self, streamer):
+        """
+        Feeds the fill tracker and the latency tracer from Order messages of an account streamer. The streamer must
+        already be connected to the accounts with 'connect_account'.
+
+        Args:
+            streamer (TastytradeStreamer): The account streamer.
+        """
+        self.fill_tracker.attach(streamer)
+        self.tracer.attach(streamer)
 
         
     
@@ -35,7 +71,7 @@ class TastytradeOrder:
             Exception: If there was an error in the POST request or if the status code is not 201 Created.
         """
         url = f"{self.api_url}/accounts/{account_number}/orders/{order_id}/reconfirm"
-        response = requests.post(url, headers=self.headers)
+        response = self.session.post(url, headers=self.headers)
         
         if response.status_code == 201:
             response_data = response.json()
@@ -62,7 +98,7 @@ class TastytradeOrder:
             Exception: If there was an error in the POST request or if the status code is not 201 Created.
         """
         url = f"{self.api_url}/accounts/{account_number}/orders/{order_id}/dry-run"
-        response = requests.post(url, headers=self.headers, json=order_data)
+        response = self.session.post(url, headers=self.headers, json=order_data)
         
         if response.status_code == 201:
             response_data = response.json()
@@ -88,7 +124,7 @@ class TastytradeOrder:
             Exception: If there was an error in the GET request or if the status code is not 200 OK.
         """
         url = f"{self.api_url}/accounts/{account_number}/orders/{order_id}"
-        response = requests.get(url, headers=self.headers)
+        response = self.session.get(url, headers=self.headers)
         
         if response.status_code == 200:
             response_data = response.json()
@@ -114,7 +150,7 @@ class TastytradeOrder:
             Exception: If there was an error in the DELETE request or if the status code is not 200 OK.
         """
         url = f"{self.api_url}/accounts/{account_number}/orders/{order_id}"
-        response = requests.delete(url, headers=self.headers)
+        response = self.session.delete(url, headers=self.headers)
         
         if response.status_code == 200:
             response_data = response.json()
@@ -141,7 +177,7 @@ class TastytradeOrder:
             Exception: If there was an error in the PUT request or if the status code is not 200 OK.
         """
         url = f"{self.api_url}/accounts/{account_number}/orders/{order_id}"
-        response = requests.put(url, headers=self.headers, json=order_data)
+        response = self.session.put(url, headers=self.headers, json=order_data)
         
         if response.status_code == 200:
             response_data = response.json()
@@ -168,10 +204,12 @@ class TastytradeOrder:
             Exception: If there was an error in the PATCH request or if the status code is not 200 OK.
         """
         url = f"{self.api_url}/accounts/{account_number}/orders/{order_id}"
-        response = requests.patch(url, headers=self.headers, json=order_data)
+        sent_at = self.tracer.now()
+        response = self.session.patch(url, headers=self.headers, json=order_data)
         
         if response.status_code == 200:
             response_data = response.json()
+            self.tracer.on_edit(order_id, sent_at, response_data)
             return response_data
         else:
             raise Exception(f"Error editing order: {response.status_code} - {response.content}")
@@ -194,7 +232,7 @@ class TastytradeOrder:
             Exception: If there was an error in the GET request or if the status code is not 200 OK.
         """
         url = f"{self.api_url}/accounts/{account_number}/orders/live"
-        response = requests.get(url, headers=self.headers)
+        response = self.session.get(url, headers=self.headers)
         
         if response.status_code == 200:
             response_data = response.json()
@@ -247,7 +285,7 @@ class TastytradeOrder:
             "end-at": end_at,
             "order-type": order_type
         }
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self.session.get(url, headers=self.headers, params=params)
         
         if response.status_code == 200:
             response_data = response.json()
@@ -260,7 +298,8 @@ class TastytradeOrder:
         Accepts a json document containing parameters to create an order for the client.
 
         Makes a POST request to the /accounts/{account_number}/orders API endpoint to create a new order for the customer,
-        and returns the response as a JSON object.
+        and returns the response as a JSON object. If a PreTradeRiskGate is registered in risk_gates for the account,
+        orders it rejects are returned as an error response without sending the request.
 
         Args:
             account_number (int): The account number for which to create the order.
@@ -277,12 +316,21 @@ class TastytradeOrder:
             "Authorization": f"{self.session_token}",
             "Content-Type": "application/json"
         }
+        risk_gate = self.risk_gates.get(account_number)
+        if risk_gate is not None:
+            violations = risk_gate.check(order)
+            if violations:
+                # Same shape as an API error, so callers checking for "error" handle it the same way
+                return {"error": {"code": "risk_gate_rejected", "message": "; ".join(violations),
+                                  "errors": violations}}
         #print("here")
-        response = requests.post(url, headers=headers, json=order)
+        sent_at = self.tracer.now()
+        response = self.session.post(url, headers=headers, json=order)
         #print("here2")
         # SA 10/19/2023: Commented raising an exception.
         # if response.status_code == 201:
         response_data = response.json()
+        self.tracer.on_submit(order, sent_at, response_data)
         #print('response: ', json.dumps(response_data,indent = 4))
         return response_data
         # else:
@@ -306,7 +354,7 @@ class TastytradeOrder:
             Exception: If there was an error in the POST request or if the status code is not 201 Created.
         """
         url = f"{self.api_url}/accounts/{account_number}/orders/dry-run"
-        response = requests.post(url, headers=self.headers, json=order_data)
+        response = self.session.post(url, headers=self.headers, json=order_data)
         
         if response.status_code == 201:
             response_data = response.json()
@@ -314,6 +362,22 @@ class TastytradeOrder:
         else:
             raise Exception(f"Error running dry run new order: {response.status_code} - {response.content}")
 
+    def dry_run_new_orders(self, account_number, orders, requests_per_second=None):
+        """
+        Runs the preflights of many candidate orders concurrently without placing them, for example to choose among
+        strike and width combinations by buying power effect and fees.
+
+        Args:
+            account_number (int): The account number for the new orders.
+            orders (list of dict): The candidate orders.
+            requests_per_second (float, optional): The maximum number of requests started per second. Defaults to
+                None (no limit).
+
+        Returns:
+            DryRunResults: Buying power change, fees and warnings of every candidate as arrays.
+        """
+        return dry_run_many(self, account_number, orders, requests_per_second=requests_per_second)
+
     def get_customer_live_orders(self, customer_id):
         """
         Returns a list of live orders for the customer.
@@ -331,7 +395,7 @@ class TastytradeOrder:
             Exception: If there was an error in the GET request or if the status code is not 200 OK.
         """
         url = f"{self.api_url}/customers/{customer_id}/orders/live"
-        response = requests.get(url, headers=self.headers)
+        response = self.session.get(url, headers=self.headers)
 
         if response.status_code == 200:
             response_data = response.json()
@@ -383,7 +447,7 @@ class TastytradeOrder:
             "start-at": start_at,
             "end-at": end_at
         }
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self.session.get(url, headers=self.headers, params=params)
         if response.status_code == 200:
             response_data = response.json()
             orders = response_data["data"]["items"]
@@ -419,85 +483,31 @@ class TastytradeOrder:
 
         return netFill, orderID
 
-    def build1leg(self, action, symbol, type, strike, exp=datetime.date.today(), quantity=1, instrument_type="Equity Option"):
-        #finalSymbol = symbol.ljust(6) + exp.strftime("%y%m%d") + type + self.format_strike(strike)
-        finalSymbol = to_tastytrade_option_symbol(symbol, strike, type, exp.strftime("%Y-%m-%d"))
-        leg = {
-            "action": action,
-            "symbol": finalSymbol,
-            "quantity": quantity,
-            "instrument-type": instrument_type
-        }
-        return leg
+    def build1leg(self, action, symbol, type, strike, exp=None, quantity=1, instrument_type="Equity Option"):
+        # Expiry defaults to the day of the call, not the day the module was imported
+        if exp is None:
+            exp = datetime.date.today()
+        return build_leg(action, option_symbol(symbol, type, strike, exp), quantity, instrument_type)
     
     @staticmethod
     def build_json(price, legs, time_in_force="Day", order_type="Limit", price_effect="Credit"):
-        if order_type == "Limit":
-            json_data = {
-                "time-in-force": time_in_force,
-                "order-type": order_type,
-                "price": price,
-                "price-effect": price_effect,
-                "legs": legs
-            }
-        else:
-            json_data = {
-                "time-in-force": time_in_force,
-                "order-type": order_type,
-                # "price-effect": price_effect,                 Commented Oct 19 2023 No Price-Effect for Market Orders SANG
-                "legs": legs
-            }
-        return json.dumps(json_data, indent=4)
+        # No Price-Effect for Market Orders
+        return json.dumps(build_order(price, legs, time_in_force, order_type, price_effect), indent=4)
     
     #Short Call, Short Put, Expiry, Amount
     def build_Any_Trade(self, SC, LC, SP, LP, Exp, Amt, type_tr, Ticker = "SPXW", order_type = "Limit"):
-        if type_tr[0] == "C":
-            strSell = "Sell to Open"
-            strBuy = "Buy to Open"
-            price_effect = "Credit"
-        else:
-            strBuy = "Sell to Open"
-            strSell = "Buy to Open"
-            price_effect = "Debit"
-
-        leg1 = self.build1leg(strSell, Ticker, "C", SC, Exp)
-        leg3 = self.build1leg(strSell, Ticker, "P", SP, Exp)
-        leg2 = self.build1leg(strBuy,  Ticker, "C", LC, Exp)
-        leg4 = self.build1leg(strBuy,  Ticker, "P", LP, Exp)
-
-
-        if SC == 0:
-            #PCS No Wing:
-            if LP == 0: 
-                legs = [leg3]
-            else:
-                legs = [leg3, leg4]
-        elif SP == 0:
-            #CCS No Wing
-            if LC == 0: 
-                legs = [leg1]
-            else:
-                legs = [leg1, leg2]
-        elif LC == 0 and LP == 0:
-            #IF No Wing
-            legs = [leg1, leg3]
-        else:
-            legs = [leg1, leg2, leg3, leg4]
-
-        # Build JSON
-        json_string = self.build_json( Amt, legs, "Day", order_type, price_effect)
-
-        # Convert JSON to dictionary
-        return json.loads(json_string)
+        # Zero strikes drop the matching legs, see template_for
+        strikes = {"SC": SC, "LC": LC, "SP": SP, "LP": LP}
+        order = template_for(SC, LC, SP, LP).build(Ticker, Exp, strikes, Amt, credit=type_tr[0] == "C",
+                                                   order_type=order_type)
+        self.tracer.on_build(order)
+        return order
     
     def send_order_from_leg(self, account_number, Amt, leg, time_in_force, order_type, price_effect):
-        # Build JSON
-        json_string = self.build_json( Amt, leg, time_in_force, order_type, price_effect)
-        # Convert JSON to dictionary
-        data_dict = json.loads(json_string)
+        data_dict = build_order(Amt, leg, time_in_force, order_type, price_effect)
+        self.tracer.on_build(data_dict)
         #Send order
         return data_dict, self.create_order(account_number, data_dict)
-        #order_list = str(order_list) + ";" + str(df_all_legs[index, "response"]['data']['order']['id'])
 
         
     #Build any trade, place order and negotiate: 
@@ -574,108 +584,123 @@ class TastytradeOrder:
                 #Get Fill Price:
                 fillPrice = self.getOrderFillAmt(account_number, int(order_list))
         
-        #Market Orders Individual
+        #Market Orders Individual, sent concurrently
         else:
-            #create dataframe from the all_legs:
-            df_all_legs = pd.DataFrame(all_legs)
-
-            # print(df_all_legs)
-
-            #Loop and send indv orders:
-            for index, row in df_all_legs.iterrows():
-                if row["strikes"] != 0:
-                    try:
-                        # Send Order
-                        df_all_legs[index, "data_dict"], df_all_legs[index, "response"] = \
-                            self.send_order_from_leg(account_number, 0, [row["legs"]], "Day", order_type, row["price_effect"])
-                        time.sleep(2)
-                    except:
-                        continue
-                    
-
-
-            #This did not work, instead the below loop will go back and get the filled orders in last minute
-            #Loop and get order_list and fills:
-            # for index, row in df_all_legs.iterrows():
-            #     if row["strikes"] != 0:
-            #         try:
-            #             order_list = str(order_list) + ";" + str(df_all_legs[index, "response"]['data']['order']['id'])
-            #             fillPrice = fillPrice + (row["multiply"] * self.getOrderFillAmt(account_number, df_all_legs[index, "response"]['data']['order']['id']))
-            #         except:
-            #             continue
-
-            #Get filled market orders numbers and fill prices. Need to wait.
-            time.sleep(4) 
-            order_list = ""
-            for index, row in df_all_legs.iterrows():
-                if row["strikes"] != 0:
-                    fillPrice1, orderID1 = self.getFillPriceMarket(account_number,row["legs"]["symbol"], 1)
-                    print(row["legs"]["symbol"] + ": " + str(fillPrice1)+ ": " + str(orderID1))
-                    fillPrice = fillPrice + row["multiply"] * fillPrice1
-                    order_list = order_list + ";" + str(orderID1)
+            legs = []
+            for leg, strike, leg_price_effect, multiply in zip(all_legs["legs"], all_legs["strikes"],
+                                                               all_legs["price_effect"], all_legs["multiply"]):
+                if strike != 0:
+                    legs.append((leg, leg_price_effect, multiply))
 
+            submission = self.place_legs(account_number, legs, order_type)
+            order_list = ""
+            for result in submission.results:
+                print(result.leg["symbol"] + ": " + str(result.fill_price) + ": " + str(result.order_id))
+                order_list = order_list + ";" + (str(result.order_id) if result.order_id is not None else "")
+            fillPrice = submission.net_fill_price
 
         return order_list, fillPrice
 
 
 
-    #Short Call, Short Put, Expiry, Amount
-    def build_Cr_IF(self, SC, LC, SP, LP, Exp, Amt, Ticker = "SPXW", No_Wings=False):
-        # Build legs
-        leg1 = self.build1leg("Sell to Open", Ticker, "C", SC, Exp)
-        leg3 = self.build1leg("Sell to Open", Ticker, "P", SP, Exp)
-        
-        # Combine legs
-        if No_Wings:
-            legs = [leg1, leg3]
-        else:    
-            leg2 = self.build1leg("Buy to Open",  Ticker, "C", LC, Exp)
-            leg4 = self.build1leg("Buy to Open",  Ticker, "P", LP, Exp)
-            legs = [leg1, leg2, leg3, leg4]
-
-        # Build JSON
-        json_string = self.build_json( Amt, legs)
-
-        # Convert JSON to dictionary
-        return json.loads(json_string)
-    
-    #Short Call, Short Put, Expiry, Amount
-    def build_Db_IF(self, SC, LC, SP, LP, Exp, Amt, Ticker = "SPXW",  No_Wings=False):
-        # Build legs
-        leg1 = self.build1leg("Buy to Open", Ticker, "C", SC, Exp)
-        leg3 = self.build1leg("Buy to Open", Ticker, "P", SP, Exp)
+    def place_legs(self, account_number, legs, order_type="Market", time_in_force="Day", wait_timeout=10.0):
+        """
+        Sends each leg as its own order, all at once, and waits for every leg's fills concurrently.
 
-        # Combine legs
-        if No_Wings:
-            legs = [leg1, leg3]
-        else: 
-            leg2 = self.build1leg("Sell to Open",  Ticker, "C", LC, Exp) 
-            leg4 = self.build1leg("Sell to Open",  Ticker, "P", LP, Exp) 
-            legs = [leg1, leg2, leg3, leg4]
+        Args:
+            account_number (str): The account number.
+            legs (list): List of (leg, price effect, multiply) tuples, where leg is built with build1leg and
+                multiply is the sign applied to the leg's fill price in the net fill price.
+            order_type (str): The order type of every leg. Defaults to "Market".
+            time_in_force (str): The time in force of every leg. Defaults to "Day".
+            wait_timeout (float): Seconds to wait for each leg's fills. Defaults to 10.0.
 
-        # Build JSON
-        json_string = self.build_json( Amt, legs, "Day", "Limit", "Debit")
+        Returns:
+            LegSubmission: The per-leg order IDs, statuses and fill prices. Legs that were rejected or did not
+            fill are listed in its failed property instead of raising. A leg whose order was accepted keeps its
+            order ID even if waiting for it failed; such legs are listed in its working property so they can be
+            cancelled.
+        """
+        results = [
+            LegResult(leg, multiply, build_order(0, [leg], time_in_force, order_type, price_effect))
+            for leg, price_effect, multiply in legs
+        ]
 
-        # Convert JSON to dictionary
-        return json.loads(json_string)
+        for result in results:
+            self.tracer.on_build(result.order)
 
-    #Short Call, Short Put, Expiry, Amount
-    def build_Cr_IF_Shorts(self, SC, SP, Exp, Amt, Ticker = "SPXW"):
-        # Build legs
-        leg1 = self.build1leg("Sell to Open", Ticker, "C", SC, Exp)
+        def place(result):
+            result.handle = self.fill_tracker.submit(account_number, result.order)
+            try:
+                result.handle.wait(wait_timeout)
+            except Exception as e:
+                result.wait_error = e
 
-        leg3 = self.build1leg("Sell to Open", Ticker, "P", SP, Exp)
+        _, errors = fan_out({i: (lambda r=result: place(r)) for i, result in enumerate(results)})
+        for i, error in errors.items():
+            results[i].error = error
+        return LegSubmission(results)
 
+    def allocate(self, order, quantities, wait_timeout=None):
+        """
+        Sends one order template to several accounts at once, scaled to each account's quantity. Every account's
+        order is built before the first one is sent and all of them are in flight together, so the accounts reach
+        the market within one round trip of each other.
 
+        Args:
+            order (dict): The order template, e.g. from build_Any_Trade, with leg quantities for one unit.
+            quantities (dict): Dictionary of account number -> number of units. Accounts with 0 are skipped.
+            wait_timeout (float, optional): Seconds to wait for the fills of every account. Defaults to None
+                (return as soon as the orders are acknowledged).
 
-        # Combine legs
-        legs = [leg1, leg3]
+        Returns:
+            Allocation: The per-account order IDs and statuses. Accounts whose order was not accepted, or whose
+            wait failed, are listed in its failed property instead of raising.
 
-        # Build JSON
-        json_string = self.build_json( Amt, legs)
+        Raises:
+            Exception: If a quantity of the template or of an account is not a positive integer. Nothing is sent
+                in that case.
+        """
+        orders = [
+            AccountOrder(account_number, quantity, scale_order(order, quantity))
+            for account_number, quantity in quantities.items() if quantity
+        ]
+        for account_order in orders:
+            self.tracer.on_build(account_order.order)
+
+        def submit(account_order):
+            account_order.handle = self.fill_tracker.submit(account_order.account_number, account_order.order)
+
+        _, errors = fan_out({i: (lambda o=account_order: submit(o)) for i, account_order in enumerate(orders)},
+                            max(len(orders), 1))
+        for i, error in errors.items():
+            orders[i].error = error
+        allocation = Allocation(orders)
+        if wait_timeout is not None:
+            allocation.wait(wait_timeout)
+        return allocation
 
-        # Convert JSON to dictionary
-        return json.loads(json_string)
+    #Short Call, Short Put, Expiry, Amount
+    def build_Cr_IF(self, SC, LC, SP, LP, Exp, Amt, Ticker = "SPXW", No_Wings=False):
+        strikes = {"SC": SC, "LC": LC, "SP": SP, "LP": LP}
+        template = STRANGLE if No_Wings else IRON_CONDOR
+        order = template.build(Ticker, Exp, strikes, Amt)
+        self.tracer.on_build(order)
+        return order
+    
+    #Short Call, Short Put, Expiry, Amount
+    def build_Db_IF(self, SC, LC, SP, LP, Exp, Amt, Ticker = "SPXW",  No_Wings=False):
+        strikes = {"SC": SC, "LC": LC, "SP": SP, "LP": LP}
+        template = STRANGLE if No_Wings else IRON_CONDOR
+        order = template.build(Ticker, Exp, strikes, Amt, credit=False)
+        self.tracer.on_build(order)
+        return order
+
+    #Short Call, Short Put, Expiry, Amount
+    def build_Cr_IF_Shorts(self, SC, SP, Exp, Amt, Ticker = "SPXW"):
+        order = STRANGLE.build(Ticker, Exp, {"SC": SC, "SP": SP}, Amt)
+        self.tracer.on_build(order)
+        return order
     
     
         
@@ -719,13 +744,4 @@ class TastytradeOrder:
         
         #Get order
         response = self.get_order(account_number, order_number)
-        netAmt = 0
-        #print('response: ', json.dumps(response,indent = 4))
-        for leg in response['data']['legs']:
-            for fill in leg['fills']:
-                if 'Buy' in leg['action']:
-                    netAmt = netAmt + (-1) * float(fill['fill-price']) * float(fill['quantity'])
-                elif 'Sell' in leg['action']:
-                    netAmt = netAmt + float(fill['fill-price']) * float(fill['quantity'])
-        
-        return round(netAmt/response['data']['size'],2)
+        return net_fill_amount(response['data'])
@@ -0,0 +1,278 @@
+import json
+import sqlite3
+import threading
+from typing import List
+
+from tastytrade_api.account.fills import TERMINAL_STATUSES
+from tastytrade_api.account.order import TastytradeOrder
+from tastytrade_api.concurrency import DEFAULT_MAX_WORKERS, fan_out
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY,
+    account_number TEXT,
+    underlying_symbol TEXT,
+    status TEXT,
+    order_type TEXT,
+    time_in_force TEXT,
+    price REAL,
+    price_effect TEXT,
+    size REAL,
+    date TEXT,
+    received_at TEXT,
+    updated_at TEXT,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS legs (
+    order_id INTEGER,
+    leg_index INTEGER,
+    symbol TEXT,
+    instrument_type TEXT,
+    action TEXT,
+    quantity REAL,
+    remaining_quantity REAL,
+    PRIMARY KEY (order_id, leg_index)
+);
+CREATE TABLE IF NOT EXISTS fills (
+    order_id INTEGER,
+    leg_index INTEGER,
+    fill_index INTEGER,
+    symbol TEXT,
+    action TEXT,
+    quantity REAL,
+    fill_price REAL,
+    filled_at TEXT,
+    PRIMARY KEY (order_id, leg_index, fill_index)
+);
+CREATE INDEX IF NOT EXISTS orders_account_date ON orders (account_number, date);
+CREATE INDEX IF NOT EXISTS orders_account_updated ON orders (account_number, updated_at);
+CREATE INDEX IF NOT EXISTS orders_underlying ON orders (underlying_symbol, date);
+CREATE INDEX IF NOT EXISTS orders_status ON orders (status);
+CREATE INDEX IF NOT EXISTS orders_order_type ON orders (order_type);
+CREATE INDEX IF NOT EXISTS legs_symbol ON legs (symbol);
+CREATE INDEX IF NOT EXISTS fills_symbol ON fills (symbol, filled_at);
+"""
+
+
+def _float(value):
+    return float(value) if value not in (None, "") else None
+
+
+class OrderHistoryArchive:
+    """
+    A local SQLite archive of orders, legs and fills that answers order history queries offline.
+
+    Syncing only requests orders received since the newest `received-at` already archived for the account, since
+    the API filters `start-at` by received time. Orders received earlier can still change until they reach a final
+    status, so every archived order that is not final is fetched again with get_order. The first page tells how
+    many pages there are and the remaining pages and the re-fetched orders are requested concurrently. Orders are
+    upserted, so an order that changed since it was archived is replaced with its latest state.
+
+    Args:
+        session_token (str): The session token used to authenticate API requests.
+        api_url (str): The base URL of the API.
+        path (str): The SQLite database file. Defaults to ":memory:".
+        per_page (int): The number of orders requested per page. Defaults to 200.
+        max_workers (int): The maximum number of page requests in flight at once. Defaults to 16.
+    """
+
+    def __init__(self, session_token, api_url, path: str = ":memory:", per_page: int = 200,
+                 max_workers=DEFAULT_MAX_WORKERS):
+        self.order_api = TastytradeOrder(session_token, api_url)
+        self.per_page = per_page
+        self.max_workers = max_workers
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        """Closes the database."""
+        self.connection.close()
+
+    def last_updated_at(self, account_number: str):
+        """
+        Returns the newest `updated-at` archived for an account, or None if the account has no archived orders.
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT MAX(updated_at) FROM orders WHERE account_number = ?", (account_number,)
+            ).fetchone()
+        return row[0]
+
+    def last_received_at(self, account_number: str):
+        """
+        Returns the newest `received-at` archived for an account, or None if the account has no archived orders.
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT MAX(received_at) FROM orders WHERE account_number = ?", (account_number,)
+            ).fetchone()
+        return row[0]
+
+    def working_order_ids(self, account_number: str) -> List[int]:
+        """
+        Returns the ids of the archived orders of an account that have not reached a final status.
+        """
+        with self._lock:
+            placeholders = ", ".join("?" * len(TERMINAL_STATUSES))
+            rows = self.connection.execute(
+                f"SELECT id FROM orders WHERE account_number = ? AND status NOT IN ({placeholders})",
+                (account_number, *TERMINAL_STATUSES)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _get_page(self, account_number, page_offset, start_at):
+        return self.order_api.get_orders(account_number, per_page=self.per_page, page_offset=page_offset,
+                                         start_at=start_at, sort="Asc")
+
+    def sync(self, account_number: str, start_date: str = None) -> int:
+        """
+        Downloads the orders of an account received since the last sync, and the latest state of its archived
+        orders that were not final, and archives them.
+
+        Args:
+            account_number (str): The account number.
+            start_date (str, optional): The first date to download when the account has no archived orders, in
+                yyyy-mm-dd format. Defaults to None (the API's default range).
+
+        Returns:
+            int: The number of orders downloaded.
+
+        Raises:
+            Exception: If any of the requests failed. Nothing is archived in that case.
+        """
+        # Inclusive, so orders received in the same instant as the newest archived one are not skipped
+        start_at = self.last_received_at(account_number)
+        if start_at is None and start_date is not None:
+            start_at = f"{start_date}T00:00:00Z"
+
+        first = self._get_page(account_number, 0, start_at)
+        orders = list(first["data"]["items"])
+        total_pages = (first.get("pagination") or {}).get("total-pages") or 1
+        calls = {
+            ("page", page): lambda page=page: self._get_page(account_number, page, start_at)
+            for page in range(1, total_pages)
+        }
+        for order_id in self.working_order_ids(account_number):
+            calls[("order", order_id)] = lambda order_id=order_id: self.order_api.get_order(account_number, order_id)
+        results, errors = fan_out(calls, self.max_workers)
+        if errors:
+            # Archiving a partial download would move the sync point past the missing pages
+            raise Exception(f"Error syncing orders of account {account_number}: {errors}")
+        for key in sorted(results):
+            if key[0] == "page":
+                orders.extend(results[key]["data"]["items"])
+        # The pages already hold the latest state of the orders they include
+        downloaded = {str(order["id"]) for order in orders}
+        orders.extend(results[key]["data"] for key in sorted(results)
+                      if key[0] == "order" and str(key[1]) not in downloaded)
+
+        self.store(orders)
+        return len(orders)
+
+    def store(self, orders: List[dict]):
+        """
+        Upserts orders, with their legs and fills, into the archive.
+
+        Args:
+            orders (list of dict): Order objects, as returned by the API.
+        """
+        order_rows = []
+        leg_rows = []
+        fill_rows = []
+        for order in orders:
+            received_at = order.get("received-at") or ""
+            order_rows.append((
+                int(order["id"]), order.get("account-number"), order.get("underlying-symbol"), order.get("status"),
+                order.get("order-type"), order.get("time-in-force"), _float(order.get("price")),
+                order.get("price-effect"), _float(order.get("size")), received_at[:10] or None,
+                received_at or None, order.get("updated-at"), json.dumps(order)
+            ))
+            for leg_index, leg in enumerate(order.get("legs", [])):
+                leg_rows.append((
+                    int(order["id"]), leg_index, leg.get("symbol"), leg.get("instrument-type"), leg.get("action"),
+                    _float(leg.get("quantity")), _float(leg.get("remaining-quantity"))
+                ))
+                for fill_index, fill in enumerate(leg.get("fills", [])):
+                    fill_rows.append((
+                        int(order["id"]), leg_index, fill_index, leg.get("symbol"), leg.get("action"),
+                        _float(fill.get("quantity")), _float(fill.get("fill-price")), fill.get("filled-at")
+                    ))
+
+        order_ids = [(row[0],) for row in order_rows]
+        with self._lock, self.connection:
+            self.connection.executemany("DELETE FROM legs WHERE order_id = ?", order_ids)
+            self.connection.executemany("DELETE FROM fills WHERE order_id = ?", order_ids)
+            self.connection.executemany(f"INSERT OR REPLACE INTO orders VALUES ({', '.join('?' * 13)})", order_rows)
+            self.connection.executemany(f"INSERT INTO legs VALUES ({', '.join('?' * 7)})", leg_rows)
+            self.connection.executemany(f"INSERT INTO fills VALUES ({', '.join('?' * 8)})", fill_rows)
+
+    @staticmethod
+    def _where(account_number, underlying_symbol, status, order_type, start_date, end_date, prefix="orders."):
+        clauses = []
+        params = []
+        for column, value in (("account_number", account_number), ("underlying_symbol", underlying_symbol),
+                              ("order_type", order_type)):
+            if value is not None:
+                clauses.append(f"{prefix}{column} = ?")
+                params.append(value)
+        if status is not None:
+            status = [status] if isinstance(status, str) else list(status)
+            clauses.append(f"{prefix}status IN ({', '.join('?' * len(status))})")
+            params.extend(status)
+        if start_date is not None:
+            clauses.append(f"{prefix}date >= ?")
+            params.append(start_date)
+        if end_date is not None:
+            clauses.append(f"{prefix}date <= ?")
+            params.append(end_date)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def get_orders(self, account_number: str = None, underlying_symbol: str = None, status=None,
+                   order_type: str = None, start_date: str = None, end_date: str = None) -> List[dict]:
+        """
+        Returns archived orders matching the filters, oldest first.
+
+        Args:
+            account_number (str, optional): The account to filter by. Defaults to None.
+            underlying_symbol (str, optional): The underlying symbol to filter by. Defaults to None.
+            status (str or list of str, optional): The status values to filter by. Defaults to None.
+            order_type (str, optional): The order type to filter by. Defaults to None.
+            start_date (str, optional): The first received date, in yyyy-mm-dd format. Defaults to None.
+            end_date (str, optional): The last received date, in yyyy-mm-dd format. Defaults to None.
+
+        Returns:
+            list: List of order objects, as returned by the API.
+        """
+        where, params = self._where(account_number, underlying_symbol, status, order_type, start_date, end_date)
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT data FROM orders{where} ORDER BY received_at, id", params
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def get_fills(self, account_number: str = None, underlying_symbol: str = None, symbol: str = None,
+                  start_date: str = None, end_date: str = None) -> List[dict]:
+        """
+        Returns archived fills matching the filters, oldest first. See get_orders for the filters.
+
+        Args:
+            symbol (str, optional): The leg symbol to filter by. Defaults to None.
+
+        Returns:
+            list: List of dictionaries with the order id, account number, underlying symbol, symbol, action,
+            quantity, fill price and fill time of every fill.
+        """
+        where, params = self._where(account_number, underlying_symbol, None, None, start_date, end_date)
+        if symbol is not None:
+            where += (" AND " if where else " WHERE ") + "fills.symbol = ?"
+            params.append(symbol)
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT fills.order_id, orders.account_number, orders.underlying_symbol, fills.symbol, fills.action, "
+                "fills.quantity, fills.fill_price, fills.filled_at "
+                f"FROM fills JOIN orders ON orders.id = fills.order_id{where} ORDER BY fills.filled_at, fills.order_id",
+                params
+            ).fetchall()
+        return [dict(row) for row in rows]
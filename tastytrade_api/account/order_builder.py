@@ -0,0 +1,188 @@
+import datetime
+from functools import lru_cache
+from typing import Dict, List, Tuple, Union
+
+from tastytrade_api.symbology import to_tastytrade_option_symbol
+
+SELL_TO_OPEN = "Sell to Open"
+BUY_TO_OPEN = "Buy to Open"
+
+
+@lru_cache(maxsize=4096)
+def option_symbol(ticker: str, option_type: str, strike: float, expiration: Union[datetime.date, str]) -> str:
+    """
+    Returns the Tastytrade option symbol for a contract, cached so repeated builds of the same strikes do not
+    format the symbol again.
+
+    Args:
+        ticker (str): Ticker symbol for the underlying asset.
+        option_type (str): "C" or "P".
+        strike (float): Strike price of the option.
+        expiration (datetime.date or str): Expiration date, as a date or in yyyy-mm-dd format.
+
+    Returns:
+        str: Tastytrade option symbol.
+    """
+    if isinstance(expiration, (datetime.date, datetime.datetime)):
+        expiration = expiration.strftime("%Y-%m-%d")
+    return to_tastytrade_option_symbol(ticker, strike, option_type, expiration)
+
+
+def build_leg(action: str, symbol: str, quantity=1, instrument_type: str = "Equity Option") -> dict:
+    """
+    Returns an order leg in the wire format.
+    """
+    return {
+        "action": action,
+        "symbol": symbol,
+        "quantity": quantity,
+        "instrument-type": instrument_type
+    }
+
+
+def build_order(price, legs: List[dict], time_in_force: str = "Day", order_type: str = "Limit",
+                price_effect: str = "Credit") -> dict:
+    """
+    Returns an order in the wire format accepted by create_order. Market orders carry no price or price effect.
+
+    Args:
+        price: The limit price.
+        legs (list): The order legs.
+        time_in_force (str): Defaults to "Day".
+        order_type (str): Defaults to "Limit".
+        price_effect (str): "Credit" or "Debit". Defaults to "Credit".
+
+    Returns:
+        dict: The order.
+    """
+    if order_type == "Limit":
+        return {
+            "time-in-force": time_in_force,
+            "order-type": order_type,
+            "price": price,
+            "price-effect": price_effect,
+            "legs": legs
+        }
+    return {
+        "time-in-force": time_in_force,
+        "order-type": order_type,
+        "legs": legs
+    }
+
+
+def leg_sign(action: str) -> int:
+    """Returns +1 for sell actions and -1 for buy actions, the sign of the leg's price in a net price."""
+    return 1 if "Sell" in action else -1
+
+
+def net_prices(legs: List[dict], quotes: Dict[str, tuple], size=1) -> tuple:
+    """
+    Returns the natural and mid net price of a set of legs per unit of order size, signed like net fill amounts:
+    credits are positive and debits negative.
+
+    The natural price sells at the bid and buys at the ask; it is the price that fills immediately.
+
+    Args:
+        legs (list of dict): The order legs.
+        quotes (dict): Dictionary of leg symbol -> (bid, ask).
+        size (int): The order size. Defaults to 1.
+
+    Returns:
+        tuple: The (natural, mid) prices, NaN if a leg has no quote.
+    """
+    natural = 0.0
+    mid = 0.0
+    for leg in legs:
+        bid, ask = quotes.get(leg["symbol"], (float("nan"), float("nan")))
+        ratio = float(leg.get("quantity", 1)) / float(size or 1)
+        if leg_sign(leg["action"]) > 0:
+            natural += ratio * float(bid)
+        else:
+            natural -= ratio * float(ask)
+        mid += leg_sign(leg["action"]) * ratio * (float(bid) + float(ask)) / 2
+    return natural, mid
+
+
+class StructureTemplate:
+    """
+    A reusable option structure, compiled once into its leg layout.
+
+    Each leg is described by (strike name, option type, side), where side is "short" or "long". Built as a credit,
+    short legs sell to open and long legs buy to open; built as a debit, the actions are swapped.
+
+    Args:
+        name (str): The template name.
+        legs (list of tuple): The leg layout.
+    """
+
+    def __init__(self, name: str, legs: List[Tuple[str, str, str]]):
+        self.name = name
+        self.legs = tuple(legs)
+        self.strike_names = tuple(strike_name for strike_name, _, _ in self.legs)
+
+    def build_legs(self, ticker: str, expiration: Union[datetime.date, str], strikes: Dict[str, float],
+                   quantity=1, credit: bool = True) -> List[dict]:
+        """
+        Returns the legs of the structure.
+
+        Args:
+            ticker (str): Ticker symbol for the underlying asset.
+            expiration (datetime.date or str): Expiration date of every leg.
+            strikes (dict): Dictionary of strike name -> strike price for every leg of the template.
+            quantity (int): The quantity of every leg. Defaults to 1.
+            credit (bool): Whether the structure is sold for a credit. Defaults to True.
+
+        Returns:
+            list: The order legs.
+        """
+        short_action, long_action = (SELL_TO_OPEN, BUY_TO_OPEN) if credit else (BUY_TO_OPEN, SELL_TO_OPEN)
+        return [
+            build_leg(short_action if side == "short" else long_action,
+                      option_symbol(ticker, option_type, strikes[strike_name], expiration), quantity)
+            for strike_name, option_type, side in self.legs
+        ]
+
+    def build(self, ticker: str, expiration: Union[datetime.date, str], strikes: Dict[str, float], price,
+              quantity=1, credit: bool = True, order_type: str = "Limit", time_in_force: str = "Day") -> dict:
+        """
+        Returns the structure as an order in the wire format. See build_legs for the leg arguments.
+
+        Args:
+            price: The limit price.
+            order_type (str): Defaults to "Limit".
+            time_in_force (str): Defaults to "Day".
+
+        Returns:
+            dict: The order.
+        """
+        legs = self.build_legs(ticker, expiration, strikes, quantity, credit)
+        return build_order(price, legs, time_in_force, order_type, "Credit" if credit else "Debit")
+
+    def __str__(self):
+        return f"{self.name}: {', '.join(f'{side} {option_type} {name}' for name, option_type, side in self.legs)}"
+
+
+IRON_CONDOR = StructureTemplate("Iron Condor", [("SC", "C", "short"), ("LC", "C", "long"),
+                                                ("SP", "P", "short"), ("LP", "P", "long")])
+STRANGLE = StructureTemplate("Strangle", [("SC", "C", "short"), ("SP", "P", "short")])
+CALL_VERTICAL = StructureTemplate("Call Vertical", [("SC", "C", "short"), ("LC", "C", "long")])
+PUT_VERTICAL = StructureTemplate("Put Vertical", [("SP", "P", "short"), ("LP", "P", "long")])
+SINGLE_CALL = StructureTemplate("Single Call", [("SC", "C", "short")])
+SINGLE_PUT = StructureTemplate("Single Put", [("SP", "P", "short")])
+
+
+def template_for(SC, LC, SP, LP) -> StructureTemplate:
+    """
+    Picks the template matching the non-zero strikes, following the build_Any_Trade conventions: a zero short
+    call or short put drops that side, and zero long strikes drop the wings.
+
+    Returns:
+        StructureTemplate: The matching template.
+    """
+    if SC == 0:
+        return SINGLE_PUT if LP == 0 else PUT_VERTICAL
+    if SP == 0:
+        return SINGLE_CALL if LC == 0 else CALL_VERTICAL
+    if LC == 0 and LP == 0:
+        return STRANGLE
+    return IRON_CONDOR
@@ -0,0 +1,141 @@
+from typing import Dict, List
+
+from tastytrade_api.account.fills import TERMINAL_STATUSES
+from tastytrade_api.account.order import TastytradeOrder
+from tastytrade_api.account.streamed_state import StreamedAccountState
+from tastytrade_api.concurrency import DEFAULT_MAX_WORKERS, fan_out
+
+
+class LiveOrderStore(StreamedAccountState):
+    """
+    A local store of orders that is loaded from one get_live_orders snapshot per account and then kept current by
+    applying Order messages from the account streamer, so order status lookups are in-memory reads.
+
+    Orders are keyed by order id and indexed per account, per underlying symbol and per leg symbol. Orders that
+    reach a final status stay in the store until the next resync, like they do in the live orders endpoint. If
+    the streamer connection drops, the store is marked stale and resyncs from REST in the background as soon as
+    the connection is back; messages received meanwhile are replayed on top of the snapshot. See
+    StreamedAccountState.
+
+    Listeners are called with ("order", order id, order) or ("resync", None, None).
+
+    Args:
+        session_token (str): The session token used to authenticate API requests.
+        api_url (str): The base URL of the API.
+        account_numbers (list of str): The accounts to track.
+        max_workers (int): The maximum number of snapshot requests in flight at once. Defaults to 16.
+        reconcile_interval (float, optional): Seconds between background resyncs once attached. Defaults to None.
+    """
+
+    MESSAGE_TYPES = {"Order": "order"}
+    NAME = "Order store"
+
+    def __init__(self, session_token, api_url, account_numbers: List[str], max_workers=DEFAULT_MAX_WORKERS,
+                 reconcile_interval: float = None):
+        super().__init__(account_numbers, max_workers, reconcile_interval)
+        self.order_api = TastytradeOrder(session_token, api_url)
+        self.orders: Dict[str, dict] = {}
+        self.by_account: Dict[str, set] = {}
+        self.by_underlying: Dict[str, set] = {}
+        self.by_symbol: Dict[str, set] = {}
+
+    def _fetch(self):
+        calls = {
+            account_number: lambda n=account_number: self.order_api.get_live_orders(n)
+            for account_number in self.account_numbers
+        }
+        results, errors = fan_out(calls, self.max_workers)
+        if errors:
+            raise Exception(f"Error resyncing order store: {errors}")
+        return results
+
+    def _reset(self):
+        self.orders.clear()
+        self.by_account.clear()
+        self.by_underlying.clear()
+        self.by_symbol.clear()
+
+    def _load(self, snapshot):
+        for account_number in self.account_numbers:
+            for order in snapshot[account_number]["data"]["items"]:
+                self._store(order)
+
+    def _apply(self, kind, data):
+        if data.get("id") is None or data.get("account-number") not in self.account_numbers:
+            return None
+        order_id = str(data["id"])
+        self._store(data)
+        return "order", order_id, data
+
+    def _current(self, kind, data):
+        return self.orders.get(str(data.get("id")))
+
+    def on_order_message(self, message: dict):
+        """Applies an Order message from the account streamer."""
+        self._receive("order", message)
+
+    def _store(self, order):
+        order_id = str(order["id"])
+        self._discard(order_id)
+        self.orders[order_id] = order
+        self.by_account.setdefault(order.get("account-number"), set()).add(order_id)
+        self.by_underlying.setdefault(order.get("underlying-symbol"), set()).add(order_id)
+        for leg in order.get("legs", []):
+            self.by_symbol.setdefault(leg.get("symbol"), set()).add(order_id)
+
+    def _discard(self, order_id):
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return
+        self.by_account.get(order.get("account-number"), set()).discard(order_id)
+        self.by_underlying.get(order.get("underlying-symbol"), set()).discard(order_id)
+        for leg in order.get("legs", []):
+            self.by_symbol.get(leg.get("symbol"), set()).discard(order_id)
+
+    def get_order(self, order_id) -> dict:
+        """
+        Returns a single order, or None if it is not in the store.
+        """
+        with self._lock:
+            return self.orders.get(str(order_id))
+
+    def get_status(self, order_id) -> str:
+        """
+        Returns the latest known status of an order, or None if it is not in the store.
+        """
+        order = self.get_order(order_id)
+        return order.get("status") if order else None
+
+    def get_orders(self, account_number: str = None, underlying_symbol: str = None, symbol: str = None,
+                   status=None, working_only: bool = False) -> List[dict]:
+        """
+        Returns the orders in the store, optionally filtered. Filters are combined.
+
+        Args:
+            account_number (str, optional): The account to filter by. Defaults to None.
+            underlying_symbol (str, optional): The underlying symbol to filter by. Defaults to None.
+            symbol (str, optional): A leg symbol to filter by. Defaults to None.
+            status (str or list of str, optional): The status values to filter by. Defaults to None.
+            working_only (bool): Whether to leave out orders with a final status. Defaults to False.
+
+        Returns:
+            list: List of order objects, sorted by order id.
+        """
+        if isinstance(status, str):
+            status = [status]
+        with self._lock:
+            ids = None
+            for index, value in ((self.by_account, account_number), (self.by_underlying, underlying_symbol),
+                                 (self.by_symbol, symbol)):
+                if value is not None:
+                    matching = index.get(value, set())
+                    ids = ids & matching if ids is not None else set(matching)
+            if ids is None:
+                ids = set(self.orders)
+            orders = [self.orders[order_id] for order_id in ids]
+
+        if status is not None:
+            orders = [order for order in orders if order.get("status") in status]
+        if working_only:
+            orders = [order for order in orders if order.get("status") not in TERMINAL_STATUSES]
+        return sorted(orders, key=lambda order: int(order["id"]))
@@ -0,0 +1,121 @@
+import time
+from typing import Dict, List
+
+from tastytrade_api.account.account_handler import TastytradeAccount
+from tastytrade_api.account.balances_positions import TastytradeAccountPositions
+from tastytrade_api.concurrency import fan_out
+
+
+class AccountSnapshot:
+    """
+    A point-in-time view of one account, assembled from requests issued concurrently.
+
+    Args:
+        account_number (str): The account number.
+        balances (dict): The account balances, as returned by get_account_balances.
+        positions (list): The account positions, as returned by get_positions.
+        margin_requirements (dict): The margin/capital requirements report, as returned by get_margin_requirements.
+        position_limit (int): The position limit, as returned by get_position_limit.
+        requested_at (float): Epoch time at which the requests were issued.
+        received_at (float): Epoch time at which the last response arrived.
+        errors (dict): Dictionary of part name -> exception for every request that failed.
+    """
+
+    PARTS = ("balances", "positions", "margin_requirements", "position_limit")
+
+    def __init__(self, account_number, balances=None, positions=None, margin_requirements=None,
+                 position_limit=None, requested_at=None, received_at=None, errors=None):
+        self.account_number = account_number
+        self.balances = balances
+        self.positions = positions
+        self.margin_requirements = margin_requirements
+        self.position_limit = position_limit
+        self.requested_at = requested_at
+        self.received_at = received_at
+        self.errors = errors or {}
+
+    @property
+    def complete(self) -> bool:
+        """bool: True if every part of the snapshot was retrieved."""
+        return not self.errors
+
+    def __str__(self):
+        return (f"Account: {self.account_number}, Positions: {len(self.positions or [])}, "
+                f"Requested at: {self.requested_at}, Received at: {self.received_at}, Errors: {list(self.errors)}")
+
+
+class TastytradePortfolioSnapshot:
+    """
+    Builds snapshots of several accounts at once by fanning the balances, positions, margin requirements and
+    position limit requests of every account out concurrently.
+
+    Args:
+        session_token (str): The session token used to authenticate API requests.
+        api_url (str): The base URL of the API.
+        max_workers (int, optional): The maximum number of requests in flight at once. Defaults to None (one
+            thread per request, so every request is in flight together).
+    """
+
+    def __init__(self, session_token, api_url, max_workers=None):
+        self.session_token = session_token
+        self.api_url = api_url
+        self.max_workers = max_workers
+        self.account = TastytradeAccount(session_token, api_url)
+        self.positions = TastytradeAccountPositions(session_token, api_url)
+
+    def get_account_numbers(self) -> List[str]:
+        """
+        Returns the account numbers of the authenticated customer.
+
+        Returns:
+            list: List of account numbers.
+        """
+        return [item["account"]["account-number"] for item in self.account.get_accounts()]
+
+    def get_snapshots(self, account_numbers: List[str] = None, include_marks: bool = False) -> Dict[str, AccountSnapshot]:
+        """
+        Retrieves a snapshot of every requested account. By default the four requests of every account are all in
+        flight together, so the call takes about as long as the slowest single request. With `max_workers` set,
+        they run in ceil(4 * accounts / max_workers) waves instead.
+
+        Args:
+            account_numbers (list of str, optional): The accounts to snapshot. Defaults to every account of the
+                authenticated customer.
+            include_marks (bool, optional): Whether positions should include current quote marks. Defaults to False.
+
+        Returns:
+            dict: Dictionary of account number -> AccountSnapshot. Failed requests are reported in each snapshot's
+            errors instead of being raised.
+
+        Raises:
+            Exception: If account_numbers is not given and the accounts could not be retrieved.
+        """
+        if account_numbers is None:
+            account_numbers = self.get_account_numbers()
+
+        calls = {}
+        for account_number in account_numbers:
+            calls[(account_number, "balances")] = \
+                lambda n=account_number: self.positions.get_account_balances(n)
+            calls[(account_number, "positions")] = \
+                lambda n=account_number: self.positions.get_positions(n, include_marks=include_marks)
+            calls[(account_number, "margin_requirements")] = \
+                lambda n=account_number: self.account.get_margin_requirements(n)
+            calls[(account_number, "position_limit")] = \
+                lambda n=account_number: self.account.get_position_limit(n)
+
+        requested_at = time.time()
+        results, errors = fan_out(calls, self.max_workers or max(len(calls), 1))
+        received_at = time.time()
+
+        snapshots = {}
+        for account_number in account_numbers:
+            snapshot = AccountSnapshot(account_number, requested_at=requested_at, received_at=received_at)
+            for part in AccountSnapshot.PARTS:
+                key = (account_number, part)
+                if key in results:
+                    setattr(snapshot, part, results[key])
+                else:
+                    snapshot.errors[part] = errors[key]
+            snapshots[account_number] = snapshot
+        return snapshots
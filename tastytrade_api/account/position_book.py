@@ -0,0 +1,152 @@
+from typing import Dict, List, Tuple
+
+from tastytrade_api.account.balances_positions import TastytradeAccountPositions
+from tastytrade_api.account.streamed_state import StreamedAccountState
+from tastytrade_api.concurrency import DEFAULT_MAX_WORKERS, fan_out
+
+
+def signed_quantity(position: dict) -> float:
+    """
+    Returns the quantity of a position, negative for short positions.
+
+    Args:
+        position (dict): A position object, as returned by the API or the account streamer.
+
+    Returns:
+        float: The signed quantity.
+    """
+    quantity = float(position.get("quantity") or 0)
+    if position.get("quantity-direction") == "Short":
+        return -quantity
+    return quantity
+
+
+class TastytradePositionBook(StreamedAccountState):
+    """
+    A local book of positions and balances that is loaded from one REST snapshot and then kept current by applying
+    CurrentPosition and AccountBalance messages from the account streamer in place.
+
+    Positions are keyed by (account number, symbol) and indexed per account and per underlying symbol. If the
+    streamer connection drops, the book is marked stale and resyncs from REST in the background as soon as the
+    connection is back; messages received meanwhile are replayed on top of the snapshot. See StreamedAccountState.
+
+    Listeners are called with ("position", key, position), ("balance", account number, balances) or
+    ("resync", None, None). Closed positions are reported with a quantity of 0.
+
+    Args:
+        session_token (str): The session token used to authenticate API requests.
+        api_url (str): The base URL of the API.
+        account_numbers (list of str): The accounts to track.
+        max_workers (int): The maximum number of snapshot requests in flight at once. Defaults to 16.
+        reconcile_interval (float, optional): Seconds between background resyncs once attached. Defaults to None.
+    """
+
+    MESSAGE_TYPES = {"CurrentPosition": "position", "AccountBalance": "balance"}
+    NAME = "Position book"
+
+    def __init__(self, session_token, api_url, account_numbers: List[str], max_workers=DEFAULT_MAX_WORKERS,
+                 reconcile_interval: float = None):
+        super().__init__(account_numbers, max_workers, reconcile_interval)
+        self.positions_api = TastytradeAccountPositions(session_token, api_url)
+        self.positions: Dict[Tuple[str, str], dict] = {}
+        self.balances: Dict[str, dict] = {}
+        self.by_account: Dict[str, set] = {}
+        self.by_underlying: Dict[str, set] = {}
+
+    def _fetch(self):
+        calls = {}
+        for account_number in self.account_numbers:
+            calls[(account_number, "positions")] = lambda n=account_number: self.positions_api.get_positions(n)
+            calls[(account_number, "balances")] = lambda n=account_number: self.positions_api.get_account_balances(n)
+        results, errors = fan_out(calls, self.max_workers)
+        if errors:
+            raise Exception(f"Error resyncing position book: {errors}")
+        return results
+
+    def _reset(self):
+        self.positions.clear()
+        self.by_account.clear()
+        self.by_underlying.clear()
+
+    def _load(self, snapshot):
+        for account_number in self.account_numbers:
+            self.balances[account_number] = snapshot[(account_number, "balances")]
+            for position in snapshot[(account_number, "positions")]:
+                self._store(position)
+
+    def _apply(self, kind, data):
+        if data.get("account-number") not in self.account_numbers:
+            return None
+        if kind == "balance":
+            self.balances[data["account-number"]] = data
+            return "balance", data["account-number"], data
+        key = (data["account-number"], data["symbol"])
+        if signed_quantity(data) == 0:
+            self._discard(key)
+        else:
+            self._store(data)
+        return "position", key, data
+
+    def _current(self, kind, data):
+        if kind == "balance":
+            return self.balances.get(data.get("account-number"))
+        return self.positions.get((data.get("account-number"), data.get("symbol")))
+
+    def on_position_message(self, message: dict):
+        """Applies a CurrentPosition message from the account streamer."""
+        self._receive("position", message)
+
+    def on_balance_message(self, message: dict):
+        """Applies an AccountBalance message from the account streamer."""
+        self._receive("balance", message)
+
+    def _store(self, position):
+        key = (position["account-number"], position["symbol"])
+        self._discard(key)
+        self.positions[key] = position
+        self.by_account.setdefault(key[0], set()).add(key)
+        self.by_underlying.setdefault(position.get("underlying-symbol"), set()).add(key)
+
+    def _discard(self, key):
+        position = self.positions.pop(key, None)
+        if position is None:
+            return
+        self.by_account.get(key[0], set()).discard(key)
+        self.by_underlying.get(position.get("underlying-symbol"), set()).discard(key)
+
+    def get_positions(self, account_number: str = None, underlying_symbol: str = None) -> List[dict]:
+        """
+        Returns the open positions in the book, optionally filtered by account and underlying symbol.
+
+        Args:
+            account_number (str, optional): The account to filter by. Defaults to None.
+            underlying_symbol (str, optional): The underlying symbol to filter by. Defaults to None.
+
+        Returns:
+            list: List of position objects.
+        """
+        with self._lock:
+            if account_number is None and underlying_symbol is None:
+                keys = set(self.positions)
+            else:
+                keys = None
+                if account_number is not None:
+                    keys = set(self.by_account.get(account_number, ()))
+                if underlying_symbol is not None:
+                    underlying_keys = self.by_underlying.get(underlying_symbol, set())
+                    keys = keys & underlying_keys if keys is not None else set(underlying_keys)
+            return [self.positions[key] for key in sorted(keys)]
+
+    def get_position(self, account_number: str, symbol: str) -> dict:
+        """
+        Returns a single position, or None if the account has no open position in the symbol.
+        """
+        with self._lock:
+            return self.positions.get((account_number, symbol))
+
+    def get_balances(self, account_number: str) -> dict:
+        """
+        Returns the latest balances of an account, or None if they are not known.
+        """
+        with self._lock:
+            return self.balances.get(account_number)
@@ -0,0 +1,247 @@
+import logging
+import math
+from functools import reduce
+from typing import Dict, List
+
+from tastytrade_api.account.account_handler import TastytradeAccount
+from tastytrade_api.account.balances_positions import TastytradeAccountPositions
+from tastytrade_api.account.position_book import signed_quantity
+from tastytrade_api.concurrency import DEFAULT_MAX_WORKERS, fan_out
+from tastytrade_api.market_data.instruments import TastytradeInstruments
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MULTIPLIERS = {"Equity Option": 100, "Equity": 1}
+LIMIT_PREFIXES = {
+    "Equity": "equity",
+    "Equity Option": "equity-option",
+    "Future": "future",
+    "Future Option": "future-option",
+}
+BUYING_POWER_FIELDS = {"Equity": "equity-buying-power"}
+
+
+def _to_float(value, default=0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def option_root(symbol: str) -> str:
+    """Returns the root of a Tastytrade option symbol, or the symbol itself for other instruments."""
+    return symbol[:6].strip() if len(symbol) == 21 else symbol
+
+
+class PreTradeRiskGate:
+    """
+    Local pre-trade checks that run before create_order without touching the network.
+
+    Position limits, quantity precisions, balances and positions are loaded once with refresh (concurrently) and
+    every check is then a handful of dictionary lookups. Orders are rejected for a leg quantity that breaks its
+    instrument's decimal precision, an order or position size above the account's position limits, a notional
+    above `max_notional`, a debit above the available buying power, or an underlying exposure above
+    `max_concentration` of net liq. Credit orders are not checked against buying power, since their margin
+    depends on the whole position; dry_run_new_order remains the authority for that. Orders whose legs all close
+    at most the quantity held only reduce exposure, so they skip the buying power and concentration checks.
+
+    Args:
+        session_token (str): The session token used to authenticate API requests.
+        api_url (str): The base URL of the API.
+        account_number (str): The account the orders are sent to.
+        position_book (TastytradePositionBook, optional): A live book to read positions and balances from
+            instead of the refresh snapshot. Defaults to None.
+        max_notional (float, optional): The largest allowed order notional. Defaults to None (no limit).
+        max_concentration (float, optional): The largest allowed gross exposure of one underlying as a fraction
+            of net liq, e.g. 0.25. Defaults to None (no limit).
+        multipliers (dict, optional): Instrument type -> contract multiplier used when a position does not carry
+            its own. Defaults to 100 for equity options and 1 otherwise.
+    """
+
+    def __init__(self, session_token, api_url, account_number: str, position_book=None, max_notional: float = None,
+                 max_concentration: float = None, multipliers: Dict[str, float] = None):
+        self.account = TastytradeAccount(session_token, api_url)
+        self.positions_api = TastytradeAccountPositions(session_token, api_url)
+        self.instruments = TastytradeInstruments(session_token, api_url)
+        self.account_number = account_number
+        self.position_book = position_book
+        self.max_notional = max_notional
+        self.max_concentration = max_concentration
+        self.multipliers = dict(DEFAULT_MULTIPLIERS, **(multipliers or {}))
+        self.position_limit = {}
+        self.precisions: Dict[tuple, int] = {}
+        self.balances = {}
+        self.positions: Dict[str, dict] = {}
+
+    def refresh(self):
+        """
+        Reloads position limits, quantity precisions, balances and positions concurrently.
+
+        Raises:
+            Exception: If any of the requests failed.
+        """
+        calls = {
+            "position-limit": lambda: self.account.get_position_limit(self.account_number),
+            "precisions": self.instruments.get_quantity_decimal_precisions,
+        }
+        if self.position_book is None:
+            calls["balances"] = lambda: self.positions_api.get_account_balances(self.account_number)
+            calls["positions"] = lambda: self.positions_api.get_positions(self.account_number)
+        results, errors = fan_out(calls, DEFAULT_MAX_WORKERS)
+        if "position-limit" in errors:
+            # Without the limits only the size limit checks are skipped
+            logger.warning("Position limit not available, size limits are not checked: %s",
+                           errors.pop("position-limit"))
+        if errors:
+            raise Exception(f"Error refreshing risk gate: {errors}")
+
+        limit = results.get("position-limit")
+        self.position_limit = limit if isinstance(limit, dict) else {}
+        precisions = results["precisions"]
+        items = precisions.get("items", []) if isinstance(precisions, dict) else precisions
+        self.precisions = {(item.get("instrument-type"), item.get("symbol")): int(item["value"]) for item in items}
+        if self.position_book is None:
+            self.balances = results["balances"]
+            self.positions = {position["symbol"]: position for position in results["positions"]}
+
+    def _position(self, symbol):
+        if self.position_book is not None:
+            return self.position_book.get_position(self.account_number, symbol)
+        return self.positions.get(symbol)
+
+    def _positions(self, underlying_symbol):
+        if self.position_book is not None:
+            return self.position_book.get_positions(self.account_number, underlying_symbol)
+        return [p for p in self.positions.values() if p.get("underlying-symbol") == underlying_symbol]
+
+    def _balances(self):
+        if self.position_book is not None:
+            return self.position_book.get_balances(self.account_number) or {}
+        return self.balances
+
+    def _multiplier(self, instrument_type, position=None):
+        if position is not None and position.get("multiplier"):
+            return _to_float(position["multiplier"], 1.0)
+        return self.multipliers.get(instrument_type, 1)
+
+    def underlying_of(self, symbols: List[str]) -> str:
+        """
+        Returns the underlying symbol of an order's leg symbols: the underlying of the first leg with an open
+        position, otherwise the option root of the first leg.
+        """
+        for symbol in symbols:
+            position = self._position(symbol)
+            if position is not None and position.get("underlying-symbol"):
+                return position["underlying-symbol"]
+        return option_root(symbols[0])
+
+    def _limit(self, instrument_type, kind):
+        prefix = LIMIT_PREFIXES.get(instrument_type)
+        value = self.position_limit.get(f"{prefix}-{kind}") if prefix else None
+        return _to_float(value, None) if value is not None else None
+
+    def is_closing(self, order: dict) -> bool:
+        """
+        Returns True if every leg of an order closes part or all of a held position, on the side that reduces it.
+        """
+        for leg in order.get("legs", []):
+            action = leg.get("action", "")
+            if "Close" not in action:
+                return False
+            position = self._position(leg["symbol"])
+            held = signed_quantity(position) if position else 0.0
+            # Buying closes a short position and selling closes a long one
+            if ("Buy" in action and held >= 0) or ("Sell" in action and held <= 0):
+                return False
+            if _to_float(leg.get("quantity")) > abs(held):
+                return False
+        return True
+
+    def check(self, order: dict, underlying_symbol: str = None, reference_price: float = None) -> List[str]:
+        """
+        Runs every check on an order.
+
+        Args:
+            order (dict): The order, as sent to create_order.
+            underlying_symbol (str, optional): The underlying of the order. Defaults to underlying_of the legs.
+            reference_price (float, optional): The price used for notional checks of orders without a limit price.
+                Defaults to None (skip those checks).
+
+        Returns:
+            list: The reasons the order is rejected, empty if it passes.
+        """
+        violations = []
+        legs = order.get("legs", [])
+        if not legs:
+            return ["Order has no legs"]
+
+        for leg in legs:
+            symbol = leg["symbol"]
+            instrument_type = leg.get("instrument-type")
+            quantity = _to_float(leg.get("quantity"))
+            if quantity <= 0:
+                violations.append(f"{symbol}: quantity must be positive")
+                continue
+            precision = self.precisions.get((instrument_type, symbol),
+                                            self.precisions.get((instrument_type, None), 0))
+            scaled = quantity * 10 ** precision
+            if abs(scaled - round(scaled)) > 1e-9:
+                violations.append(f"{symbol}: quantity {quantity} exceeds {precision} decimal places")
+
+            order_size_limit = self._limit(instrument_type, "order-size")
+            if order_size_limit is not None and quantity > order_size_limit:
+                violations.append(f"{symbol}: quantity {quantity} exceeds order size limit {order_size_limit}")
+            position_size_limit = self._limit(instrument_type, "position-size")
+            if position_size_limit is not None and "Open" in leg.get("action", ""):
+                position = self._position(symbol)
+                held = abs(signed_quantity(position)) if position else 0.0
+                if held + quantity > position_size_limit:
+                    violations.append(f"{symbol}: position of {held + quantity} exceeds position size limit "
+                                      f"{position_size_limit}")
+
+        price = order.get("price")
+        price = _to_float(price, None) if price is not None else reference_price
+        if price is None:
+            return violations
+
+        instrument_type = legs[0].get("instrument-type")
+        size = reduce(math.gcd, (int(_to_float(leg.get("quantity"))) or 1 for leg in legs))
+        notional = abs(price) * size * self._multiplier(instrument_type)
+        if self.max_notional is not None and notional > self.max_notional:
+            violations.append(f"Notional {notional:.2f} exceeds maximum {self.max_notional:.2f}")
+
+        if self.is_closing(order):
+            return violations
+
+        balances = self._balances()
+        if order.get("price-effect") == "Debit" or (order.get("price-effect") is None and
+                                                     all("Buy" in leg.get("action", "") for leg in legs)):
+            field = BUYING_POWER_FIELDS.get(instrument_type, "derivative-buying-power")
+            buying_power = _to_float(balances.get(field), None)
+            if buying_power is not None and notional > buying_power:
+                violations.append(f"Cost {notional:.2f} exceeds {field} {buying_power:.2f}")
+
+        if self.max_concentration is not None:
+            net_liq = _to_float(balances.get("net-liquidating-value"), None)
+            underlying_symbol = underlying_symbol or self.underlying_of([leg["symbol"] for leg in legs])
+            if net_liq:
+                exposure = notional + sum(
+                    abs(signed_quantity(p)) * _to_float(p.get("mark") or p.get("close-price"))
+                    * self._multiplier(p.get("instrument-type"), p)
+                    for p in self._positions(underlying_symbol)
+                )
+                if exposure > self.max_concentration * net_liq:
+                    violations.append(f"{underlying_symbol} exposure {exposure:.2f} exceeds "
+                                      f"{self.max_concentration:.0%} of net liq {net_liq:.2f}")
+        return violations
+
+    def validate(self, order: dict, underlying_symbol: str = None, reference_price: float = None):
+        """
+        Runs every check on an order and raises if any fails. See check for the arguments.
+
+        Raises:
+            Exception: If the order breaks a check.
+        """
+        violations = self.check(order, underlying_symbol, reference_price)
+        if violations:
+            raise Exception(f"Order rejected by risk gate: {'; '.join(violations)}")
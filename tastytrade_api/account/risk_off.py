@@ -0,0 +1,291 @@
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+from tastytrade_api.account.balances_positions import TastytradeAccountPositions
+from tastytrade_api.account.fills import TERMINAL_STATUSES
+from tastytrade_api.account.order import TastytradeOrder
+from tastytrade_api.account.order_builder import build_leg, build_order
+from tastytrade_api.account.position_book import signed_quantity
+from tastytrade_api.concurrency import DEFAULT_MAX_WORKERS, fan_out
+
+logger = logging.getLogger(__name__)
+
+CANCELLABLE_STATUSES = ("Received", "Routed", "In Flight", "Live", "Contingent")
+
+
+def closing_order(position: dict, order_type: str = "Market", price: float = None) -> Optional[dict]:
+    """
+    Returns the order that closes a position, or None if the position is flat.
+
+    Args:
+        position (dict): A position object, as returned by the API or the account streamer.
+        order_type (str): The order type. Defaults to "Market".
+        price (float, optional): The limit price, required for Limit orders. Closing a long position is a credit
+            and closing a short position a debit. Defaults to None.
+
+    Returns:
+        dict: The closing order.
+
+    Raises:
+        Exception: If a Limit order has no price.
+    """
+    quantity = signed_quantity(position)
+    if quantity == 0:
+        return None
+    if order_type == "Limit" and price is None:
+        raise Exception(f"A price is required to close {position['symbol']} with a Limit order")
+    action = "Sell to Close" if quantity > 0 else "Buy to Close"
+    quantity = abs(quantity)
+    if quantity.is_integer():
+        quantity = int(quantity)
+    leg = build_leg(action, position["symbol"], quantity, position.get("instrument-type", "Equity Option"))
+    return build_order(price, [leg], "Day", order_type, "Credit" if action == "Sell to Close" else "Debit")
+
+
+class BulkResult:
+    """
+    The outcome of a bulk cancel or flatten.
+
+    Keys are ("cancel", account number, order id) for cancels and ("close", account number, symbol) for closing
+    orders. A flatten that stopped before closing reports why under ("flatten", None, None).
+
+    Attributes:
+        results (dict): Key -> API response of every request that succeeded.
+        errors (dict): Key -> exception of every request that failed.
+        elapsed (float): Seconds from the first request to the last response.
+    """
+
+    def __init__(self, results: Dict, errors: Dict, elapsed: float):
+        self.results = results
+        self.errors = errors
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        """bool: True if every request succeeded."""
+        return not self.errors
+
+    def __str__(self):
+        return f"Requests: {len(self.results) + len(self.errors)}, Errors: {len(self.errors)}, Elapsed: {self.elapsed:.3f}s"
+
+
+class TastytradeRiskOff:
+    """
+    Emergency risk-off: cancels working orders and closes positions with every request in flight at once, so the
+    time to get flat tracks the slowest single request instead of the number of orders.
+
+    Orders and positions are selected by account, underlying symbol and an optional predicate. The API has no
+    strategy tags, so a strategy is selected with a predicate over the order or position object, for example
+    one matching its leg symbols.
+
+    Args:
+        session_token (str): The session token used to authenticate API requests.
+        api_url (str): The base URL of the API.
+        max_workers (int): The maximum number of requests in flight at once. Defaults to 16.
+    """
+
+    def __init__(self, session_token, api_url, max_workers=DEFAULT_MAX_WORKERS):
+        self.order_api = TastytradeOrder(session_token, api_url)
+        self.positions_api = TastytradeAccountPositions(session_token, api_url)
+        self.max_workers = max_workers
+
+    def _fetch(self, account_numbers, fetch):
+        results, errors = fan_out({n: (lambda n=n: fetch(n)) for n in account_numbers}, self.max_workers)
+        if errors:
+            raise Exception(f"Error loading accounts: {errors}")
+        return results
+
+    @staticmethod
+    def _matches(item, underlying_symbol, predicate):
+        if underlying_symbol is not None and item.get("underlying-symbol") != underlying_symbol:
+            return False
+        return predicate is None or predicate(item)
+
+    def working_orders(self, account_numbers: List[str], underlying_symbol: str = None,
+                       predicate: Callable[[dict], bool] = None, order_store=None) -> List[dict]:
+        """
+        Returns the cancellable orders of the accounts that match the filters.
+
+        Args:
+            account_numbers (list of str): The accounts.
+            underlying_symbol (str, optional): The underlying symbol to filter by. Defaults to None.
+            predicate (callable, optional): Function returning True for orders to include. Defaults to None.
+            order_store (LiveOrderStore, optional): A store to read orders from instead of get_live_orders.
+                Defaults to None.
+
+        Returns:
+            list: List of order objects.
+        """
+        if order_store is not None and not order_store.stale:
+            orders = [order for n in account_numbers for order in order_store.get_orders(account_number=n)]
+        else:
+            results = self._fetch(account_numbers, self.order_api.get_live_orders)
+            orders = [order for n in account_numbers for order in results[n]["data"]["items"]]
+        return [
+            order for order in orders
+            if order.get("status") in CANCELLABLE_STATUSES and self._matches(order, underlying_symbol, predicate)
+        ]
+
+    def open_positions(self, account_numbers: List[str], underlying_symbol: str = None,
+                       predicate: Callable[[dict], bool] = None, position_book=None) -> List[dict]:
+        """
+        Returns the open positions of the accounts that match the filters.
+
+        Args:
+            account_numbers (list of str): The accounts.
+            underlying_symbol (str, optional): The underlying symbol to filter by. Defaults to None.
+            predicate (callable, optional): Function returning True for positions to include. Defaults to None.
+            position_book (TastytradePositionBook, optional): A book to read positions from instead of
+                get_positions. Defaults to None.
+
+        Returns:
+            list: List of position objects.
+        """
+        if position_book is not None and not position_book.stale:
+            positions = [position for n in account_numbers for position in position_book.get_positions(n)]
+        else:
+            results = self._fetch(account_numbers, self.positions_api.get_positions)
+            positions = [position for n in account_numbers for position in results[n]]
+        return [
+            position for position in positions
+            if signed_quantity(position) != 0 and self._matches(position, underlying_symbol, predicate)
+        ]
+
+    def _send(self, calls) -> BulkResult:
+        started = time.monotonic()
+        results, errors = fan_out(calls, self.max_workers)
+        result = BulkResult(results, errors, time.monotonic() - started)
+        for key, error in errors.items():
+            logger.error("Risk-off request %s failed: %s", key, error)
+        return result
+
+    def _cancel_calls(self, orders):
+        return {
+            ("cancel", order["account-number"], order["id"]):
+                lambda order=order: self.order_api.cancel_order(order["account-number"], order["id"])
+            for order in orders
+        }
+
+    def _close_calls(self, positions, order_type, prices):
+        calls = {}
+        for position in positions:
+            key = ("close", position["account-number"], position["symbol"])
+            try:
+                order = closing_order(position, order_type, (prices or {}).get(position["symbol"]))
+            except Exception as e:
+                # Reported as the error of this position's closing order, the others are still sent
+                calls[key] = lambda e=e: self._raise(e)
+                continue
+            calls[key] = lambda n=position["account-number"], order=order: self._create(n, order)
+        return calls
+
+    @staticmethod
+    def _raise(error):
+        raise error
+
+    def _create(self, account_number, order):
+        response = self.order_api.create_order(account_number, order)
+        if "error" in response:
+            raise Exception(f"Error creating order: {response['error']}")
+        return response
+
+    def _confirm_cancels(self, orders, timeout: float, poll_interval: float) -> Dict:
+        """
+        Polls get_order until every order reached a final status. Returns key -> exception for the orders that did
+        not, or that could not be fetched, within the timeout.
+        """
+        pending = {("cancel", order["account-number"], order["id"]): order for order in orders}
+        errors = {}
+        deadline = time.monotonic() + timeout
+        while pending:
+            results, errors = fan_out({
+                key: lambda order=order: self.order_api.get_order(order["account-number"], order["id"])
+                for key, order in pending.items()
+            }, self.max_workers)
+            for key, response in results.items():
+                if response["data"].get("status") in TERMINAL_STATUSES:
+                    del pending[key]
+            if not pending or time.monotonic() >= deadline:
+                break
+            time.sleep(min(poll_interval, max(deadline - time.monotonic(), 0)))
+        for key, order in pending.items():
+            errors.setdefault(key, Exception(f"Order {order['id']} was not confirmed cancelled in {timeout}s"))
+        return errors
+
+    def cancel_all(self, account_numbers: List[str], underlying_symbol: str = None,
+                   predicate: Callable[[dict], bool] = None, order_store=None) -> BulkResult:
+        """
+        Cancels every working order that matches the filters, all at once. See working_orders for the arguments.
+
+        Returns:
+            BulkResult: The per-order results.
+        """
+        orders = self.working_orders(account_numbers, underlying_symbol, predicate, order_store)
+        return self._send(self._cancel_calls(orders))
+
+    def flatten(self, account_numbers: List[str], underlying_symbol: str = None,
+                predicate: Callable[[dict], bool] = None, order_type: str = "Market", cancel_first: bool = True,
+                order_store=None, position_book=None, prices: Dict[str, float] = None, cancel_timeout: float = 5.0,
+                poll_interval: float = 0.2) -> BulkResult:
+        """
+        Cancels the matching working orders and closes the matching positions with one order per position.
+
+        By default the cancels are sent first, all at once, and every cancelled order is polled until it reaches a
+        final status. If a cancel fails or is not confirmed within `cancel_timeout`, no closing order is sent, so
+        a working order cannot fill together with a closing order; the failure is reported in the result. The
+        positions are loaded once the cancels are confirmed, so orders that filled while being cancelled are
+        closed too. The closing orders are then sent all at once. With cancel_first=False every request is sent in
+        a single round without waiting.
+
+        Args:
+            account_numbers (list of str): The accounts.
+            underlying_symbol (str, optional): The underlying symbol to filter by. Defaults to None.
+            predicate (callable, optional): Function returning True for orders and positions to include. Defaults
+                to None.
+            order_type (str): The order type of the closing orders. Defaults to "Market".
+            cancel_first (bool): Whether to wait for the cancels before closing. Defaults to True.
+            order_store (LiveOrderStore, optional): See working_orders.
+            position_book (TastytradePositionBook, optional): See open_positions.
+            prices (dict, optional): Dictionary of symbol -> limit price, required for every position when
+                order_type is "Limit". Defaults to None.
+            cancel_timeout (float): Seconds to wait for the cancels to be confirmed. Defaults to 5.0.
+            poll_interval (float): Seconds between get_order calls while waiting. Defaults to 0.2.
+
+        Returns:
+            BulkResult: The per-order results of the cancels and closing orders.
+
+        Raises:
+            Exception: If the orders or positions could not be loaded, or order_type is "Limit" without prices.
+                Nothing is sent in that case. A position missing from `prices` is reported as an error of its
+                closing order.
+        """
+        if order_type == "Limit" and prices is None:
+            raise Exception("Prices are required to flatten with Limit orders")
+        if not cancel_first:
+            loads, errors = fan_out({
+                "orders": lambda: self.working_orders(account_numbers, underlying_symbol, predicate, order_store),
+                "positions": lambda: self.open_positions(account_numbers, underlying_symbol, predicate,
+                                                         position_book)
+            }, self.max_workers)
+            if errors:
+                raise Exception(f"Error loading orders and positions: {errors}")
+            close_calls = self._close_calls(loads["positions"], order_type, prices)
+            return self._send({**self._cancel_calls(loads["orders"]), **close_calls})
+
+        orders = self.working_orders(account_numbers, underlying_symbol, predicate, order_store)
+        cancelled = self._send(self._cancel_calls(orders))
+        started = time.monotonic()
+        errors = dict(cancelled.errors)
+        if not errors:
+            errors = self._confirm_cancels(orders, cancel_timeout, poll_interval)
+        if errors:
+            errors[("flatten", None, None)] = Exception("Cancels failed or were not confirmed; no closing orders sent")
+            logger.error("Flatten stopped before closing: %s", errors)
+            return BulkResult(cancelled.results, errors, cancelled.elapsed + time.monotonic() - started)
+
+        # Loaded after the cancels, so fills of the cancelled orders are included
+        positions = self.open_positions(account_numbers, underlying_symbol, predicate, position_book)
+        closed = self._send(self._close_calls(positions, order_type, prices))
+        return BulkResult({**cancelled.results, **closed.results}, closed.errors,
+                          time.monotonic() - started + cancelled.elapsed)
@@ -0,0 +1,250 @@
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from tastytrade_api.account.order_builder import BUY_TO_OPEN, SELL_TO_OPEN, build_leg, build_order
+
+
+class ChainArrays:
+    """
+    One expiration of an option chain as aligned NumPy arrays, one row per strike, with quotes and deltas.
+
+    Quotes and deltas start as NaN and are filled with load_quotes, load_deltas or by assigning the arrays.
+
+    Args:
+        strikes (array-like): The strike prices.
+        call_symbols (array-like): The Tastytrade call symbols.
+        put_symbols (array-like): The Tastytrade put symbols.
+        call_streamer_symbols (array-like, optional): The dxfeed call symbols. Defaults to None.
+        put_streamer_symbols (array-like, optional): The dxfeed put symbols. Defaults to None.
+    """
+
+    def __init__(self, strikes, call_symbols, put_symbols, call_streamer_symbols=None, put_streamer_symbols=None):
+        order = np.argsort(np.asarray(strikes, dtype=float), kind="stable")
+        self.strikes = np.asarray(strikes, dtype=float)[order]
+        self.call_symbols = np.asarray(call_symbols, dtype=object)[order]
+        self.put_symbols = np.asarray(put_symbols, dtype=object)[order]
+        self.call_streamer_symbols = (np.asarray(call_streamer_symbols, dtype=object)[order]
+                                      if call_streamer_symbols is not None else self.call_symbols)
+        self.put_streamer_symbols = (np.asarray(put_streamer_symbols, dtype=object)[order]
+                                     if put_streamer_symbols is not None else self.put_symbols)
+        size = len(self.strikes)
+        self.call_bid, self.call_ask, self.put_bid, self.put_ask = (np.full(size, np.nan) for _ in range(4))
+        self.call_delta, self.put_delta = np.full(size, np.nan), np.full(size, np.nan)
+
+    @classmethod
+    def from_nested_chain(cls, chain: dict, expiration_date: str):
+        """
+        Creates the arrays of one expiration from an item returned by TastytradeInstruments.get_option_chains.
+
+        Args:
+            chain (dict): A nested option chain item.
+            expiration_date (str): The expiration date in yyyy-mm-dd format.
+
+        Returns:
+            ChainArrays: The arrays of the expiration.
+
+        Raises:
+            Exception: If the chain has no such expiration.
+        """
+        for expiration in chain.get("expirations", []):
+            if expiration["expiration-date"] == expiration_date:
+                strikes = expiration["strikes"]
+                return cls(
+                    [strike["strike-price"] for strike in strikes],
+                    [strike["call"] for strike in strikes],
+                    [strike["put"] for strike in strikes],
+                    [strike.get("call-streamer-symbol") or strike["call"] for strike in strikes],
+                    [strike.get("put-streamer-symbol") or strike["put"] for strike in strikes],
+                )
+        raise Exception(f"No expiration {expiration_date} in the {chain.get('root-symbol')} chain")
+
+    def __len__(self):
+        return len(self.strikes)
+
+    def load_quotes(self, quote_book, max_age: float = None):
+        """
+        Fills the bid and ask arrays from a QuoteBook. Symbols without a usable quote are set to NaN.
+        """
+        for symbols, bid, ask in ((self.call_streamer_symbols, self.call_bid, self.call_ask),
+                                  (self.put_streamer_symbols, self.put_bid, self.put_ask)):
+            for i, symbol in enumerate(symbols):
+                quote = quote_book.get(symbol, max_age)
+                bid[i], ask[i] = quote if quote is not None else (np.nan, np.nan)
+
+    def load_deltas(self, deltas: Dict[str, float]):
+        """
+        Fills the delta arrays from a dictionary of streamer symbol -> delta, e.g. collected from Greeks events.
+        """
+        self.call_delta[:] = [deltas.get(symbol, np.nan) for symbol in self.call_streamer_symbols]
+        self.put_delta[:] = [deltas.get(symbol, np.nan) for symbol in self.put_streamer_symbols]
+
+
+class CandidateStructures:
+    """
+    A batch of candidate structures of the same shape, held as arrays with one row per candidate.
+
+    Prices are per unit and positive for a credit, like net fill amounts.
+
+    Attributes:
+        name (str): The structure name.
+        sides (tuple): "short" or "long" for each leg column.
+        symbols (np.ndarray): Leg symbols, shape (candidates, legs).
+        strikes (np.ndarray): Leg strikes, shape (candidates, legs).
+        natural (np.ndarray): The natural price: shorts at the bid, longs at the ask.
+        mid (np.ndarray): The mid price.
+        width (np.ndarray): The wing width; the widest wing for structures with two.
+        short_delta (np.ndarray): The absolute delta of the short legs, shape (candidates, short legs).
+    """
+
+    def __init__(self, name, sides, symbols, strikes, natural, mid, width, short_delta):
+        self.name = name
+        self.sides = tuple(sides)
+        self.symbols = symbols
+        self.strikes = strikes
+        self.natural = natural
+        self.mid = mid
+        self.width = width
+        self.short_delta = short_delta
+
+    def __len__(self):
+        return len(self.natural)
+
+    def select(self, mask) -> "CandidateStructures":
+        """
+        Returns the candidates selected by a boolean mask or an index array, e.g. from np.argsort.
+        """
+        return CandidateStructures(self.name, self.sides, self.symbols[mask], self.strikes[mask], self.natural[mask],
+                                   self.mid[mask], self.width[mask], self.short_delta[mask])
+
+    @property
+    def credit_to_width(self) -> np.ndarray:
+        """np.ndarray: The mid credit divided by the width, a common ranking for credit structures."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.mid / self.width
+
+    def to_order(self, index: int, price: float = None, quantity=1, order_type: str = "Limit",
+                 time_in_force: str = "Day") -> dict:
+        """
+        Builds the order of one candidate: a credit order when the price is positive and a debit order when it is
+        negative, e.g. a structure whose long legs cost more than its short legs bring in.
+
+        Args:
+            index (int): The candidate row.
+            price (float, optional): The signed limit price, positive for a credit. Defaults to the mid price
+                rounded to 2 decimals.
+            quantity (int): The quantity of every leg. Defaults to 1.
+            order_type (str): Defaults to "Limit".
+            time_in_force (str): Defaults to "Day".
+
+        Returns:
+            dict: The order, in the format accepted by create_order.
+
+        Raises:
+            Exception: If a Limit order has no finite price, e.g. the candidate has no quotes.
+        """
+        if price is None:
+            price = round(float(self.mid[index]), 2)
+        if order_type == "Limit" and not np.isfinite(price):
+            raise Exception(f"Candidate {index} has no price for a Limit order")
+        legs = [
+            build_leg(SELL_TO_OPEN if side == "short" else BUY_TO_OPEN, str(symbol), quantity)
+            for side, symbol in zip(self.sides, self.symbols[index])
+        ]
+        return build_order(abs(price), legs, time_in_force, order_type, "Credit" if price >= 0 else "Debit")
+
+
+def _in_range(values, bounds):
+    low, high = bounds if bounds is not None else (None, None)
+    mask = np.ones(values.shape, dtype=bool)
+    if low is not None:
+        mask &= values >= low
+    if high is not None:
+        mask &= values <= high
+    return mask
+
+
+def vertical_candidates(chain: ChainArrays, option_type: str, widths: Sequence[float] = None,
+                        width_range: tuple = None, short_strike_range: tuple = None,
+                        short_delta_range: tuple = None, min_credit: float = None) -> CandidateStructures:
+    """
+    Returns every credit vertical of one option type in a chain that meets the constraints, from one broadcast over
+    all (short strike, long strike) pairs.
+
+    Args:
+        chain (ChainArrays): The chain.
+        option_type (str): "C" for call verticals, "P" for put verticals.
+        widths (list of float, optional): The allowed widths. Defaults to None (any width).
+        width_range (tuple, optional): (minimum, maximum) width, either may be None. Defaults to None.
+        short_strike_range (tuple, optional): (minimum, maximum) short strike. Defaults to None.
+        short_delta_range (tuple, optional): (minimum, maximum) absolute short delta. Candidates without a delta
+            are excluded when set. Defaults to None.
+        min_credit (float, optional): The minimum mid credit. Defaults to None.
+
+    Returns:
+        CandidateStructures: The candidates, with legs (short, long).
+    """
+    if option_type == "C":
+        symbols, bid, ask, delta, direction = chain.call_symbols, chain.call_bid, chain.call_ask, chain.call_delta, 1
+    else:
+        symbols, bid, ask, delta, direction = chain.put_symbols, chain.put_bid, chain.put_ask, chain.put_delta, -1
+
+    strikes = chain.strikes
+    width = (strikes[np.newaxis, :] - strikes[:, np.newaxis]) * direction
+    mask = width > 0
+    if widths is not None:
+        mask &= np.isin(np.round(width, 6), np.round(np.asarray(widths, dtype=float), 6))
+    mask &= _in_range(width, width_range)
+    mask &= _in_range(strikes, short_strike_range)[:, np.newaxis]
+    if short_delta_range is not None:
+        mask &= _in_range(np.abs(delta), short_delta_range)[:, np.newaxis]
+    short, long = np.nonzero(mask)
+
+    mid_price = (bid + ask) / 2
+    natural = bid[short] - ask[long]
+    mid = mid_price[short] - mid_price[long]
+    if min_credit is not None:
+        keep = mid >= min_credit
+        short, long, natural, mid = short[keep], long[keep], natural[keep], mid[keep]
+
+    name = "Call Vertical" if option_type == "C" else "Put Vertical"
+    return CandidateStructures(
+        name, ("short", "long"),
+        np.stack([symbols[short], symbols[long]], axis=1) if len(short) else np.empty((0, 2), dtype=object),
+        np.stack([strikes[short], strikes[long]], axis=1) if len(short) else np.empty((0, 2)),
+        natural, mid, np.abs(strikes[long] - strikes[short]), np.abs(delta[short])[:, np.newaxis]
+    )
+
+
+def iron_condor_candidates(calls: CandidateStructures, puts: CandidateStructures,
+                           max_width_difference: Optional[float] = 0, min_credit: float = None) -> CandidateStructures:
+    """
+    Combines call and put verticals into iron condors in one broadcast, keeping pairs whose put short strike is
+    below the call short strike. Filter the verticals first, since every pair is evaluated.
+
+    Args:
+        calls (CandidateStructures): Call verticals from vertical_candidates.
+        puts (CandidateStructures): Put verticals from vertical_candidates.
+        max_width_difference (float, optional): The largest allowed difference between the wing widths. Defaults
+            to 0 (equal wings); None allows any.
+        min_credit (float, optional): The minimum mid credit. Defaults to None.
+
+    Returns:
+        CandidateStructures: The candidates, with legs in the build_Cr_IF order (SC, LC, SP, LP).
+    """
+    mask = puts.strikes[np.newaxis, :, 0] < calls.strikes[:, np.newaxis, 0]
+    if max_width_difference is not None:
+        mask &= np.abs(calls.width[:, np.newaxis] - puts.width[np.newaxis, :]) <= max_width_difference + 1e-9
+    if min_credit is not None:
+        mask &= (calls.mid[:, np.newaxis] + puts.mid[np.newaxis, :]) >= min_credit
+    call_index, put_index = np.nonzero(mask)
+
+    return CandidateStructures(
+        "Iron Condor", ("short", "long", "short", "long"),
+        np.concatenate([calls.symbols[call_index], puts.symbols[put_index]], axis=1),
+        np.concatenate([calls.strikes[call_index], puts.strikes[put_index]], axis=1),
+        calls.natural[call_index] + puts.natural[put_index],
+        calls.mid[call_index] + puts.mid[put_index],
+        np.maximum(calls.width[call_index], puts.width[put_index]),
+        np.concatenate([calls.short_delta[call_index], puts.short_delta[put_index]], axis=1)
+    )
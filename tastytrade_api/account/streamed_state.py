@@ -0,0 +1,256 @@
+import datetime
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+
+from tastytrade_api.concurrency import DEFAULT_MAX_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+def updated_at(data: Optional[dict]) -> Optional[float]:
+    """
+    Returns the "updated-at" timestamp of an API object in seconds since the epoch, or None if it has none.
+    """
+    value = (data or {}).get("updated-at")
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.timestamp()
+
+
+class StreamedAccountState(ABC):
+    """
+    Base class for local account state that is loaded from a REST snapshot and then kept current by applying
+    account streamer messages in place.
+
+    The state is marked stale when the streamer connection drops. Resyncs triggered by the streamer run on a
+    background thread, never on the websocket thread, and every message that arrives while the state is stale or
+    a snapshot is in flight is buffered and replayed on top of the snapshot, so no message is dropped. Messages
+    whose "updated-at" is older than the stored object, e.g. buffered messages already covered by the snapshot,
+    are skipped. The account streamer carries no sequence numbers, so messages lost by the server cannot be
+    detected; `reconcile_interval` resyncs periodically as a safety net.
+
+    Subclasses set MESSAGE_TYPES and implement _fetch, _reset, _load, _apply and _current.
+
+    Args:
+        account_numbers (list of str): The accounts to track.
+        max_workers (int): The maximum number of snapshot requests in flight at once. Defaults to 16.
+        reconcile_interval (float, optional): Seconds between background resyncs once attached. Defaults to None
+            (only resync after a reconnect).
+    """
+
+    # Account streamer message type -> kind passed to _apply
+    MESSAGE_TYPES: Dict[str, str] = {}
+    NAME = "state"
+
+    def __init__(self, account_numbers: List[str], max_workers=DEFAULT_MAX_WORKERS, reconcile_interval: float = None):
+        self.account_numbers = list(account_numbers)
+        self.max_workers = max_workers
+        self.reconcile_interval = reconcile_interval
+        self.stale = True
+        self.listeners: List[Callable[[str, object, dict], None]] = []
+        self._lock = threading.RLock()
+        self._buffer = []
+        self._buffering = False
+        self._resyncing = False
+        self._synced = threading.Event()
+        self._stop_event = threading.Event()
+        self._streamer = None
+        self._stream_listeners = []
+
+    def add_listener(self, callback: Callable[[str, object, dict], None]):
+        """
+        Registers a callback for state changes.
+
+        Args:
+            callback (callable): Function called with (kind, key, data) for every applied change and with
+                ("resync", None, None) after every resync.
+        """
+        self.listeners.append(callback)
+
+    def _notify(self, kind, key, data):
+        for callback in list(self.listeners):
+            try:
+                callback(kind, key, data)
+            except Exception:
+                logger.exception("%s listener failed", self.NAME)
+
+    @abstractmethod
+    def _fetch(self):
+        """Returns the REST snapshot of every tracked account. Raises if any request failed."""
+
+    @abstractmethod
+    def _reset(self):
+        """Clears the local state. Called with the lock held."""
+
+    @abstractmethod
+    def _load(self, snapshot):
+        """Stores a snapshot returned by _fetch. Called with the lock held."""
+
+    @abstractmethod
+    def _apply(self, kind: str, data: dict):
+        """
+        Applies the data of one message. Called with the lock held.
+
+        Returns:
+            tuple: The (kind, key, data) to notify listeners with, or None if the message was ignored.
+        """
+
+    @abstractmethod
+    def _current(self, kind: str, data: dict) -> Optional[dict]:
+        """Returns the stored object a message would replace, or None. Called with the lock held."""
+
+    def _outdated(self, kind: str, data: dict) -> bool:
+        message_time = updated_at(data)
+        current_time = updated_at(self._current(kind, data))
+        return message_time is not None and current_time is not None and message_time < current_time
+
+    def _apply_latest(self, kind: str, data: dict):
+        if self._outdated(kind, data):
+            return None
+        return self._apply(kind, data)
+
+    def resync(self):
+        """
+        Reloads the state of every tracked account from REST, replacing the local state, and replays the messages
+        received while the snapshot was in flight.
+
+        Raises:
+            Exception: If any of the snapshot requests failed. The state stays stale in that case.
+        """
+        with self._lock:
+            # Messages received before the snapshot is requested are covered by it
+            self._buffer = []
+            self._buffering = True
+        try:
+            snapshot = self._fetch()
+        except Exception:
+            with self._lock:
+                self._buffering = False
+                self.stale = True
+                self._synced.clear()
+            raise
+
+        with self._lock:
+            self._reset()
+            self._load(snapshot)
+            # Buffered messages older than the snapshot would overwrite newer data
+            changes = [self._apply_latest(kind, data) for kind, data in self._buffer]
+            self._buffer = []
+            self._buffering = False
+            self.stale = False
+            self._synced.set()
+        logger.info("%s resynced for %d accounts", self.NAME, len(self.account_numbers))
+        self._notify("resync", None, None)
+        for change in changes:
+            if change is not None:
+                self._notify(*change)
+
+    def request_resync(self, mark_stale: bool = True):
+        """
+        Starts a resync on a background thread unless one is already running.
+
+        Args:
+            mark_stale (bool): Whether to mark the state stale until the resync completes. Defaults to True.
+        """
+        with self._lock:
+            if mark_stale:
+                self.stale = True
+                self._synced.clear()
+            if self._resyncing:
+                return
+            self._resyncing = True
+        thread = threading.Thread(target=self._resync_in_background)
+        thread.daemon = True
+        thread.start()
+
+    def _resync_in_background(self):
+        try:
+            self.resync()
+        except Exception:
+            logger.exception("%s resync failed", self.NAME)
+        finally:
+            with self._lock:
+                self._resyncing = False
+
+    def wait_synced(self, timeout: float = None) -> bool:
+        """
+        Waits until the state is not stale.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to None (no limit).
+
+        Returns:
+            bool: True if the state is synced.
+        """
+        return self._synced.wait(timeout)
+
+    def attach(self, streamer):
+        """
+        Feeds the state from a TastytradeStreamer. The streamer must already be connected to the tracked accounts
+        with 'connect_account'.
+
+        Args:
+            streamer (TastytradeStreamer): The account streamer.
+        """
+        self.detach()
+        self._streamer = streamer
+        self._stream_listeners = [
+            (message_type, lambda message, k=kind: self._receive(k, message))
+            for message_type, kind in self.MESSAGE_TYPES.items()
+        ]
+        for message_type, callback in self._stream_listeners:
+            streamer.add_listener(message_type, callback)
+        streamer.add_connection_listener(self.on_connection_state)
+        if self.reconcile_interval:
+            self._stop_event.clear()
+            thread = threading.Thread(target=self._reconcile)
+            thread.daemon = True
+            thread.start()
+
+    def detach(self):
+        """Removes the streamer listeners registered by attach and stops the periodic reconciliation."""
+        self._stop_event.set()
+        streamer, self._streamer = self._streamer, None
+        if streamer is None:
+            return
+        for message_type, callback in self._stream_listeners:
+            streamer.remove_listener(message_type, callback)
+        streamer.remove_connection_listener(self.on_connection_state)
+        self._stream_listeners = []
+
+    def _reconcile(self):
+        while not self._stop_event.wait(self.reconcile_interval):
+            self.request_resync(mark_stale=False)
+
+    def on_connection_state(self, state: str):
+        """Marks the state stale when the connection is lost and resyncs it when the connection is reopened."""
+        if state in ("close", "error"):
+            with self._lock:
+                self.stale = True
+                self._synced.clear()
+        elif state == "open" and self.stale:
+            self.request_resync()
+
+    def _receive(self, kind: str, message: dict):
+        data = message.get("data") or {}
+        with self._lock:
+            if self.stale or self._buffering:
+                self._buffer.append((kind, data))
+                # Stale with no snapshot in flight, e.g. before the first resync
+                resync = self.stale and not self._buffering and not self._resyncing
+                change = None
+            else:
+                resync = False
+                change = self._apply_latest(kind, data)
+        if resync:
+            self.request_resync()
+        if change is not None:
+            self._notify(*change)
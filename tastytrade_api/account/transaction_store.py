@@ -0,0 +1,197 @@
+import datetime
+import json
+import sqlite3
+import threading
+from typing import Dict, List
+
+from tastytrade_api.account.transactions import TastytradeTransactions, date_ranges, signed_amount
+from tastytrade_api.concurrency import DEFAULT_MAX_WORKERS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    account_number TEXT,
+    date TEXT,
+    executed_at TEXT,
+    transaction_type TEXT,
+    transaction_sub_type TEXT,
+    symbol TEXT,
+    underlying_symbol TEXT,
+    action TEXT,
+    quantity REAL,
+    price REAL,
+    value REAL,
+    net_value REAL,
+    fees REAL,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS synced_days (
+    account_number TEXT,
+    date TEXT,
+    PRIMARY KEY (account_number, date)
+);
+CREATE INDEX IF NOT EXISTS transactions_account_date ON transactions (account_number, date);
+CREATE INDEX IF NOT EXISTS transactions_type ON transactions (transaction_type, date);
+CREATE INDEX IF NOT EXISTS transactions_underlying ON transactions (underlying_symbol, date);
+"""
+
+FEE_FIELDS = ("commission", "clearing-fees", "regulatory-fees", "proprietary-index-option-fees")
+
+
+def _amount(value, effect=None):
+    # Missing amounts are stored as NULL, SQLite cannot store NaN
+    amount = signed_amount(value, effect)
+    return None if amount != amount else amount
+
+
+def transaction_row(transaction: dict) -> tuple:
+    """
+    Returns the row of a transaction in the transactions table. Amounts are signed: debits are negative.
+    """
+    fees = sum(
+        _amount(transaction.get(field), transaction.get(f"{field}-effect"))
+        for field in FEE_FIELDS if transaction.get(field) not in (None, "")
+    )
+    return (
+        int(transaction["id"]), transaction.get("account-number"), transaction.get("transaction-date"),
+        transaction.get("executed-at"), transaction.get("transaction-type"), transaction.get("transaction-sub-type"),
+        transaction.get("symbol"), transaction.get("underlying-symbol"), transaction.get("action"),
+        _amount(transaction.get("quantity")), _amount(transaction.get("price")),
+        _amount(transaction.get("value"), transaction.get("value-effect")),
+        _amount(transaction.get("net-value"), transaction.get("net-value-effect")),
+        fees, json.dumps(transaction)
+    )
+
+
+class TransactionStore:
+    """
+    A local SQLite store of an account's transactions for reconciling fees, assignments and cash flows.
+
+    The store records which days it has downloaded completely. Syncing a date range only fetches the days that are
+    missing, grouped into contiguous ranges that are fetched concurrently, so a daily reconciliation only moves the
+    new rows. Today is never marked complete and is fetched again on every sync.
+
+    Args:
+        session_token (str): The session token used to authenticate API requests.
+        api_url (str): The base URL of the API.
+        account_number (str): The account to store.
+        path (str): The SQLite database file. Defaults to ":memory:".
+        max_workers (int): The maximum number of requests in flight at once. Defaults to 16.
+        days_per_request (int): The longest date range fetched by one request chain. Defaults to 31.
+    """
+
+    def __init__(self, session_token, api_url, account_number: str, path: str = ":memory:",
+                 max_workers=DEFAULT_MAX_WORKERS, days_per_request: int = 31):
+        self.transactions_api = TastytradeTransactions(session_token, api_url, max_workers)
+        self.account_number = account_number
+        self.days_per_request = days_per_request
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        """Closes the database."""
+        self.connection.close()
+
+    def missing_ranges(self, start_date: datetime.date, end_date: datetime.date) -> List[tuple]:
+        """
+        Returns the contiguous (start date, end date) ranges between two dates that were not downloaded yet.
+        """
+        with self._lock:
+            synced = {row[0] for row in self.connection.execute(
+                "SELECT date FROM synced_days WHERE account_number = ? AND date BETWEEN ? AND ?",
+                (self.account_number, str(start_date), str(end_date))
+            )}
+        ranges = []
+        day = start_date
+        while day <= end_date:
+            if str(day) not in synced:
+                if ranges and ranges[-1][1] == day - datetime.timedelta(days=1):
+                    ranges[-1] = (ranges[-1][0], day)
+                else:
+                    ranges.append((day, day))
+            day += datetime.timedelta(days=1)
+        return ranges
+
+    def sync(self, start_date: datetime.date, end_date: datetime.date = None) -> int:
+        """
+        Downloads the transactions of the days in the range that were not downloaded yet.
+
+        Args:
+            start_date (datetime.date): The first date.
+            end_date (datetime.date, optional): The last date. Defaults to today.
+
+        Returns:
+            int: The number of transactions downloaded.
+
+        Raises:
+            Exception: If any of the requests failed. Nothing is stored in that case.
+        """
+        today = datetime.date.today()
+        end_date = end_date or today
+        missing = self.missing_ranges(start_date, end_date)
+        windows = [window for first, last in missing for window in date_ranges(first, last, self.days_per_request)]
+        transactions = self.transactions_api.get_transactions_in_ranges(self.account_number, windows)
+
+        completed = [
+            (self.account_number, str(first + datetime.timedelta(days=i)))
+            for first, last in missing for i in range((last - first).days + 1)
+            if first + datetime.timedelta(days=i) < today
+        ]
+        with self._lock, self.connection:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO transactions VALUES ({', '.join('?' * 15)})",
+                [transaction_row(transaction) for transaction in transactions]
+            )
+            self.connection.executemany("INSERT OR IGNORE INTO synced_days VALUES (?, ?)", completed)
+        return len(transactions)
+
+    def get_transactions(self, start_date: str = None, end_date: str = None, transaction_type: str = None,
+                         underlying_symbol: str = None, symbol: str = None) -> List[dict]:
+        """
+        Returns stored transactions matching the filters, oldest first.
+
+        Args:
+            start_date (str, optional): The first date, in yyyy-mm-dd format. Defaults to None.
+            end_date (str, optional): The last date, in yyyy-mm-dd format. Defaults to None.
+            transaction_type (str, optional): The transaction type to filter by, e.g. "Trade". Defaults to None.
+            underlying_symbol (str, optional): The underlying symbol to filter by. Defaults to None.
+            symbol (str, optional): The symbol to filter by. Defaults to None.
+
+        Returns:
+            list: List of transaction objects, as returned by the API.
+        """
+        clauses = ["account_number = ?"]
+        params = [self.account_number]
+        for clause, value in (("date >= ?", start_date), ("date <= ?", end_date),
+                              ("transaction_type = ?", transaction_type),
+                              ("underlying_symbol = ?", underlying_symbol), ("symbol = ?", symbol)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(str(value))
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT data FROM transactions WHERE {' AND '.join(clauses)} ORDER BY executed_at, id", params
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def totals(self, start_date: str = None, end_date: str = None) -> Dict[str, dict]:
+        """
+        Returns the signed net value and fees of the stored transactions per transaction type, for reconciliation.
+
+        Returns:
+            dict: Dictionary of transaction type -> {"count", "net-value", "fees"}.
+        """
+        clauses = ["account_number = ?"]
+        params = [self.account_number]
+        for clause, value in (("date >= ?", start_date), ("date <= ?", end_date)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(str(value))
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT transaction_type, COUNT(*), TOTAL(net_value), TOTAL(fees) FROM transactions "
+                f"WHERE {' AND '.join(clauses)} GROUP BY transaction_type", params
+            ).fetchall()
+        return {row[0]: {"count": row[1], "net-value": round(row[2], 2), "fees": round(row[3], 2)} for row in rows}
@@ -0,0 +1,231 @@
+import datetime
+import json
+from typing import List
+
+import requests
+
+from tastytrade_api.concurrency import DEFAULT_MAX_WORKERS, fan_out
+
+
+def signed_amount(value, effect: str) -> float:
+    """
+    Returns an amount and its effect, as the API reports them in transactions, balances and dry runs, as a signed
+    float: debits are negative, credits positive.
+
+    Args:
+        value: The amount, usually a decimal string.
+        effect (str): "Debit", "Credit" or "None".
+
+    Returns:
+        float: The signed amount, or NaN if the value is missing.
+    """
+    if value is None or value == "":
+        return float("nan")
+    amount = float(value)
+    return -amount if effect == "Debit" else amount
+
+
+def date_ranges(start_date: datetime.date, end_date: datetime.date, days: int) -> List[tuple]:
+    """
+    Splits an inclusive date range into consecutive inclusive ranges of at most `days` days.
+
+    Args:
+        start_date (datetime.date): The first date.
+        end_date (datetime.date): The last date.
+        days (int): The maximum length of each range.
+
+    Returns:
+        list: List of (start date, end date) tuples.
+    """
+    ranges = []
+    while start_date <= end_date:
+        last = min(start_date + datetime.timedelta(days=days - 1), end_date)
+        ranges.append((start_date, last))
+        start_date = last + datetime.timedelta(days=1)
+    return ranges
+
+
+class TastytradeTransactions:
+    """
+    Initializes a new instance of the API client with the given session token and API URL.
+
+    Args:
+        session_token (str): The session token used to authenticate API requests.
+        api_url (str): The base URL of the API.
+        max_workers (int): The maximum number of page requests in flight at once. Defaults to 16.
+
+    Returns:
+        None
+    """
+
+    def __init__(self, session_token, api_url, max_workers=DEFAULT_MAX_WORKERS):
+        self.session_token = session_token
+        self.api_url = api_url
+        self.max_workers = max_workers
+
+    def get_transactions(self, account_number, per_page=250, page_offset=0, sort="Desc", type=None, types=None,
+                         sub_types=None, start_date=None, end_date=None, instrument_type=None, symbol=None,
+                         underlying_symbol=None, action=None, start_at=None, end_at=None):
+        """
+        Makes a GET request to the /accounts/{account_number}/transactions API endpoint to retrieve a paginated list
+        of the account's transactions, and returns the response as a JSON object.
+
+        Args:
+            account_number (str): The account number to retrieve transactions for.
+            per_page (int): The number of transactions per page. Defaults to 250.
+            page_offset (int): The page to retrieve, starting at 0. Defaults to 0.
+            sort (str): The order to sort results in. Accepts 'Desc' or 'Asc'. Defaults to 'Desc'.
+            type (str, optional): The transaction type to filter by. Defaults to None.
+            types (list of str, optional): Several transaction types to filter by. Defaults to None.
+            sub_types (list of str, optional): The transaction sub types to filter by. Defaults to None.
+            start_date (str, optional): The start date in yyyy-mm-dd format. Defaults to None.
+            end_date (str, optional): The end date in yyyy-mm-dd format. Defaults to None.
+            instrument_type (str, optional): The instrument type to filter by. Defaults to None.
+            symbol (str, optional): The symbol to filter by. Defaults to None.
+            underlying_symbol (str, optional): The underlying symbol to filter by. Defaults to None.
+            action (str, optional): The action to filter by. Defaults to None.
+            start_at (str, optional): The start date and time in full date-time. Defaults to None.
+            end_at (str, optional): The end date and time in full date-time. Defaults to None.
+
+        Returns:
+            dict: Dictionary containing the response data and pagination, as returned by the API.
+
+        Raises:
+            Exception: If there was an error in the GET request or if the status code is not 200 OK.
+        """
+        headers = {"Authorization": f"{self.session_token}"}
+        params = {
+            "per-page": per_page,
+            "page-offset": page_offset,
+            "sort": sort,
+            "type": type,
+            "types[]": types,
+            "sub-type[]": sub_types,
+            "start-date": start_date,
+            "end-date": end_date,
+            "instrument-type": instrument_type,
+            "symbol": symbol,
+            "underlying-symbol": underlying_symbol,
+            "action": action,
+            "start-at": start_at,
+            "end-at": end_at,
+        }
+        response = requests.get(
+            f"{self.api_url}/accounts/{account_number}/transactions", headers=headers, params=params
+        )
+        if response.status_code == 200:
+            return json.loads(response.content)
+        else:
+            raise Exception(f"Error getting transactions: {response.status_code} - {response.content}")
+
+    def get_transaction(self, account_number, transaction_id):
+        """
+        Makes a GET request to the /accounts/{account_number}/transactions/{transaction_id} API endpoint and returns
+        the transaction.
+
+        Args:
+            account_number (str): The account number of the transaction.
+            transaction_id (int): The ID of the transaction.
+
+        Returns:
+            dict: The transaction object, as returned by the API.
+
+        Raises:
+            Exception: If there was an error in the GET request or if the status code is not 200 OK.
+        """
+        headers = {"Authorization": f"{self.session_token}"}
+        response = requests.get(
+            f"{self.api_url}/accounts/{account_number}/transactions/{transaction_id}", headers=headers
+        )
+        if response.status_code == 200:
+            return json.loads(response.content)["data"]
+        else:
+            raise Exception(f"Error getting transaction: {response.status_code} - {response.content}")
+
+    def get_total_fees(self, account_number, date=None):
+        """
+        Makes a GET request to the /accounts/{account_number}/transactions/total-fees API endpoint and returns the
+        total fees of a day.
+
+        Args:
+            account_number (str): The account number.
+            date (str, optional): The day in yyyy-mm-dd format. Defaults to None (today).
+
+        Returns:
+            dict: Dictionary with the total fees and their effect, as returned by the API.
+
+        Raises:
+            Exception: If there was an error in the GET request or if the status code is not 200 OK.
+        """
+        headers = {"Authorization": f"{self.session_token}"}
+        response = requests.get(
+            f"{self.api_url}/accounts/{account_number}/transactions/total-fees",
+            headers=headers,
+            params={"date": date},
+        )
+        if response.status_code == 200:
+            return json.loads(response.content)["data"]
+        else:
+            raise Exception(f"Error getting total fees: {response.status_code} - {response.content}")
+
+    def _get_range(self, account_number, start_date, end_date, per_page, filters):
+        items = []
+        page_offset = 0
+        while True:
+            response = self.get_transactions(account_number, per_page=per_page, page_offset=page_offset, sort="Asc",
+                                             start_date=str(start_date), end_date=str(end_date), **filters)
+            items.extend(response["data"]["items"])
+            total_pages = (response.get("pagination") or {}).get("total-pages") or 1
+            page_offset += 1
+            if page_offset >= total_pages or not response["data"]["items"]:
+                return items
+
+    def get_all_transactions(self, account_number, start_date: datetime.date, end_date: datetime.date,
+                             days_per_request: int = 31, per_page: int = 250, **filters) -> List[dict]:
+        """
+        Returns every transaction of a date range. The range is split into windows of `days_per_request` days that
+        are fetched concurrently, each following its pages to the end.
+
+        Args:
+            account_number (str): The account number.
+            start_date (datetime.date): The first date.
+            end_date (datetime.date): The last date.
+            days_per_request (int): The length of each concurrently fetched window. Defaults to 31.
+            per_page (int): The number of transactions per page. Defaults to 250.
+            **filters: Further filters passed to get_transactions.
+
+        Returns:
+            list: List of transaction objects, oldest window first.
+
+        Raises:
+            Exception: If any of the requests failed.
+        """
+        ranges = date_ranges(start_date, end_date, days_per_request)
+        return self.get_transactions_in_ranges(account_number, ranges, per_page, **filters)
+
+    def get_transactions_in_ranges(self, account_number, ranges: List[tuple], per_page: int = 250,
+                                   **filters) -> List[dict]:
+        """
+        Returns every transaction of several inclusive (start date, end date) ranges, fetching the ranges
+        concurrently.
+
+        Args:
+            account_number (str): The account number.
+            ranges (list of tuple): The date ranges.
+            per_page (int): The number of transactions per page. Defaults to 250.
+            **filters: Further filters passed to get_transactions.
+
+        Returns:
+            list: List of transaction objects, in the order of the ranges.
+
+        Raises:
+            Exception: If any of the requests failed.
+        """
+        calls = {
+            i: lambda first=first, last=last: self._get_range(account_number, first, last, per_page, filters)
+            for i, (first, last) in enumerate(ranges)
+        }
+        results, errors = fan_out(calls, self.max_workers)
+        if errors:
+            raise Exception(f"Error getting transactions of account {account_number}: {errors}")
+        return [item for i in range(len(ranges)) for item in results[i]]
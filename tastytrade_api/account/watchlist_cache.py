@@ -0,0 +1,255 @@
+import copy
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from tastytrade_api.account.watchlist import TastytradeWatchlist
+from tastytrade_api.concurrency import DEFAULT_MAX_WORKERS, fan_out
+
+WATCHLIST_FIELDS = ("name", "group-name", "order-index")
+
+
+def watchlist_key(watchlist: Optional[dict]) -> Optional[tuple]:
+    """
+    Returns the parts of a watchlist that are sent to the API, in a comparable form. Fields added by the API, such
+    as the watchlist ID, are ignored.
+    """
+    if watchlist is None:
+        return None
+    entries = tuple((entry.get("symbol"), entry.get("instrument-type"))
+                    for entry in watchlist.get("watchlist-entries") or [])
+    return tuple(watchlist.get(field) for field in WATCHLIST_FIELDS) + (entries,)
+
+
+class TastytradeWatchlistCache:
+    """
+    A local copy of the account watchlists that only sends the watchlists changed since the last sync, plus
+    TTL-cached public and pairs watchlists.
+
+    Every local change bumps the watchlist's version. sync compares each changed watchlist with the copy last
+    confirmed by the API and sends the creates, updates and deletes concurrently; watchlists edited back to their
+    synced content are not sent. The API replaces a watchlist as a whole, so a changed watchlist is still sent in
+    full.
+
+    Args:
+        session_token (str): The session token used to authenticate API requests.
+        api_url (str): The base URL of the API.
+        public_ttl (float): Seconds public and pairs watchlists stay cached. Defaults to 300.0.
+        max_workers (int): The maximum number of requests in flight at once. Defaults to 16.
+    """
+
+    def __init__(self, session_token, api_url, public_ttl: float = 300.0, max_workers=DEFAULT_MAX_WORKERS):
+        self.watchlist = TastytradeWatchlist(session_token, api_url)
+        self.public_ttl = public_ttl
+        self.max_workers = max_workers
+        self._local: Dict[str, Optional[dict]] = {}
+        self._synced: Dict[str, Optional[dict]] = {}
+        self._versions: Dict[str, int] = {}
+        self._synced_versions: Dict[str, int] = {}
+        self._in_flight = set()
+        self._public: Dict[tuple, Tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Replaces the local copy with the account watchlists from the API, discarding unsynced changes.
+
+        Raises:
+            Exception: If there was an error in the GET request.
+        """
+        items = self.watchlist.get_account_watchlists()["data"]["items"]
+        with self._lock:
+            self._synced = {watchlist["name"]: watchlist for watchlist in items}
+            self._local = copy.deepcopy(self._synced)
+            self._versions = {name: 0 for name in self._synced}
+            self._synced_versions = dict(self._versions)
+
+    @property
+    def names(self) -> List[str]:
+        """list: The names of the local watchlists."""
+        with self._lock:
+            return [name for name, watchlist in self._local.items() if watchlist is not None]
+
+    def get(self, name: str) -> Optional[dict]:
+        """
+        Returns a copy of a local watchlist, or None if there is no such watchlist.
+        """
+        with self._lock:
+            return copy.deepcopy(self._local.get(name))
+
+    def version(self, name: str) -> int:
+        """
+        Returns the local version of a watchlist, bumped on every change. Returns 0 for unknown watchlists.
+        """
+        with self._lock:
+            return self._versions.get(name, 0)
+
+    def put(self, watchlist_data: dict):
+        """
+        Creates or replaces a local watchlist. Nothing is sent until sync.
+
+        Args:
+            watchlist_data (dict): The watchlist, in the format accepted by create_account_watchlist.
+        """
+        with self._lock:
+            self._set(watchlist_data["name"], copy.deepcopy(watchlist_data))
+
+    def add_entries(self, name: str, entries: List[dict]):
+        """
+        Appends entries to a local watchlist, creating it if needed. Symbols already in the watchlist are skipped.
+
+        Args:
+            name (str): The watchlist name.
+            entries (list of dict): Entries with "symbol" and "instrument-type".
+        """
+        with self._lock:
+            watchlist = copy.deepcopy(self._local.get(name)) or {"name": name, "watchlist-entries": []}
+            current = watchlist.setdefault("watchlist-entries", [])
+            symbols = {entry["symbol"] for entry in current}
+            current.extend(entry for entry in entries if entry["symbol"] not in symbols)
+            self._set(name, watchlist)
+
+    def remove_symbols(self, name: str, symbols: List[str]):
+        """
+        Removes symbols from a local watchlist. Unknown watchlists and symbols are ignored.
+
+        Args:
+            name (str): The watchlist name.
+            symbols (list of str): The symbols to remove.
+        """
+        with self._lock:
+            watchlist = copy.deepcopy(self._local.get(name))
+            if watchlist is None:
+                return
+            symbols = set(symbols)
+            watchlist["watchlist-entries"] = [entry for entry in watchlist.get("watchlist-entries") or []
+                                              if entry["symbol"] not in symbols]
+            self._set(name, watchlist)
+
+    def delete(self, name: str):
+        """
+        Deletes a local watchlist. The deletion is sent on the next sync. A watchlist that was never synced is
+        dropped without a request.
+        """
+        with self._lock:
+            if self._local.get(name) is None:
+                return
+            if name not in self._synced and name not in self._in_flight:
+                self._local.pop(name)
+                self._versions.pop(name, None)
+                self._synced_versions.pop(name, None)
+            else:
+                self._set(name, None)
+
+    def _set(self, name, watchlist):
+        if watchlist_key(watchlist) != watchlist_key(self._local.get(name)):
+            self._local[name] = watchlist
+            self._versions[name] = self._versions.get(name, 0) + 1
+
+    def diff(self) -> Dict[str, str]:
+        """
+        Returns the watchlists that differ from their synced copy.
+
+        Returns:
+            dict: Watchlist name -> "create", "update" or "delete".
+        """
+        with self._lock:
+            return self._diff()
+
+    def _diff(self):
+        changes = {}
+        for name, version in self._versions.items():
+            if version == self._synced_versions.get(name):
+                continue
+            local, synced = self._local.get(name), self._synced.get(name)
+            if watchlist_key(local) == watchlist_key(synced):
+                continue
+            changes[name] = "create" if synced is None else "delete" if local is None else "update"
+        return changes
+
+    def sync(self) -> Tuple[Dict[str, dict], Dict[str, Exception]]:
+        """
+        Sends every changed watchlist concurrently. Watchlists that fail stay changed and are retried on the next
+        sync; watchlists changed again while a request was in flight stay changed as well.
+
+        Returns:
+            tuple: A (results, errors) pair of dictionaries keyed by watchlist name. Results hold the API response
+            of each create or update, and an empty dictionary for deletes.
+        """
+        with self._lock:
+            changes = self._diff()
+            sent = {name: (self._versions[name], copy.deepcopy(self._local.get(name))) for name in changes}
+            self._in_flight.update(changes)
+            # Watchlists edited back to their synced content need no request
+            for name, version in self._versions.items():
+                if name not in changes:
+                    self._synced_versions[name] = version
+
+        calls = {}
+        for name, change in changes.items():
+            watchlist = sent[name][1]
+            if change == "create":
+                calls[name] = lambda w=watchlist: self.watchlist.create_account_watchlist(w)
+            elif change == "update":
+                calls[name] = lambda n=name, w=watchlist: self.watchlist.update_account_watchlist(n, w)
+            else:
+                calls[name] = lambda n=name: self.watchlist.delete_account_watchlist(n)
+        results, errors = fan_out(calls, self.max_workers)
+
+        with self._lock:
+            self._in_flight.difference_update(changes)
+            for name in results:
+                version, watchlist = sent[name]
+                if watchlist is None:
+                    self._synced.pop(name, None)
+                else:
+                    self._synced[name] = watchlist
+                self._synced_versions[name] = version
+                if self._local.get(name) is None and self._versions.get(name) == version:
+                    self._local.pop(name, None)
+                    self._versions.pop(name, None)
+                    self._synced_versions.pop(name, None)
+        return results, errors
+
+    def _cached_public(self, key, fetch, max_age):
+        max_age = self.public_ttl if max_age is None else max_age
+        now = time.monotonic()
+        with self._lock:
+            entry = self._public.get(key)
+        if entry is not None and now - entry[0] < max_age:
+            return entry[1]
+        data = fetch()
+        with self._lock:
+            self._public[key] = (now, data)
+        return data
+
+    def get_public_watchlists(self, counts_only: bool = False, max_age: float = None) -> dict:
+        """
+        Returns the public watchlists, from the cache when fresh. See TastytradeWatchlist.get_public_watchlists.
+
+        Args:
+            counts_only (bool): Whether to only return the counts of the watchlists.
+            max_age (float, optional): Overrides the cache TTL for this call; 0 forces a refresh. Defaults to None.
+        """
+        return self._cached_public(("public", counts_only),
+                                   lambda: self.watchlist.get_public_watchlists(counts_only), max_age)
+
+    def get_public_watchlist(self, watchlist_name: str, max_age: float = None) -> dict:
+        """
+        Returns a public watchlist, from the cache when fresh. See TastytradeWatchlist.get_public_watchlist.
+        """
+        return self._cached_public(("public", watchlist_name),
+                                   lambda: self.watchlist.get_public_watchlist(watchlist_name), max_age)
+
+    def get_pairs_watchlists(self, pairs_watchlist_name: str = None, max_age: float = None) -> dict:
+        """
+        Returns the pairs watchlists, or one of them, from the cache when fresh. See
+        TastytradeWatchlist.get_pairs_watchlists.
+        """
+        return self._cached_public(("pairs", pairs_watchlist_name),
+                                   lambda: self.watchlist.get_pairs_watchlists(pairs_watchlist_name), max_age)
+
+    def clear_public(self):
+        """Drops every cached public and pairs watchlist."""
+        with self._lock:
+            self._public.clear()
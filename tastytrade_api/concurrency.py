@@ -0,0 +1,66 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+DEFAULT_MAX_WORKERS = 16
+
+
+class RateLimiter:
+    """
+    Spaces out calls shared across threads so that at most `rate` of them start per second.
+
+    Args:
+        rate (float): The maximum number of calls per second.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until the next call may start."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def fan_out(calls: Dict[Hashable, Callable[[], Any]], max_workers: int = DEFAULT_MAX_WORKERS,
+            rate_limiter: Optional[RateLimiter] = None) -> Tuple[Dict, Dict]:
+    """
+    Runs independent blocking calls (typically REST requests) concurrently on a thread pool, so the total latency
+    is that of the slowest call rather than the sum of all of them.
+
+    Args:
+        calls (dict): Dictionary of key -> zero-argument callable.
+        max_workers (int): The maximum number of calls in flight at once. Defaults to 16.
+        rate_limiter (RateLimiter, optional): Limits how fast calls start. Defaults to None (no limit).
+
+    Returns:
+        tuple: A (results, errors) pair of dictionaries keyed like `calls`. Every key appears in exactly one of
+        them; errors hold the exception raised by the call.
+    """
+    results = {}
+    errors = {}
+    if not calls:
+        return results, errors
+
+    def limited(call):
+        rate_limiter.acquire()
+        return call()
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as executor:
+        if rate_limiter is None:
+            futures = {key: executor.submit(call) for key, call in calls.items()}
+        else:
+            futures = {key: executor.submit(limited, call) for key, call in calls.items()}
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                errors[key] = e
+    return results, errors
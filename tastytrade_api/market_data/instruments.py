@@ -254,6 +254,35 @@ class TastytradeInstruments:
                 f"Error getting futures: {response.status_code} - {response.content}"
             )
 
+    def get_future_options(self, symbols):
+        """
+        Makes a GET request to the /instruments/future-options API endpoint for the specified future option symbols,
+        and returns a list of future option objects, including their dxfeed "streamer-symbol".
+
+        Args:
+            symbols (Union[str, List[str]]): A single future option symbol or a list of future option symbols.
+
+        Returns:
+            list: List of future option objects, as returned by the API.
+
+        Raises:
+            Exception: If there was an error in the GET request or if the status code is not 200 OK.
+        """
+        headers = {"Authorization": f"{self.session_token}"}
+        params = {"symbol[]": symbols}
+
+        url = f"{self.api_url}/instruments/future-options"
+        query_string = urllib.parse.urlencode(params, doseq=True)
+        response = requests.get(f"{url}?{query_string}", headers=headers)
+
+        if response.status_code == 200:
+            response_data = json.loads(response.content)
+            return response_data["data"]["items"]
+        else:
+            raise Exception(
+                f"Error getting future options: {response.status_code} - {response.content}"
+            )
+
     def get_future_option_products(self):
         """
         Makes a GET request to the /instruments/future-option-products API endpoint and returns metadata for all supported
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsSubscription:
+    """
+    A consumer's interest in a set of symbols, refreshed every `interval` seconds by a MarketMetricsScheduler.
+
+    The first refresh delivers the current metrics of every symbol, including symbols another subscription already
+    fetched; later refreshes deliver only changed metrics. Metrics are delivered to the optional callback as a dict
+    of symbol -> metrics item. The subscription can also be consumed with `async for changes in subscription`, in
+    which case changes are queued on the event loop that started the iteration.
+
+    Args:
+        symbols (iterable of str): The symbols to watch.
+        interval (float): The refresh interval in seconds.
+        callback (callable, optional): Function called with a dict of changed metrics. Defaults to None.
+    """
+
+    def __init__(self, symbols: Iterable[str], interval: float, callback: Callable[[Dict[str, dict]], None] = None):
+        self.symbols = set(symbols)
+        self.interval = interval
+        self.callback = callback
+        self.next_due = 0.0
+        self.primed = False
+        self.closed = False
+        self._loop = None
+        self._queue = None
+
+    def deliver(self, changes: Dict[str, dict]):
+        """
+        Pushes the changed metrics for this subscription's symbols to the callback and the async iterator, if any.
+
+        Args:
+            changes (dict): Dictionary of symbol -> metrics item for every symbol that changed on this tick.
+        """
+        relevant = {symbol: item for symbol, item in changes.items() if symbol in self.symbols}
+        if not relevant:
+            return
+        if self.callback:
+            try:
+                self.callback(relevant)
+            except Exception:
+                logger.exception("Market metrics callback failed")
+        if self._queue is not None:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, relevant)
+
+    def close(self):
+        """Marks the subscription as closed and ends any pending async iteration."""
+        self.closed = True
+        if self._queue is not None:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+
+    def __aiter__(self):
+        if self._queue is None:
+            self._loop = asyncio.get_event_loop()
+            self._queue = asyncio.Queue()
+            if self.closed:
+                self._queue.put_nowait(None)
+        return self
+
+    async def __anext__(self) -> Dict[str, dict]:
+        changes = await self._queue.get()
+        if changes is None:
+            raise StopAsyncIteration
+        return changes
+
+
+class MarketMetricsScheduler:
+    """
+    Refreshes market metrics in the background for every registered subscription, merging overlapping symbols
+    into as few batched MarketMetrics.get_metrics calls as possible and notifying subscribers only about metrics
+    that changed since the previous fetch.
+
+    Args:
+        market_metrics (MarketMetrics): The client used to fetch metrics.
+        tick_interval (float): How often, in seconds, the scheduler checks for due subscriptions. Defaults to 1.0.
+        batch_size (int): The maximum number of symbols per get_metrics call. Defaults to 100.
+        ignore_fields (iterable of str): Fields that are not compared when detecting changes. Defaults to
+            ("updated-at",).
+    """
+
+    def __init__(self, market_metrics, tick_interval: float = 1.0, batch_size: int = 100,
+                 ignore_fields: Iterable[str] = ("updated-at",)):
+        self.market_metrics = market_metrics
+        self.tick_interval = tick_interval
+        self.batch_size = batch_size
+        self.ignore_fields = set(ignore_fields)
+        self.latest: Dict[str, dict] = {}
+        self._subscriptions: List[MetricsSubscription] = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def subscribe(self, symbols: Iterable[str], interval: float,
+                  callback: Callable[[Dict[str, dict]], None] = None) -> MetricsSubscription:
+        """
+        Registers interest in a set of symbols. The first refresh happens on the next tick.
+
+        Args:
+            symbols (iterable of str): The symbols to watch.
+            interval (float): The refresh interval in seconds.
+            callback (callable, optional): Function called with a dict of changed metrics. Defaults to None.
+
+        Returns:
+            MetricsSubscription: The new subscription, which can also be iterated with `async for`.
+        """
+        subscription = MetricsSubscription(symbols, interval, callback)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: MetricsSubscription):
+        """
+        Removes a subscription and ends its async iteration.
+
+        Args:
+            subscription (MetricsSubscription): The subscription returned by subscribe.
+        """
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+        subscription.close()
+
+    def tick(self, now: Optional[float] = None) -> Dict[str, dict]:
+        """
+        Runs one scheduling pass: fetches every symbol of every due subscription in batches, sends new subscriptions
+        the current metrics of their symbols, and notifies all other subscriptions watching a symbol whose metrics
+        changed.
+
+        Args:
+            now (float, optional): The monotonic time of the pass. Defaults to time.monotonic().
+
+        Returns:
+            dict: Dictionary of symbol -> metrics item for every symbol that changed on this pass.
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        due = [s for s in subscriptions if s.next_due <= now]
+        if not due:
+            return {}
+
+        symbols = sorted(set().union(*(s.symbols for s in due)))
+        changes = {}
+        failed = False
+        for start in range(0, len(symbols), self.batch_size):
+            batch = symbols[start:start + self.batch_size]
+            try:
+                response = self.market_metrics.get_metrics(batch)
+            except Exception:
+                logger.exception("Error refreshing market metrics for %d symbols", len(batch))
+                failed = True
+                continue
+            with self._lock:
+                for item in response["data"]["items"]:
+                    symbol = item.get("symbol")
+                    if self._strip(item) != self._strip(self.latest.get(symbol)):
+                        changes[symbol] = item
+                    self.latest[symbol] = item
+
+        with self._lock:
+            latest = dict(self.latest)
+        for subscription in subscriptions:
+            if subscription in due and not subscription.primed:
+                # A new subscription gets the current value of symbols that were cached before it registered
+                snapshot = {symbol: latest[symbol] for symbol in subscription.symbols if symbol in latest}
+                # After a failed fetch the snapshot is delivered once; symbols still missing arrive as changes
+                subscription.primed = bool(snapshot) or not failed
+                subscription.deliver(snapshot)
+            elif changes:
+                subscription.deliver(changes)
+        if not failed:
+            for subscription in due:
+                subscription.next_due = now + subscription.interval
+        return changes
+
+    def _strip(self, item: Optional[dict]) -> Optional[dict]:
+        if item is None:
+            return None
+        return {key: value for key, value in item.items() if key not in self.ignore_fields}
+
+    def start(self):
+        """Starts the background refresh thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info("Started market metrics scheduler with a tick interval of %s seconds", self.tick_interval)
+
+    def stop(self, timeout: float = None):
+        """
+        Stops the background refresh thread and closes every subscription.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the thread to finish. Defaults to None.
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+        with self._lock:
+            subscriptions, self._subscriptions = self._subscriptions, []
+        for subscription in subscriptions:
+            subscription.close()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.tick()
+            self._stop_event.wait(self.tick_interval)
@@ -78,3 +78,106 @@ class Quote:
                 bid size, ask time, ask exchange code, ask price, and ask size.
         """
         return f"Symbol: {self.symbol}, Event time: {self.event_time}, Sequence: {self.sequence}, Time nano part: {self.time_nano_part}, Bid time: {self.bid_time}, Bid exchange code: {self.bid_exchange_code}, Bid price: {self.bid_price}, Bid size: {self.bid_size}, Ask time: {self.ask_time}, Ask exchange code: {self.ask_exchange_code}, Ask price: {self.ask_price}, Ask size: {self.ask_size}"
+
+
+class Greeks:
+
+    def __init__(self, symbol, event_time, event_flags, index, time, sequence, price, volatility, delta, gamma, theta, rho, vega):
+        """
+        Initializes an instance of the class with the given parameters.
+
+        Args:
+            symbol (str): The symbol of the event.
+            event_time (int): The time of the event.
+            event_flags (int): The transactional flags of the event.
+            index (int): The unique index of the event.
+            time (int): The time of the greeks calculation.
+            sequence (int): The sequence of the event.
+            price (float): The option market price.
+            volatility (float): The Black-Scholes implied volatility of the option.
+            delta (float): The option delta.
+            gamma (float): The option gamma.
+            theta (float): The option theta.
+            rho (float): The option rho.
+            vega (float): The option vega.
+        """
+        self.symbol = symbol
+        self.event_time = event_time
+        self.event_flags = event_flags
+        self.index = index
+        self.time = time
+        self.sequence = sequence
+        self.price = price
+        self.volatility = volatility
+        self.delta = delta
+        self.gamma = gamma
+        self.theta = theta
+        self.rho = rho
+        self.vega = vega
+
+    @classmethod
+    def from_list(cls, data_list):
+        """
+        Creates a list of Greeks objects from a list of data.
+
+        Args:
+            cls (class): The class object.
+            data_list (list): The list of data to convert into Greeks objects.
+
+        Returns:
+            list: The list of Greeks objects created from the data.
+        """
+        greeks = []
+        if not data_list:
+            print("Invalid data list received")
+            return greeks
+
+        # Check if the first element is a header, if yes, skip it
+        if isinstance(data_list[0], list) and len(data_list[0]) > 1 and data_list[0][0] == 'Greeks' and data_list[0][1][0] == 'eventSymbol':
+            data_list = data_list[1:]
+
+        for greeks_data in data_list:
+            if len(greeks_data) != 13:
+                continue
+
+            values = [float(value) if value == 'NaN' else value for value in greeks_data]
+            greeks.append(cls(*values))
+        return greeks
+
+    def __str__(self):
+        """
+        Return a string representation of the object.
+
+        Returns:
+            str: A string representing the object, including the symbol, event time, price, volatility and greeks.
+        """
+        return f"Symbol: {self.symbol}, Event time: {self.event_time}, Price: {self.price}, Volatility: {self.volatility}, Delta: {self.delta}, Gamma: {self.gamma}, Theta: {self.theta}, Rho: {self.rho}, Vega: {self.vega}"
+
+
+EVENT_CLASSES = {"Quote": Quote, "Greeks": Greeks}
+EVENT_SIZES = {"Quote": 12, "Greeks": 13}
+
+
+def parse_events(data):
+    """
+    Converts a data message received from the CometdWebsocketClient data queue into event objects.
+
+    Args:
+        data (list): The data message, in the form [event type, event data]. The first message of an event type
+            carries [event type, field names] instead of the bare event type, and the values of all events may be
+            flattened into one list (compact format).
+
+    Returns:
+        list: The Quote or Greeks objects of the message, empty for other event types.
+    """
+    if not data or not isinstance(data, list) or len(data) < 2:
+        return []
+    event_type = data[0][0] if isinstance(data[0], list) else data[0]
+    event_class = EVENT_CLASSES.get(event_type)
+    if event_class is None:
+        return []
+    values = data[1]
+    if values and not isinstance(values[0], list):
+        size = EVENT_SIZES[event_type]
+        values = [values[i:i + size] for i in range(0, len(values), size)]
+    return event_class.from_list(values)
@@ -122,6 +122,33 @@ class CometdWebsocketClient:
         subscription_str = json.dumps([subscription_message])
         await websocket.send(subscription_str)
 
+    async def send_subscription_batch(self, websocket, add=None, remove=None, batch_size=100):
+        """
+        Sends add and remove subscriptions for many symbols in as few messages as possible.
+        :param websocket: The websocket to send the subscription messages to.
+        :param add: Optional dictionary of event type -> symbols to subscribe to.
+        :param remove: Optional dictionary of event type -> symbols to unsubscribe from.
+        :param batch_size: The maximum number of symbols per message.
+        :return: The number of messages sent.
+        """
+        changes = [("remove", event_type, symbol) for event_type, symbols in (remove or {}).items() for symbol in symbols]
+        changes += [("add", event_type, symbol) for event_type, symbols in (add or {}).items() for symbol in symbols]
+
+        sent = 0
+        for start in range(0, len(changes), batch_size):
+            data = {"reset": False}
+            for action, event_type, symbol in changes[start:start + batch_size]:
+                data.setdefault(action, {}).setdefault(event_type, []).append(symbol)
+            subscription_message = {
+                "id": self.next_id(),
+                "channel": "/service/sub",
+                "clientId": self.client_id,
+                "data": data
+            }
+            await websocket.send(json.dumps([subscription_message]))
+            sent += 1
+        return sent
+
     async def listen(self, websocket):
         """
         Continuously listens for messages from the given WebSocket and yields
@@ -0,0 +1,190 @@
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from tastytrade_api.streamer.dx_mapping import Quote, parse_events
+from tastytrade_api.symbology import to_streamer_symbol
+
+
+def _action_sign(action) -> float:
+    return -1.0 if str(action or "BUY").upper().startswith("SELL") else 1.0
+
+
+def pairs_from_watchlists(response: dict) -> List[dict]:
+    """
+    Flattens the response of TastytradeWatchlist.get_pairs_watchlists into one entry per pair.
+
+    Args:
+        response (dict): The response for all pairs watchlists or for one of them.
+
+    Returns:
+        list: Dictionaries with "name", "left-symbol", "right-symbol" and the signed "left-ratio" and "right-ratio"
+        (positive for a buy, negative for a sell).
+    """
+    data = response.get("data", response)
+    watchlists = data.get("items", [data])
+    pairs = []
+    for watchlist in watchlists:
+        for equation in watchlist.get("pairs-equations") or []:
+            left, right = equation["left-symbol"], equation["right-symbol"]
+            pairs.append({
+                "name": f"{watchlist.get('name')}: {left}/{right}",
+                "left-symbol": left,
+                "right-symbol": right,
+                "left-ratio": _action_sign(equation.get("left-action")) * float(equation.get("left-quantity") or 1),
+                "right-ratio": _action_sign(equation.get("right-action")) * float(equation.get("right-quantity") or 1),
+            })
+    return pairs
+
+
+class PairsSpreadEngine:
+    """
+    Live spreads and rolling z-scores of many pairs, computed on aligned arrays.
+
+    Each symbol's latest mid price lives in one array; every pair holds the indexes of its two legs and their signed
+    ratios, so one tick evaluates the spread of every pair with two gathers. The last `window` spreads of each pair
+    are kept in a ring buffer with running sums, so updating the rolling mean and standard deviation costs the same
+    for any window length.
+
+    tick samples every pair, which suits a clock-driven loop. handle_data ticks on quotes and only samples the pairs
+    with a leg quoted since the previous tick, so a pair does not record its unchanged spread again whenever any
+    other symbol is quoted, which would repeat samples and understate its variance.
+
+    Args:
+        pairs (list of dict): Pairs from pairs_from_watchlists.
+        window (int): The number of ticks in the rolling statistics. Defaults to 100.
+        min_periods (int): The number of valid spreads needed before a z-score is reported. Defaults to 20.
+    """
+
+    def __init__(self, pairs: List[dict], window: int = 100, min_periods: int = 20):
+        self.names = [pair["name"] for pair in pairs]
+        self.symbols: List[str] = []
+        self._symbol_index: Dict[str, int] = {}
+        left = [self._index(to_streamer_symbol(pair["left-symbol"])) for pair in pairs]
+        right = [self._index(to_streamer_symbol(pair["right-symbol"])) for pair in pairs]
+        self.left_index, self.right_index = np.array(left, dtype=int), np.array(right, dtype=int)
+        self.left_ratio = np.array([pair["left-ratio"] for pair in pairs], dtype=float)
+        self.right_ratio = np.array([pair["right-ratio"] for pair in pairs], dtype=float)
+        self.prices = np.full(len(self.symbols), np.nan)
+        self._quoted = np.zeros(len(self.symbols), dtype=bool)
+
+        self.window = window
+        self.min_periods = min_periods
+        size = len(pairs)
+        self.history = np.full((window, size), np.nan)
+        self.spread = np.full(size, np.nan)
+        self.zscore = np.full(size, np.nan)
+        self._sum, self._sum_squares, self._count = np.zeros(size), np.zeros(size), np.zeros(size)
+        self._position = np.zeros(size, dtype=int)
+        self._lock = threading.Lock()
+
+    def _index(self, symbol):
+        if symbol not in self._symbol_index:
+            self._symbol_index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return self._symbol_index[symbol]
+
+    def watchlist(self, name: str = "pairs") -> dict:
+        """
+        Returns the legs of every pair as a watchlist, to subscribe them with WatchlistFeedBridge.set_watchlist.
+        """
+        return {"name": name, "watchlist-entries": [{"symbol": symbol} for symbol in self.symbols]}
+
+    def on_quote(self, symbol: str, bid_price, ask_price):
+        """
+        Stores the mid price of a leg. Quotes for other symbols and quotes without a valid bid or ask are ignored.
+        The spreads are only recomputed on tick.
+        """
+        index = self._symbol_index.get(symbol)
+        if index is None:
+            return
+        try:
+            mid = (float(bid_price) + float(ask_price)) / 2
+        except (TypeError, ValueError):
+            return
+        if mid == mid:
+            with self._lock:
+                self.prices[index] = mid
+                self._quoted[index] = True
+
+    def tick(self, quoted_only: bool = False) -> np.ndarray:
+        """
+        Recomputes the spread of the pairs from the latest prices, adds it to their rolling window and updates their
+        z-scores.
+
+        Args:
+            quoted_only (bool): Whether to only sample the pairs with a leg quoted since the previous tick. The other
+                pairs keep their spread and z-score. Defaults to False (sample every pair).
+
+        Returns:
+            np.ndarray: The z-score of every pair, NaN until `min_periods` valid spreads were seen or when the
+            window has no variance.
+        """
+        with self._lock:
+            if quoted_only:
+                pairs = np.flatnonzero(self._quoted[self.left_index] | self._quoted[self.right_index])
+            else:
+                pairs = np.arange(len(self.names))
+            self._quoted[:] = False
+            spread = self.left_ratio[pairs] * self.prices[self.left_index[pairs]] + \
+                self.right_ratio[pairs] * self.prices[self.right_index[pairs]]
+            self._push(pairs, spread)
+
+            with np.errstate(invalid="ignore", divide="ignore"):
+                count = self._count[pairs]
+                mean = self._sum[pairs] / count
+                std = np.sqrt(np.maximum(self._sum_squares[pairs] / count - mean * mean, 0.0))
+                zscore = (spread - mean) / std
+            zscore[(count < self.min_periods) | ~(std > 1e-12)] = np.nan
+            self.spread, self.zscore = self.spread.copy(), self.zscore.copy()
+            self.spread[pairs], self.zscore[pairs] = spread, zscore
+            return self.zscore
+
+    def _push(self, pairs, spread):
+        position = self._position[pairs]
+        old = self.history[position, pairs]
+        old_valid, new_valid = ~np.isnan(old), ~np.isnan(spread)
+        old, new = np.where(old_valid, old, 0.0), np.where(new_valid, spread, 0.0)
+        self._sum[pairs] += new - old
+        self._sum_squares[pairs] += new * new - old * old
+        self._count[pairs] += new_valid.astype(float) - old_valid
+        self.history[position, pairs] = spread
+        self._position[pairs] = (position + 1) % self.window
+        wrapped = pairs[self._position[pairs] == 0]
+        if len(wrapped):
+            # Recompute once per window so the running sums do not drift
+            history = self.history[:, wrapped]
+            valid = ~np.isnan(history)
+            values = np.where(valid, history, 0.0)
+            self._sum[wrapped], self._sum_squares[wrapped] = values.sum(axis=0), (values * values).sum(axis=0)
+            self._count[wrapped] = valid.sum(axis=0)
+
+    def handle_data(self, data) -> Optional[np.ndarray]:
+        """
+        Applies a data message received from the CometdWebsocketClient data queue and ticks once if it held a
+        quote for a leg, sampling only the pairs whose legs were quoted.
+
+        Args:
+            data (list): The data message, in the form [event type, event data].
+
+        Returns:
+            np.ndarray: The z-scores after the tick, or None if the message held no leg quotes.
+        """
+        updated = False
+        for event in parse_events(data):
+            if isinstance(event, Quote) and event.symbol in self._symbol_index:
+                self.on_quote(event.symbol, event.bid_price, event.ask_price)
+                updated = True
+        return self.tick(quoted_only=True) if updated else None
+
+    def snapshot(self) -> Dict[str, tuple]:
+        """
+        Returns the latest values of every pair.
+
+        Returns:
+            dict: Pair name -> (spread, z-score).
+        """
+        with self._lock:
+            return {name: (float(spread), float(zscore))
+                    for name, spread, zscore in zip(self.names, self.spread, self.zscore)}
@@ -0,0 +1,70 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from tastytrade_api.streamer.dx_mapping import Quote, parse_events
+from tastytrade_api.symbology import to_streamer_symbol
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if value != value else value
+
+
+class QuoteBook:
+    """
+    The latest bid and ask of every symbol seen in dxfeed Quote events, with the time each quote was received.
+
+    Lookups accept Tastytrade option symbols as well as streamer symbols.
+    """
+
+    def __init__(self):
+        self.quotes: Dict[str, Tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+
+    def on_quote(self, symbol: str, bid_price, ask_price):
+        """
+        Stores a quote. Quotes without a valid bid or ask are ignored.
+
+        Args:
+            symbol (str): The streamer symbol.
+            bid_price (float): The bid price.
+            ask_price (float): The ask price.
+        """
+        bid, ask = _to_float(bid_price), _to_float(ask_price)
+        if bid is None or ask is None:
+            return
+        with self._lock:
+            self.quotes[symbol] = (bid, ask, time.monotonic())
+
+    def handle_data(self, data):
+        """
+        Applies a data message received from the CometdWebsocketClient data queue.
+
+        Args:
+            data (list): The data message, in the form [event type, event data].
+        """
+        for event in parse_events(data):
+            if isinstance(event, Quote):
+                self.on_quote(event.symbol, event.bid_price, event.ask_price)
+
+    def get(self, symbol: str, max_age: float = None) -> Optional[Tuple[float, float]]:
+        """
+        Returns the latest (bid, ask) of a symbol.
+
+        Args:
+            symbol (str): The Tastytrade or streamer symbol.
+            max_age (float, optional): Quotes received more than this many seconds ago are treated as missing.
+                Defaults to None (any age).
+
+        Returns:
+            tuple: The (bid, ask) pair, or None if there is no usable quote.
+        """
+        with self._lock:
+            quote = self.quotes.get(to_streamer_symbol(symbol))
+        if quote is None or (max_age is not None and time.monotonic() - quote[2] > max_age):
+            return None
+        return quote[0], quote[1]
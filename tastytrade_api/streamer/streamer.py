@@ -20,6 +20,54 @@ class TastytradeStreamer:
         self.error_callback = error_callback or self.on_error
         self.open_callback = open_callback or self.on_open
         self.close_callback = close_callback or self.on_close
+        self.listeners = {}
+        self.connection_listeners = []
+
+    def add_listener(self, message_type, callback):
+        """Registers a callback for account streamer messages of the given type.
+
+        Args:
+            message_type (str): The message type to listen for, e.g. "Order", "CurrentPosition" or "AccountBalance".
+                Use "*" to receive every message.
+            callback (callable): Function called with the decoded message dict.
+        """
+        self.listeners.setdefault(message_type, []).append(callback)
+
+    def remove_listener(self, message_type, callback):
+        """Removes a callback registered with 'add_listener'."""
+        if callback in self.listeners.get(message_type, []):
+            self.listeners[message_type].remove(callback)
+
+    def add_connection_listener(self, callback):
+        """Registers a callback for connection state changes.
+
+        Args:
+            callback (callable): Function called with "open", "close" or "error".
+        """
+        self.connection_listeners.append(callback)
+
+    def remove_connection_listener(self, callback):
+        """Removes a callback registered with 'add_connection_listener'."""
+        if callback in self.connection_listeners:
+            self.connection_listeners.remove(callback)
+
+    def dispatch(self, data):
+        """Passes a decoded message to the listeners registered for its type and to the "*" listeners."""
+        if not isinstance(data, dict):
+            return
+        for callback in self.listeners.get(data.get("type"), []) + self.listeners.get("*", []):
+            try:
+                callback(data)
+            except Exception:
+                logger.exception("Listener failed for message: %s", data)
+
+    def dispatch_connection_state(self, state):
+        """Notifies the connection listeners about a connection state change."""
+        for callback in list(self.connection_listeners):
+            try:
+                callback(state)
+            except Exception:
+                logger.exception("Connection listener failed for state: %s", state)
 
     def on_message(self, ws, message):
         """Default callback function for handling received messages."""
@@ -38,6 +86,31 @@ class TastytradeStreamer:
         """Default callback function for handling WebSocket open events."""
         logger.info("WebSocket opened")
 
+    def handle_message(self, ws, message):
+        """Calls the message callback, then dispatches the message to the listeners whatever the callback is."""
+        self.message_callback(ws, message)
+        try:
+            data = json.loads(message)
+        except ValueError:
+            logger.warning("Could not decode message: %s", message)
+            return
+        self.dispatch(data)
+
+    def handle_error(self, ws, error):
+        """Calls the error callback, then notifies the connection listeners."""
+        self.error_callback(ws, error)
+        self.dispatch_connection_state("error")
+
+    def handle_close(self, ws, *args):
+        """Calls the close callback, then notifies the connection listeners."""
+        self.close_callback(ws, *args)
+        self.dispatch_connection_state("close")
+
+    def handle_open(self, ws):
+        """Calls the open callback, then notifies the connection listeners."""
+        self.open_callback(ws)
+        self.dispatch_connection_state("open")
+
     def connect(self):
         def send_wrapper(ws, message):
             print(f"Sent message: {message}")
@@ -46,10 +119,10 @@ class TastytradeStreamer:
         """Connects to the WebSocket and sets the provided callback functions."""
         self.ws = WebSocketApp(
             self.websocket_url,
-            on_message=self.message_callback,
-            on_error=self.error_callback,
-            on_close=self.close_callback,
-            on_open=self.open_callback,
+            on_message=self.handle_message,
+            on_error=self.handle_error,
+            on_close=self.handle_close,
+            on_open=self.handle_open,
         )
         self.ws.send = functools.partial(send_wrapper, self.ws)
 
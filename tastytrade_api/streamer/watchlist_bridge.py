@@ -0,0 +1,177 @@
+import asyncio
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from tastytrade_api.symbology import to_streamer_symbol
+
+logger = logging.getLogger(__name__)
+
+
+def entry_streamer_symbol(entry: dict, streamer_symbols: Dict[str, str] = None) -> Optional[str]:
+    """
+    Returns the dxfeed symbol of a watchlist entry: its "streamer-symbol" when the API provides one, then the one in
+    `streamer_symbols`, otherwise the symbol converted with to_streamer_symbol. Futures and future options have no
+    derivable streamer symbol, since it carries an exchange code, and return None.
+    """
+    symbol = entry["symbol"]
+    streamer_symbol = entry.get("streamer-symbol") or (streamer_symbols or {}).get(symbol)
+    if streamer_symbol:
+        return streamer_symbol
+    if symbol.startswith("/") or symbol.startswith("./"):
+        return None
+    return to_streamer_symbol(symbol)
+
+
+class WatchlistFeedBridge:
+    """
+    Keeps the dxfeed subscriptions of a CometdWebsocketClient in sync with one or more watchlists.
+
+    The subscribed set is the union of the streamer symbols of every watchlist. On each sync only the symbols that
+    entered or left that union are sent, batched with send_subscription_batch, so a 500-symbol watchlist subscribes
+    in a handful of frames and a symbol shared by two watchlists stays subscribed until both drop it.
+
+    Futures and future option entries without a "streamer-symbol" are taken from `streamer_symbols`, or fetched with
+    resolve_streamer_symbols. Until then they are listed in `unresolved` and not subscribed.
+
+    Args:
+        client (CometdWebsocketClient): A client that completed its handshake.
+        event_types (list of str): The event types subscribed for every symbol. Defaults to ["Quote"].
+        batch_size (int): The maximum number of symbols per subscription message. Defaults to 100.
+        symbol_mapper (callable): (watchlist entry, streamer_symbols) -> streamer symbol, or None if it is unknown.
+            Defaults to entry_streamer_symbol.
+        streamer_symbols (dict, optional): Tastytrade symbol -> streamer symbol. Defaults to None.
+    """
+
+    def __init__(self, client, event_types: List[str] = None, batch_size: int = 100,
+                 symbol_mapper: Callable[[dict, Dict[str, str]], Optional[str]] = entry_streamer_symbol,
+                 streamer_symbols: Dict[str, str] = None):
+        self.client = client
+        self.event_types = list(event_types or ["Quote"])
+        self.batch_size = batch_size
+        self.symbol_mapper = symbol_mapper
+        self.streamer_symbols = dict(streamer_symbols or {})
+        self.entries: Dict[str, List[dict]] = {}
+        self.watchlists: Dict[str, Set[str]] = {}
+        self.subscribed: Set[str] = set()
+        self._lock = asyncio.Lock()
+
+    @property
+    def desired(self) -> Set[str]:
+        """set: The streamer symbols of every watchlist."""
+        return set().union(*self.watchlists.values())
+
+    @property
+    def unresolved(self) -> List[str]:
+        """list: The symbols of the watchlist entries that have no streamer symbol yet."""
+        return sorted({entry["symbol"] for entries in self.entries.values() for entry in entries
+                       if self.symbol_mapper(entry, self.streamer_symbols) is None})
+
+    def _map(self, name: str):
+        symbols = {self.symbol_mapper(entry, self.streamer_symbols) for entry in self.entries[name]}
+        symbols.discard(None)
+        self.watchlists[name] = symbols
+
+    def set_watchlist(self, watchlist: dict):
+        """
+        Replaces the symbols of a watchlist. Nothing is sent until sync.
+
+        Args:
+            watchlist (dict): The watchlist, as returned by get_account_watchlists or TastytradeWatchlistCache.get.
+        """
+        name = watchlist["name"]
+        self.entries[name] = list(watchlist.get("watchlist-entries") or [])
+        self._map(name)
+        unresolved = [entry["symbol"] for entry in self.entries[name]
+                      if self.symbol_mapper(entry, self.streamer_symbols) is None]
+        if unresolved:
+            logger.warning("No streamer symbol for %s in watchlist %s, call resolve_streamer_symbols",
+                           unresolved, name)
+
+    def remove_watchlist(self, name: str):
+        """
+        Removes a watchlist. Its symbols are unsubscribed on the next sync unless another watchlist holds them.
+        """
+        self.entries.pop(name, None)
+        self.watchlists.pop(name, None)
+
+    def set_watchlists(self, watchlists: Iterable[dict], replace: bool = True):
+        """
+        Sets several watchlists at once, e.g. the items of get_account_watchlists.
+
+        Args:
+            watchlists (list of dict): The watchlists.
+            replace (bool): Whether to remove the watchlists that are not in the list. Defaults to True.
+        """
+        watchlists = list(watchlists)
+        if replace:
+            self.entries = {}
+            self.watchlists = {}
+        for watchlist in watchlists:
+            self.set_watchlist(watchlist)
+
+    def resolve_streamer_symbols(self, instruments) -> List[str]:
+        """
+        Fetches the streamer symbols of the futures and future options in `unresolved` and maps the watchlists
+        again. Nothing is sent until sync.
+
+        Args:
+            instruments (TastytradeInstruments): The instruments client.
+
+        Returns:
+            list: The symbols that are still unresolved.
+
+        Raises:
+            Exception: If there was an error in the GET requests.
+        """
+        unresolved = self.unresolved
+        future_options = [symbol for symbol in unresolved if symbol.startswith("./")]
+        futures = [symbol for symbol in unresolved if not symbol.startswith("./")]
+        items = (instruments.get_future_options(future_options) if future_options else []) + \
+            (instruments.get_futures(futures) if futures else [])
+        self.streamer_symbols.update({item["symbol"]: item["streamer-symbol"] for item in items
+                                      if item.get("streamer-symbol")})
+        for name in self.entries:
+            self._map(name)
+        return self.unresolved
+
+    async def sync(self) -> int:
+        """
+        Subscribes the symbols that were added to the watchlists and unsubscribes the ones that were removed.
+
+        Returns:
+            int: The number of messages sent.
+        """
+        async with self._lock:
+            desired = self.desired
+            added, removed = sorted(desired - self.subscribed), sorted(self.subscribed - desired)
+            if not added and not removed:
+                return 0
+            sent = await self.client.send_subscription_batch(
+                self.client.websocket,
+                add={event_type: added for event_type in self.event_types} if added else None,
+                remove={event_type: removed for event_type in self.event_types} if removed else None,
+                batch_size=self.batch_size,
+            )
+            self.subscribed = desired
+            return sent
+
+    async def update(self, watchlist: dict) -> int:
+        """
+        Replaces the symbols of a watchlist and syncs the subscriptions.
+
+        Returns:
+            int: The number of messages sent.
+        """
+        self.set_watchlist(watchlist)
+        return await self.sync()
+
+    async def resubscribe(self) -> int:
+        """
+        Subscribes every symbol again, e.g. from on_handshake_success after a reconnect, when the server has
+        forgotten the previous subscriptions.
+
+        Returns:
+            int: The number of messages sent.
+        """
+        self.subscribed = set()
+        return await self.sync()
@@ -92,3 +92,30 @@ def to_tastytrade_future_option_symbol(symbol: str, future_month: str, option_pr
 
     return future_option_symbol
 
+
+def to_streamer_symbol(symbol: str) -> str:
+    """
+    Convert a Tastytrade equity option symbol to the symbol used by the dxfeed streamer.
+    Symbols that are not equity option symbols are returned unchanged.
+
+    Args:
+        symbol (str): Tastytrade symbol, e.g. an option symbol in the format "SYMBOLYYMMDDTXXXXXXXX".
+
+    Returns:
+        str: dxfeed streamer symbol in the format ".SYMBOLYYMMDDTSTRIKE".
+
+    Example:
+        >>> to_streamer_symbol("SPXW  231020C04302500")
+        ".SPXW231020C4302.5"
+    """
+    if len(symbol) != 21 or symbol[12] not in "CP" or not symbol[6:12].isdigit() or not symbol[13:].isdigit():
+        return symbol
+
+    # strip the padding of the root symbol
+    root = symbol[:6].strip()
+
+    # convert the 8-digit strike back to a price without trailing zeros
+    strike = int(symbol[13:]) / 1000
+    strike_formatted = f"{strike:f}".rstrip('0').rstrip('.')
+
+    return f".{root}{symbol[6:12]}{symbol[12]}{strike_formatted}"
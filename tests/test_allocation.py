@@ -0,0 +1,97 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import unittest
+import requests_mock
+from tastytrade_api.account.allocation import scale_order
+from tastytrade_api.account.order import TastytradeOrder
+from tastytrade_api.account.order_builder import build_leg, build_order
+
+API_URL = "https://api.tastytrade.com"
+TEMPLATE = build_order(1.5, [build_leg("Sell to Open", "SPY   231020P00400000", "1"),
+                             build_leg("Buy to Open", "SPY   231020P00395000", "1")])
+
+
+def order_url(account_number):
+    return f"{API_URL}/accounts/{account_number}/orders"
+
+
+def create_response(order_id, status="Filled"):
+    def response(request, context):
+        return {"data": {"order": dict(request.json(), id=order_id, status=status, size=1)}}
+    return response
+
+
+class TestScaleOrder(unittest.TestCase):
+
+    def test_string_quantities_are_multiplied(self):
+        scaled = scale_order(TEMPLATE, 3)
+        self.assertEqual([leg["quantity"] for leg in scaled["legs"]], [3, 3])
+        self.assertEqual([leg["quantity"] for leg in TEMPLATE["legs"]], ["1", "1"])
+        self.assertEqual(scaled["price"], 1.5)
+
+    def test_invalid_quantities_are_rejected(self):
+        for quantity in (0, -1, 1.5, "abc"):
+            with self.subTest(quantity=quantity):
+                with self.assertRaises(Exception):
+                    scale_order(TEMPLATE, quantity)
+        with self.assertRaises(Exception):
+            scale_order(build_order(1.5, [build_leg("Sell to Open", "SPY", "0.5")]), 2)
+
+
+class TestAllocate(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TastytradeOrder("st-abcabc123123", API_URL)
+        self.client.fill_tracker.poll_interval = 0.01
+
+    @requests_mock.Mocker()
+    def test_orders_are_scaled_per_account(self, mock):
+        first = mock.post(order_url("5WX01234"), json=create_response(1))
+        second = mock.post(order_url("5WX05678"), json=create_response(2))
+
+        allocation = self.client.allocate(TEMPLATE, {"5WX01234": 2, "5WX05678": 5, "5WX09999": 0})
+
+        self.assertEqual([order.account_number for order in allocation.orders], ["5WX01234", "5WX05678"])
+        self.assertEqual([leg["quantity"] for leg in first.last_request.json()["legs"]], [2, 2])
+        self.assertEqual([leg["quantity"] for leg in second.last_request.json()["legs"]], [5, 5])
+        self.assertEqual(allocation["5WX05678"].order_id, 2)
+        self.assertEqual(allocation.statuses, {"5WX01234": "Filled", "5WX05678": "Filled"})
+        self.assertEqual(allocation.failed, [])
+
+    @requests_mock.Mocker()
+    def test_invalid_quantity_sends_nothing(self, mock):
+        create = mock.post(order_url("5WX01234"), json=create_response(1))
+
+        with self.assertRaises(Exception):
+            self.client.allocate(TEMPLATE, {"5WX01234": 2, "5WX05678": 1.5})
+        self.assertEqual(create.call_count, 0)
+
+    @requests_mock.Mocker()
+    def test_partial_failures_are_reported_per_account(self, mock):
+        mock.post(order_url("5WX01234"), json=create_response(1))
+        mock.get(f"{order_url('5WX01234')}/1", json={"data": {"id": 1, "status": "Filled", "legs": []}})
+        mock.post(order_url("5WX05678"), status_code=422, json={"error": {"code": "margin_check_failed"}})
+        mock.post(order_url("5WX09999"), json=create_response(3, "Routed"))
+        mock.get(f"{order_url('5WX09999')}/3", status_code=500)
+
+        allocation = self.client.allocate(TEMPLATE, {"5WX01234": 1, "5WX05678": 1, "5WX09999": 1},
+                                          wait_timeout=0.05)
+
+        with self.subTest("Accepted and filled"):
+            self.assertEqual(allocation["5WX01234"].status, "Filled")
+            self.assertIsNone(allocation["5WX01234"].wait_error)
+        with self.subTest("Rejected"):
+            self.assertEqual(allocation["5WX05678"].status, "error")
+            self.assertIsNone(allocation["5WX05678"].order_id)
+        with self.subTest("Wait failed"):
+            self.assertEqual(allocation["5WX09999"].order_id, 3)
+            self.assertEqual(allocation["5WX09999"].status, "Routed")
+            self.assertIsNotNone(allocation["5WX09999"].wait_error)
+        self.assertEqual([order.account_number for order in allocation.failed], ["5WX05678", "5WX09999"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import datetime
+import tempfile
+import unittest
+import requests_mock
+from tastytrade_api.account.balance_export import BalanceSnapshotExporter
+
+
+class TestBalanceSnapshotExporter(unittest.TestCase):
+    API_URL = "https://api.tastytrade.com"
+
+    def setUp(self):
+        self.exporter = BalanceSnapshotExporter("st-abcabc123123", self.API_URL, tempfile.mkdtemp())
+        self.url = f"{self.API_URL}/accounts/5WX01234/balance-snapshots"
+
+    @requests_mock.Mocker()
+    def test_export_skips_stored_dates(self, mock):
+        mock.get(self.url, json={"data": {"cash-balance": "1000.0", "currency": "USD"}})
+        self.exporter.export(["5WX01234"], datetime.date(2023, 10, 16), datetime.date(2023, 10, 17))
+        written, errors = self.exporter.export(["5WX01234"], datetime.date(2023, 10, 16), datetime.date(2023, 10, 18))
+
+        columns = self.exporter.load("5WX01234")
+        self.assertEqual((written, errors), ({"5WX01234": 1}, {}))
+        self.assertEqual(columns["cash-balance"].dtype.kind, "f")
+        self.assertEqual(list(columns["currency"]), ["USD"] * 3)
+
+    @requests_mock.Mocker()
+    def test_numeric_column_receiving_text_becomes_text(self, mock):
+        mock.get(self.url, json={"data": {"pending-cash-effect": "12.5"}})
+        self.exporter.export(["5WX01234"], datetime.date(2023, 10, 16), datetime.date(2023, 10, 16))
+        mock.get(self.url, json={"data": {"pending-cash-effect": "Debit"}})
+        self.exporter.export(["5WX01234"], datetime.date(2023, 10, 17), datetime.date(2023, 10, 17))
+
+        column = self.exporter.load("5WX01234")["pending-cash-effect"]
+        self.assertEqual(list(column), ["12.5", "Debit"])
+
+
+if __name__ == '__main__':
+    unittest.main()
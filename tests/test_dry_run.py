@@ -0,0 +1,116 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import unittest
+import numpy as np
+import requests_mock
+from tastytrade_api.account.dry_run import DryRunResults, dry_run_many
+from tastytrade_api.account.order import TastytradeOrder
+from tastytrade_api.account.order_builder import build_leg, build_order
+
+API_URL = "https://api.tastytrade.com"
+DRY_RUN_URL = f"{API_URL}/accounts/5WX01234/orders/dry-run"
+
+
+def dry_run_response(order, buying_power, buying_power_effect, margin, margin_effect, fees, warnings=()):
+    """A dry run response, shaped like the POST /accounts/{account_number}/orders/dry-run response."""
+    return {"data": {
+        "order": dict(order, **{"account-number": "5WX01234", "status": "Received", "size": 1}),
+        "warnings": [{"code": code, "message": message} for code, message in warnings],
+        "buying-power-effect": {
+            "change-in-margin-requirement": margin,
+            "change-in-margin-requirement-effect": margin_effect,
+            "change-in-buying-power": buying_power,
+            "change-in-buying-power-effect": buying_power_effect,
+            "current-buying-power": "10000.0",
+            "current-buying-power-effect": "Credit",
+            "new-buying-power": "9500.0",
+            "new-buying-power-effect": "Credit",
+            "isolated-order-margin-requirement": margin,
+            "isolated-order-margin-requirement-effect": margin_effect,
+            "is-spread": True,
+            "impact": buying_power,
+            "effect": buying_power_effect,
+        },
+        "fee-calculation": {
+            "regulatory-fees": "0.02",
+            "regulatory-fees-effect": "Debit",
+            "clearing-fees": "0.2",
+            "clearing-fees-effect": "Debit",
+            "commission": "1.0",
+            "commission-effect": "Debit",
+            "proprietary-index-option-fees": "0.0",
+            "proprietary-index-option-fees-effect": "None",
+            "total-fees": fees,
+            "total-fees-effect": "Debit",
+        },
+    }}
+
+
+def candidate(strike):
+    return build_order(1.0, [build_leg("Sell to Open", f"SPY   231020P00{strike}000", 1),
+                             build_leg("Buy to Open", f"SPY   231020P00{strike - 5}000", 1)])
+
+
+ORDERS = [candidate(400), candidate(405), candidate(410), candidate(415)]
+RESPONSES = [
+    dry_run_response(ORDERS[0], "500.0", "Debit", "500.0", "Debit", "1.52"),
+    dry_run_response(ORDERS[1], "200.0", "Debit", "200.0", "Debit", "2.0",
+                     [("tif_next_valid_sesssion", "Your order will begin working during next valid session.")]),
+    dry_run_response(ORDERS[2], "50.0", "Credit", "50.0", "Credit", "1.0"),
+    None,
+]
+
+
+class TestDryRunResults(unittest.TestCase):
+
+    def setUp(self):
+        self.results = DryRunResults(ORDERS, RESPONSES, [None, None, None, Exception("margin_check_failed")])
+
+    def test_signed_amounts(self):
+        np.testing.assert_allclose(self.results.buying_power_change[:3], [-500.0, -200.0, 50.0])
+        np.testing.assert_allclose(self.results.margin_change[:3], [-500.0, -200.0, 50.0])
+        np.testing.assert_allclose(self.results.fees[:3], [1.52, 2.0, 1.0])
+        self.assertTrue(np.isnan(self.results.buying_power_change[3]))
+        self.assertTrue(np.isnan(self.results.fees[3]))
+
+    def test_warnings(self):
+        self.assertEqual(self.results.warnings[1], ["Your order will begin working during next valid session."])
+        self.assertEqual(self.results.warnings[0], [])
+        self.assertEqual(self.results.warnings[3], [])
+        self.assertEqual(self.results.ok.tolist(), [True, True, True, False])
+
+    def test_rank(self):
+        self.assertEqual(self.results.rank().tolist(), [2, 1, 0])
+        self.assertEqual(self.results.rank(allow_warnings=False).tolist(), [2, 0])
+        self.assertEqual(self.results.rank(fee_weight=1000.0).tolist(), [2, 0, 1])
+
+
+class TestDryRunMany(unittest.TestCase):
+
+    @requests_mock.Mocker()
+    def test_responses_are_kept_in_order(self, mock):
+        responses = {order["legs"][0]["symbol"]: response for order, response in zip(ORDERS, RESPONSES)}
+
+        def dry_run(request, context):
+            response = responses[request.json()["legs"][0]["symbol"]]
+            if response is None:
+                context.status_code = 422
+                return {"error": {"code": "margin_check_failed"}}
+            context.status_code = 201
+            return response
+        mock.post(DRY_RUN_URL, json=dry_run)
+
+        results = dry_run_many(TastytradeOrder("st-abcabc123123", API_URL), "5WX01234", ORDERS)
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results.ok.tolist(), [True, True, True, False])
+        self.assertIsNotNone(results.errors[3])
+        np.testing.assert_allclose(results.buying_power_change[:3], [-500.0, -200.0, 50.0])
+        self.assertEqual(results.rank().tolist(), [2, 1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
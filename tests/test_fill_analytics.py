@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import unittest
+import numpy as np
+from tastytrade_api.account.fill_analytics import FillAnalytics
+from tastytrade_api.account.order_builder import net_prices
+
+
+def leg(action, symbol, quantity, fills):
+    return {"action": action, "symbol": symbol, "quantity": quantity,
+            "fills": [{"quantity": q, "fill-price": p, "filled-at": "2023-10-19T14:00:02.000+00:00"}
+                      for q, p in fills]}
+
+
+CREDIT_SPREAD = {
+    "id": 1, "size": 2, "price": "1.50", "price-effect": "Credit", "received-at": "2023-10-19T14:00:00.000+00:00",
+    "legs": [leg("Sell to Open", "SPY   231020P00400000", 2, [(1, "2.1"), (1, "1.9")]),
+             leg("Buy to Open", "SPY   231020P00395000", 2, [(2, "0.4")])],
+}
+DEBIT_PARTIAL = {
+    "id": 2, "size": 2, "price": "1.00", "price-effect": "Debit", "received-at": "2023-10-19T14:00:00.000+00:00",
+    "legs": [leg("Buy to Open", "SPY   231020C00420000", 2, [(1, "1.5")]),
+             leg("Sell to Open", "SPY   231020C00425000", 2, [(1, "0.6")])],
+}
+UNFILLED = {"id": 3, "size": 1, "legs": [leg("Buy to Open", "SPY", 1, [])]}
+
+
+class TestFillAnalytics(unittest.TestCase):
+
+    def setUp(self):
+        self.analytics = FillAnalytics([CREDIT_SPREAD, DEBIT_PARTIAL, UNFILLED], {1: 1.55})
+
+    def test_vwap_is_a_signed_net_price(self):
+        with self.subTest("Credit spread"):
+            self.assertAlmostEqual(self.analytics.vwap[0], 1.6)
+            self.assertAlmostEqual(self.analytics.net_fill[0], 1.6)
+        with self.subTest("Partially filled debit spread"):
+            self.assertAlmostEqual(self.analytics.vwap[1], -0.9)
+            self.assertAlmostEqual(self.analytics.net_fill[1], -0.45)
+        with self.subTest("Unfilled"):
+            self.assertTrue(np.isnan(self.analytics.vwap[2]))
+
+    def test_leg_vwap(self):
+        np.testing.assert_allclose(self.analytics.leg_vwap[0], [2.0, 0.4])
+        np.testing.assert_allclose(self.analytics.leg_vwap[1], [1.5, 0.6])
+        self.assertTrue(np.isnan(self.analytics.leg_vwap[2][0]))
+
+    def test_slippage_and_fill_times(self):
+        self.assertAlmostEqual(self.analytics.slippage_vs_limit[0], 0.1)
+        self.assertAlmostEqual(self.analytics.slippage_vs_reference[0], 0.05)
+        self.assertAlmostEqual(self.analytics.time_to_fill[0], 2.0)
+        self.assertEqual(self.analytics.summary()["slippage_vs_reference"]["count"], 1)
+
+    def test_net_prices(self):
+        quotes = {"SPY   231020P00400000": (1.9, 2.1), "SPY   231020P00395000": (0.3, 0.5)}
+        natural, mid = net_prices(CREDIT_SPREAD["legs"], quotes, 2)
+        self.assertAlmostEqual(natural, 1.4)
+        self.assertAlmostEqual(mid, 1.6)
+
+
+if __name__ == '__main__':
+    unittest.main()
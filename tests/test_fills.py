@@ -0,0 +1,114 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import unittest
+import requests_mock
+from tastytrade_api.account.order import TastytradeOrder
+from tastytrade_api.account.order_builder import build_leg, build_order
+
+API_URL = "https://api.tastytrade.com"
+ORDERS_URL = f"{API_URL}/accounts/5WX01234/orders"
+LEG = build_leg("Sell to Open", "SPY   231020P00400000", 1)
+
+
+def order_object(order_id, status, fill_price=None):
+    leg = dict(LEG, fills=[])
+    if fill_price is not None:
+        leg["fills"] = [{"fill-price": str(fill_price), "quantity": 1}]
+    return {"id": order_id, "status": status, "size": 1, "legs": [leg]}
+
+
+class FakeStreamer:
+    def __init__(self):
+        self.listeners = {}
+
+    def add_listener(self, message_type, callback):
+        self.listeners.setdefault(message_type, []).append(callback)
+
+    def send(self, order):
+        for callback in self.listeners.get("Order", []):
+            callback({"type": "Order", "data": order})
+
+
+class TestFillTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TastytradeOrder("st-abcabc123123", API_URL)
+        self.client.fill_tracker.poll_interval = 0.01
+        self.order = build_order(1.0, [LEG], order_type="Limit")
+
+    def attach(self):
+        streamer = FakeStreamer()
+        self.client.attach(streamer)
+        return streamer
+
+    @requests_mock.Mocker()
+    def test_streamer_fill_resolves_and_releases_handle(self, mock):
+        streamer = self.attach()
+        mock.post(ORDERS_URL, json={"data": {"order": order_object(1, "Routed")}})
+        handle = self.client.fill_tracker.submit("5WX01234", self.order)
+        self.assertIn("1", self.client.fill_tracker.handles)
+
+        streamer.send(order_object(1, "Filled", 1.05))
+
+        self.assertTrue(handle.done)
+        self.assertEqual(handle.net_fill_amount(), 1.05)
+        self.assertEqual(self.client.fill_tracker.handles, {})
+
+    @requests_mock.Mocker()
+    def test_early_event_is_applied_on_track(self, mock):
+        streamer = self.attach()
+        mock.post(ORDERS_URL, json={"data": {"order": order_object(2, "Routed")}})
+        streamer.send(order_object(2, "Filled", 0.95))
+
+        handle = self.client.fill_tracker.submit("5WX01234", self.order)
+
+        self.assertEqual(handle.status, "Filled")
+        self.assertEqual(self.client.fill_tracker.handles, {})
+
+    @requests_mock.Mocker()
+    def test_terminal_create_response_is_not_registered(self, mock):
+        self.attach()
+        mock.post(ORDERS_URL, json={"data": {"order": order_object(3, "Rejected")}})
+
+        handle = self.client.fill_tracker.submit("5WX01234", self.order)
+
+        self.assertTrue(handle.done)
+        self.assertEqual(self.client.fill_tracker.handles, {})
+
+    @requests_mock.Mocker()
+    def test_rest_fallback_releases_handle(self, mock):
+        self.attach()
+        mock.post(ORDERS_URL, json={"data": {"order": order_object(4, "Routed")}})
+        mock.get(f"{ORDERS_URL}/4", json={"data": order_object(4, "Cancelled")})
+        handle = self.client.fill_tracker.submit("5WX01234", self.order)
+
+        handle.wait(0.01)
+
+        self.assertEqual(handle.status, "Cancelled")
+        self.assertEqual(self.client.fill_tracker.handles, {})
+
+    @requests_mock.Mocker()
+    def test_polling_without_streamer_does_not_register_handles(self, mock):
+        mock.post(ORDERS_URL, json={"data": {"order": order_object(5, "Routed")}})
+        mock.get(f"{ORDERS_URL}/5", [{"json": {"data": order_object(5, "Live")}},
+                                     {"json": {"data": order_object(5, "Filled", 1.0)}}])
+        handle = self.client.fill_tracker.submit("5WX01234", self.order)
+        self.assertEqual(self.client.fill_tracker.handles, {})
+
+        handle.wait(1.0)
+
+        self.assertEqual(handle.status, "Filled")
+        self.assertEqual(mock.call_count, 3)
+
+    @requests_mock.Mocker()
+    def test_rejected_submit_raises(self, mock):
+        mock.post(ORDERS_URL, json={"error": {"code": "margin_check_failed"}})
+        with self.assertRaises(Exception):
+            self.client.fill_tracker.submit("5WX01234", self.order)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import unittest
+from tastytrade_api.account.greeks_engine import PortfolioGreeksEngine
+
+SHORT_CALLS = {
+    "symbol": "SPY   231020C00430000",
+    "underlying-symbol": "SPY",
+    "instrument-type": "Equity Option",
+    "quantity": 2,
+    "quantity-direction": "Short",
+    "multiplier": 100,
+    "average-open-price": "3.0",
+    "close-price": "2.5",
+}
+LONG_SHARES = {
+    "symbol": "SPY",
+    "underlying-symbol": "SPY",
+    "instrument-type": "Equity",
+    "quantity": 100,
+    "quantity-direction": "Long",
+    "multiplier": 1,
+    "average-open-price": "430.0",
+    "close-price": "431.0",
+}
+
+
+class TestPortfolioGreeksEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = PortfolioGreeksEngine()
+        self.engine.load_positions([SHORT_CALLS, LONG_SHARES])
+
+    def test_subscription_symbols(self):
+        self.assertEqual(self.engine.subscription_symbols(), [".SPY231020C430", "SPY"])
+
+    def test_ticks_update_totals(self):
+        self.engine.on_greeks(".SPY231020C430", 0.5, 0.01, -0.1, 0.2)
+        self.engine.on_quote(".SPY231020C430", 2.0, 2.2)
+        self.engine.on_quote("SPY", 432.0, 432.0)
+        totals = self.engine.get_totals()["SPY"]
+
+        with self.subTest("Check delta"):
+            self.assertAlmostEqual(totals["delta"], 0.0)
+        with self.subTest("Check theta"):
+            self.assertAlmostEqual(totals["theta"], 20.0)
+        with self.subTest("Check pnl"):
+            self.assertAlmostEqual(totals["pnl"], 180.0 + 200.0)
+        with self.subTest("Check day pnl"):
+            self.assertAlmostEqual(totals["day-pnl"], 80.0 + 100.0)
+
+    def test_repeated_ticks_replace_previous_values(self):
+        self.engine.on_greeks(".SPY231020C430", 0.5, 0.01, -0.1, 0.2)
+        self.engine.on_greeks(".SPY231020C430", 0.6, 0.01, -0.1, 0.2)
+        self.assertAlmostEqual(self.engine.get_totals()["SPY"]["delta"], 100.0 - 120.0)
+
+    def test_reload_keeps_marks_and_greeks(self):
+        self.engine.on_greeks(".SPY231020C430", 0.5, 0.01, -0.1, 0.2)
+        self.engine.load_positions([dict(SHORT_CALLS, quantity=1)])
+        self.assertAlmostEqual(self.engine.get_totals()["SPY"]["delta"], -50.0)
+
+    def test_handle_compact_data_message(self):
+        self.engine.handle_data(["Quote", [
+            ".SPY231020C430", 0, 0, 0, 0, "Q", 2.0, 1, 0, "Q", 2.2, 1,
+            "SPY", 0, 0, 0, 0, "Q", 432.0, 1, 0, "Q", 432.0, 1,
+        ]])
+        self.assertAlmostEqual(self.engine.get_totals()["SPY"]["pnl"], 380.0)
+
+    def test_future_options_need_a_streamer_symbol(self):
+        future_put = {
+            "symbol": "./ESZ3 EW4Z3 231229P4000",
+            "underlying-symbol": "/ESZ3",
+            "instrument-type": "Future Option",
+            "quantity": 1,
+            "quantity-direction": "Long",
+            "multiplier": 50,
+        }
+
+        class FakeInstruments:
+            def get_future_options(self, symbols):
+                return [{"symbol": symbols[0], "streamer-symbol": "./EW4Z23P4000:XCME"}]
+
+        self.engine.load_positions([SHORT_CALLS, future_put])
+        with self.subTest("Check unresolved"):
+            self.assertEqual(self.engine.unresolved, ["./ESZ3 EW4Z3 231229P4000"])
+            self.assertEqual(self.engine.subscription_symbols(), [".SPY231020C430"])
+
+        self.assertEqual(self.engine.resolve_streamer_symbols(FakeInstruments()), [])
+        self.engine.on_greeks("./EW4Z23P4000:XCME", -0.3, 0.01, -0.1, 0.2)
+        with self.subTest("Check resolved"):
+            self.assertIn("./EW4Z23P4000:XCME", self.engine.subscription_symbols())
+            self.assertAlmostEqual(self.engine.get_totals()["/ESZ3"]["delta"], -15.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import unittest
+from tastytrade_api.account.latency import OrderLatencyTracer
+
+
+class TestOrderLatencyTracer(unittest.TestCase):
+    def setUp(self):
+        self.tracer = OrderLatencyTracer()
+        self.order = {"order-type": "Limit", "legs": []}
+        self.tracer.on_build(self.order)
+        self.tracer.on_submit(self.order, self.tracer.now(), {"data": {"order": {"id": 1, "status": "Received"}}})
+
+    def test_submit_is_traced(self):
+        trace = self.tracer.get_trace(1)
+        with self.subTest("Check build time"):
+            self.assertGreaterEqual(trace.build_to_send, 0)
+        with self.subTest("Check submit to ack"):
+            self.assertGreaterEqual(trace.submit_to_ack, 0)
+        with self.subTest("Check no fill yet"):
+            self.assertIsNone(trace.ack_to_fill)
+
+    def test_edit_and_fill_follow_the_new_order_id(self):
+        self.tracer.on_edit(1, self.tracer.now(), {"data": {"id": 2, "status": "Live"}})
+        self.tracer.on_order_message({"data": {"id": 1, "status": "Cancelled", "replacing-order-id": 2, "legs": []}})
+        self.tracer.on_order_message({"data": {"id": 2, "status": "Filled", "legs": [{"fills": [{}]}]}})
+
+        trace = self.tracer.get_trace(1)
+        with self.subTest("Check aliases"):
+            self.assertIs(self.tracer.get_trace(2), trace)
+        with self.subTest("Check status"):
+            self.assertEqual(trace.status, "Filled")
+        with self.subTest("Check samples"):
+            self.assertEqual(len(self.tracer.samples("edit_to_ack")), 1)
+            self.assertEqual(len(self.tracer.samples("ack_to_fill")), 1)
+
+    def test_early_fill_event_is_applied_on_ack(self):
+        order = {"legs": []}
+        sent_at = self.tracer.now()
+        self.tracer.on_order_message({"data": {"id": 3, "status": "Filled", "legs": []}})
+        self.tracer.on_submit(order, sent_at, {"data": {"order": {"id": 3, "status": "Received"}}})
+        trace = self.tracer.get_trace(3)
+        self.assertEqual(trace.status, "Filled")
+        self.assertIsNotNone(trace.final_fill_at)
+        with self.subTest("Check ack to fill is clamped"):
+            self.assertTrue(trace.filled_before_ack)
+            self.assertEqual(trace.ack_to_fill, 0.0)
+            self.assertGreaterEqual(trace.submit_to_fill, 0.0)
+        with self.subTest("Check early fills are counted"):
+            self.assertEqual(self.tracer.histogram("ack_to_fill")[0].sum(), 1)
+            self.assertEqual(self.tracer.summary()["filled_before_ack"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
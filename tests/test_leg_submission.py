@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import threading
+import unittest
+import requests_mock
+from tastytrade_api.account.order import TastytradeOrder
+from tastytrade_api.account.order_builder import build_leg
+
+API_URL = "https://api.tastytrade.com"
+ORDERS_URL = f"{API_URL}/accounts/5WX01234/orders"
+FILLED = build_leg("Sell to Open", "SPY   231020C00420000", 1)
+REJECTED = build_leg("Sell to Open", "SPY   231020P00400000", 1)
+UNKNOWN = build_leg("Buy to Open", "SPY   231020P00390000", 1)
+ORDER_IDS = {FILLED["symbol"]: 1, UNKNOWN["symbol"]: 3}
+
+
+def create_response(request, context):
+    leg = dict(request.json()["legs"][0])
+    if leg["symbol"] == REJECTED["symbol"]:
+        return {"error": {"code": "margin_check_failed"}}
+    if leg["symbol"] == FILLED["symbol"]:
+        leg["fills"] = [{"fill-price": "2.5", "quantity": 1}]
+        return {"data": {"order": {"id": 1, "status": "Filled", "size": 1, "legs": [leg]}}}
+    leg["fills"] = []
+    return {"data": {"order": {"id": ORDER_IDS[leg["symbol"]], "status": "Routed", "size": 1, "legs": [leg]}}}
+
+
+class TestPlaceLegs(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TastytradeOrder("st-abcabc123123", API_URL)
+
+    @requests_mock.Mocker()
+    def test_results_per_leg(self, mock):
+        mock.post(ORDERS_URL, json=create_response)
+        mock.get(f"{ORDERS_URL}/3", status_code=500)
+
+        submission = self.client.place_legs("5WX01234", [(FILLED, "Credit", 1), (REJECTED, "Credit", 1),
+                                                         (UNKNOWN, "Debit", -1)], wait_timeout=0.01)
+        filled, rejected, unknown = submission.results
+
+        with self.subTest("Filled leg"):
+            self.assertEqual(filled.status, "Filled")
+            self.assertEqual(filled.fill_price, 2.5)
+        with self.subTest("Rejected leg has no order"):
+            self.assertEqual(rejected.status, "error")
+            self.assertIsNone(rejected.order_id)
+            self.assertIsNotNone(rejected.error)
+        with self.subTest("Failed wait keeps the live order"):
+            self.assertEqual(unknown.order_id, 3)
+            self.assertEqual(unknown.status, "Routed")
+            self.assertIsNone(unknown.error)
+            self.assertIsNotNone(unknown.wait_error)
+        self.assertEqual(submission.order_ids, [1, 3])
+        self.assertEqual(submission.working, [unknown])
+        self.assertEqual(submission.failed, [rejected, unknown])
+        self.assertEqual(submission.net_fill_price, 2.5)
+
+    def test_each_thread_gets_its_own_session(self):
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(self.client.session))
+        thread.start()
+        thread.join()
+
+        self.assertIs(self.client.session, self.client.session)
+        self.assertIsNot(sessions[0], self.client.session)
+
+
+if __name__ == '__main__':
+    unittest.main()
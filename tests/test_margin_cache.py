@@ -0,0 +1,114 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import itertools
+import threading
+import unittest
+from unittest.mock import patch
+import requests_mock
+from tastytrade_api.account import margin_cache
+from tastytrade_api.account.margin_cache import EffectiveMarginCache
+
+API_URL = "https://api.tastytrade.com"
+SPY_URL = f"{API_URL}/accounts/5WX01234/margin-requirements/SPY/effective"
+
+
+class TestEffectiveMarginCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = EffectiveMarginCache("st-abcabc123123", API_URL, ttl=5.0)
+        self.counter = itertools.count(1)
+
+    def requirement(self, request, context):
+        return {"data": {"underlying-symbol": "SPY", "margin-requirement": str(next(self.counter))}}
+
+    @requests_mock.Mocker()
+    def test_fresh_entries_are_cached(self, mock):
+        fetch = mock.get(SPY_URL, json=self.requirement)
+
+        first = self.cache.get("5WX01234", "SPY")
+        second = self.cache.get("5WX01234", "SPY")
+
+        self.assertEqual(first, second)
+        self.assertEqual(fetch.call_count, 1)
+
+    @requests_mock.Mocker()
+    def test_entries_expire(self, mock):
+        fetch = mock.get(SPY_URL, json=self.requirement)
+        with patch.object(margin_cache, "time") as clock:
+            clock.monotonic.return_value = 100.0
+            self.cache.get("5WX01234", "SPY")
+            clock.monotonic.return_value = 104.9
+            self.cache.get("5WX01234", "SPY")
+            self.assertEqual(fetch.call_count, 1)
+
+            clock.monotonic.return_value = 105.0
+            result = self.cache.get("5WX01234", "SPY")
+
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(result["data"]["margin-requirement"], "2")
+
+    @requests_mock.Mocker()
+    def test_invalidate_during_fetch_is_not_cached(self, mock):
+        def racing_requirement(request, context):
+            # A fill arrives while the request is in flight
+            self.cache.on_order_message({"data": {"account-number": "5WX01234", "status": "Filled"}})
+            return self.requirement(request, context)
+        fetch = mock.get(SPY_URL, json=racing_requirement)
+
+        stale = self.cache.get("5WX01234", "SPY")
+        mock.get(SPY_URL, json=self.requirement)
+        fresh = self.cache.get("5WX01234", "SPY")
+
+        self.assertEqual(stale["data"]["margin-requirement"], "1")
+        self.assertEqual(fresh["data"]["margin-requirement"], "2")
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(self.cache.get("5WX01234", "SPY"), fresh)
+
+        with self.subTest("Clear during fetch"):
+            self.cache.invalidate("5WX01234")
+
+            def clearing_requirement(request, context):
+                self.cache.clear()
+                return self.requirement(request, context)
+            mock.get(SPY_URL, json=clearing_requirement)
+            self.cache.get("5WX01234", "SPY")
+            self.assertEqual(self.cache._entries, {})
+
+    def test_concurrent_gets_of_the_same_key(self):
+        barrier = threading.Barrier(2, timeout=5)
+        calls = []
+
+        def get_effective_margin_requirements(account_number, underlying_symbol):
+            # Both requests are in flight before either returns
+            calls.append(underlying_symbol)
+            barrier.wait()
+            return {"data": {"underlying-symbol": underlying_symbol, "margin-requirement": "10"}}
+        self.cache.account.get_effective_margin_requirements = get_effective_margin_requirements
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.get("5WX01234", "SPY")))
+                   for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(list(self.cache._entries), [("5WX01234", "SPY")])
+        self.assertEqual(self.cache.get("5WX01234", "SPY"), results[0])
+        self.assertEqual(calls, ["SPY", "SPY"])
+
+    @requests_mock.Mocker()
+    def test_errors_are_not_cached(self, mock):
+        mock.get(SPY_URL, status_code=500)
+        with self.assertRaises(Exception):
+            self.cache.get("5WX01234", "SPY")
+        self.assertEqual(self.cache._entries, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
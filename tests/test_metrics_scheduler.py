@@ -0,0 +1,111 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import asyncio
+import unittest
+from tastytrade_api.market_data.metrics_scheduler import MarketMetricsScheduler
+
+
+class FakeMarketMetrics:
+    def __init__(self):
+        self.calls = []
+        self.values = {}
+
+    def get_metrics(self, symbols):
+        self.calls.append(list(symbols))
+        items = [{"symbol": s, "implied-volatility-index": self.values.get(s, "0.1")} for s in symbols]
+        return {"data": {"items": items}}
+
+
+class TestMarketMetricsScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = FakeMarketMetrics()
+        self.scheduler = MarketMetricsScheduler(self.metrics, batch_size=2)
+
+    def test_overlapping_symbols_are_merged_into_batches(self):
+        first, second = [], []
+        self.scheduler.subscribe(["SPY", "QQQ"], 10, first.append)
+        self.scheduler.subscribe(["QQQ", "IWM"], 10, second.append)
+
+        self.scheduler.tick(now=0)
+
+        with self.subTest("Check batches"):
+            self.assertEqual(self.metrics.calls, [["IWM", "QQQ"], ["SPY"]])
+        with self.subTest("Check deliveries"):
+            self.assertEqual(set(first[0]), {"SPY", "QQQ"})
+            self.assertEqual(set(second[0]), {"QQQ", "IWM"})
+
+    def test_only_changed_metrics_are_pushed(self):
+        received = []
+        self.scheduler.subscribe(["SPY", "QQQ"], 10, received.append)
+        self.scheduler.tick(now=0)
+
+        self.metrics.values["SPY"] = "0.2"
+        changes = self.scheduler.tick(now=10)
+
+        with self.subTest("Check changes"):
+            self.assertEqual(list(changes), ["SPY"])
+        with self.subTest("Check deliveries"):
+            self.assertEqual(len(received), 2)
+            self.assertEqual(list(received[1]), ["SPY"])
+
+    def test_late_subscription_receives_cached_metrics(self):
+        first, second = [], []
+        self.scheduler.subscribe(["SPY"], 10, first.append)
+        self.scheduler.tick(now=0)
+        self.scheduler.subscribe(["SPY"], 10, second.append)
+
+        self.scheduler.tick(now=1)
+        self.scheduler.tick(now=20)
+
+        with self.subTest("Check snapshot on first refresh"):
+            self.assertEqual(len(second), 1)
+            self.assertEqual(second[0]["SPY"]["implied-volatility-index"], "0.1")
+        with self.subTest("Check no duplicate for the existing subscription"):
+            self.assertEqual(len(first), 1)
+
+    def test_snapshot_is_delivered_once_after_a_failed_fetch(self):
+        first, second = [], []
+        self.scheduler.subscribe(["SPY"], 10, first.append)
+        self.scheduler.tick(now=0)
+        self.scheduler.subscribe(["SPY", "QQQ"], 10, second.append)
+
+        def failing_get_metrics(symbols):
+            raise Exception("timeout")
+        get_metrics, self.metrics.get_metrics = self.metrics.get_metrics, failing_get_metrics
+        self.scheduler.tick(now=1)
+        self.scheduler.tick(now=2)
+
+        with self.subTest("Cached snapshot delivered once"):
+            self.assertEqual([list(changes) for changes in second], [["SPY"]])
+
+        self.metrics.get_metrics = get_metrics
+        self.scheduler.tick(now=3)
+        with self.subTest("Missing symbol arrives as a change"):
+            self.assertEqual([list(changes) for changes in second], [["SPY"], ["QQQ"]])
+
+    def test_subscriptions_are_not_refreshed_before_due(self):
+        self.scheduler.subscribe(["SPY"], 10)
+        self.scheduler.tick(now=0)
+        self.scheduler.tick(now=5)
+
+        self.assertEqual(len(self.metrics.calls), 1)
+
+    def test_async_iteration(self):
+        subscription = self.scheduler.subscribe(["SPY"], 10)
+
+        async def consume():
+            iterator = subscription.__aiter__()
+            self.scheduler.tick(now=0)
+            self.scheduler.unsubscribe(subscription)
+            return [changes async for changes in iterator]
+
+        received = asyncio.run(consume())
+        self.assertEqual([list(changes) for changes in received], [["SPY"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
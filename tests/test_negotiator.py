@@ -0,0 +1,119 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import asyncio
+import unittest
+from tastytrade_api.account.negotiator import Negotiation, OrderNegotiator, QuoteAwarePricer
+from tastytrade_api.streamer.quote_book import QuoteBook
+from tastytrade_api.symbology import to_streamer_symbol
+
+ORDER = {
+    "time-in-force": "Day",
+    "order-type": "Limit",
+    "price": "1.00",
+    "price-effect": "Credit",
+    "legs": [{"instrument-type": "Equity Option", "symbol": "SPY   231020P00400000", "quantity": 1,
+              "action": "Sell to Open"}],
+}
+
+
+class FakeOrderClient:
+    def __init__(self, fail=False):
+        self.edits = []
+        self.fail = fail
+
+    def edit_order(self, account_number, order_id, order_data):
+        if self.fail:
+            raise Exception("Error editing order: 422")
+        self.edits.append((order_id, order_data["price"]))
+        return {"data": {"id": order_id + 1, "status": "Live"}}
+
+
+class TestOrderNegotiator(unittest.TestCase):
+
+    def setUp(self):
+        self.client = FakeOrderClient()
+        self.negotiator = OrderNegotiator(self.client)
+
+    def tearDown(self):
+        self.negotiator.close()
+
+    def test_steps_until_max_steps(self):
+        negotiation = asyncio.run(self.negotiator.negotiate("5WX01234", 1, ORDER, 0.05, 0.01, 3))
+
+        self.assertEqual(negotiation.status, "max-steps")
+        self.assertEqual(self.client.edits, [(1, "0.95"), (2, "0.9"), (3, "0.85")])
+        self.assertEqual(negotiation.order_id, 4)
+
+    def test_limit_price_stops_stepping(self):
+        negotiation = asyncio.run(self.negotiator.negotiate("5WX01234", 1, ORDER, 0.05, 0.01, 10, limit_price=0.9))
+
+        self.assertEqual(negotiation.status, "limit-reached")
+        self.assertEqual(negotiation.price, 0.9)
+
+    def test_fill_from_streamer_stops_without_further_edits(self):
+        async def run():
+            task = asyncio.ensure_future(self.negotiator.negotiate("5WX01234", 1, ORDER, 0.05, 0.05, 10))
+            await asyncio.sleep(0.07)
+            order_id = next(iter(self.negotiator.negotiations))
+            self.negotiator.on_order_message({"type": "Order", "data": {"id": order_id, "status": "Filled"}})
+            return await task
+
+        negotiation = asyncio.run(run())
+        self.assertEqual(negotiation.status, "filled")
+        self.assertEqual(len(self.client.edits), 1)
+
+    def test_edit_error_stops_negotiation(self):
+        negotiator = OrderNegotiator(FakeOrderClient(fail=True))
+        with negotiator:
+            negotiation = asyncio.run(negotiator.run(Negotiation("5WX01234", 1, ORDER, 0.05, 0.01, 3)))
+
+        self.assertEqual(negotiation.status, "error")
+        self.assertIn("422", str(negotiation.error))
+
+
+    def test_fixed_step_never_goes_below_one_tick(self):
+        order = dict(ORDER, price="0.08")
+        negotiation = asyncio.run(self.negotiator.negotiate("5WX01234", 1, order, 0.05, 0.01, 10))
+
+        self.assertEqual(negotiation.status, "limit-reached")
+        self.assertEqual([price for _, price in self.client.edits], ["0.03", "0.01"])
+
+
+class TestQuoteAwarePricer(unittest.TestCase):
+    SYMBOL = ORDER["legs"][0]["symbol"]
+
+    def setUp(self):
+        self.quote_book = QuoteBook()
+        self.pricer = QuoteAwarePricer(self.quote_book)
+
+    def negotiation(self, price, max_steps=4):
+        return Negotiation("5WX01234", 1, dict(ORDER, price=price), 0.05, 0.01, max_steps)
+
+    def test_jumps_to_mid_then_steps_to_natural(self):
+        self.quote_book.on_quote(to_streamer_symbol(self.SYMBOL), 0.80, 0.90)
+        negotiation = self.negotiation("1.00")
+
+        self.assertAlmostEqual(self.pricer(negotiation), 0.85)
+        negotiation.order_data["price"] = "0.85"
+        self.assertAlmostEqual(self.pricer(negotiation), 0.8375)
+
+    def test_natural_past_zero_never_prices_below_one_tick(self):
+        # Selling to open at a bid of 0 with the order already at the market
+        self.quote_book.on_quote(to_streamer_symbol(self.SYMBOL), 0.0, 0.05)
+        negotiator = OrderNegotiator(FakeOrderClient(), pricer=self.pricer)
+        with negotiator:
+            negotiation = asyncio.run(negotiator.run(self.negotiation("0.02", max_steps=10)))
+
+        self.assertEqual(negotiation.status, "limit-reached")
+        self.assertEqual(negotiation.price, 0.01)
+        self.assertEqual([price for _, price in negotiator.order_client.edits], ["0.01"])
+
+    def test_without_quotes_uses_fallback(self):
+        self.assertAlmostEqual(self.pricer(self.negotiation("1.00")), 0.95)
+
+
+if __name__ == '__main__':
+    unittest.main()
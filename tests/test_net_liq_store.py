@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import os
+import tempfile
+import unittest
+import requests_mock
+from tastytrade_api.account.net_liq_store import NET_LIQ_FIELDS, NetLiqHistoryStore, parse_net_liq_time
+
+
+def item(time, value):
+    return dict({field: str(value) for field in NET_LIQ_FIELDS}, time=time)
+
+
+class TestNetLiqHistoryStore(unittest.TestCase):
+    API_URL = "https://api.tastytrade.com"
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "net_liq.npz")
+        self.store = NetLiqHistoryStore("st-abcabc123123", self.API_URL, "5WX01234", self.path)
+        self.history_url = f"{self.API_URL}/accounts/5WX01234/net-liq/history"
+
+    def test_parse_net_liq_time(self):
+        self.assertEqual(parse_net_liq_time("2023-05-12 13:30:00+00"), 1683898200)
+        self.assertEqual(parse_net_liq_time("2023-05-12T13:30:00Z"), 1683898200)
+
+    @requests_mock.Mocker()
+    def test_first_refresh_without_enough_points_stores_nothing(self, mock):
+        for items in ([], [item("2023-05-12 13:30:00+00", 100)]):
+            with self.subTest(points=len(items)):
+                mock.get(f"{self.history_url}?time-back=1d", json={"data": {"items": items}})
+                self.assertEqual(self.store.refresh("1d"), 0)
+                self.assertEqual(self.store.intervals, [])
+                self.assertFalse(os.path.exists(self.path))
+
+        with self.subTest("Explicit interval"):
+            self.assertEqual(self.store.refresh("1d", interval=300), 1)
+            self.assertEqual(self.store.intervals, [300])
+
+    @requests_mock.Mocker()
+    def test_incremental_points_are_aggregated_per_granularity(self, mock):
+        mock.get(f"{self.history_url}?time-back=1d", json={"data": {"items": [
+            item("2023-05-12 13:30:00+00", 100), item("2023-05-12 13:35:00+00", 101),
+            item("2023-05-12 13:40:00+00", 102),
+        ]}})
+        self.store.refresh("1d")
+        mock.get(f"{self.history_url}?time-back=1y", json={"data": {"items": [
+            item("2023-05-11 00:00:00+00", 90), item("2023-05-12 00:00:00+00", 95),
+        ]}})
+        self.store.refresh("1y", interval=86400)
+        self.assertEqual(self.store.intervals, [300, 86400])
+
+        mock.get(f"{self.history_url}?start-time=2023-05-12T00:00:00Z", json={"data": {"items": [
+            item("2023-05-12 13:41:00+00", 99), item("2023-05-12 13:44:00+00", 105),
+            item("2023-05-12 13:46:00+00", 103),
+        ]}})
+        self.store.refresh()
+
+        with self.subTest("Check fine series"):
+            bars = self.store.get_range(interval=300)
+            self.assertEqual(list(bars["time"] - bars["time"][0]), [0, 300, 600, 900])
+            self.assertEqual(list(bars["open"][2:]), [102.0, 103.0])
+            self.assertEqual(bars["high"][2], 105.0)
+            self.assertEqual(bars["low"][2], 99.0)
+        with self.subTest("Check daily series"):
+            bars = self.store.get_range(interval=86400)
+            self.assertEqual(len(bars["time"]), 2)
+            self.assertEqual(bars["open"][1], 95.0)
+            self.assertEqual(bars["close"][1], 103.0)
+        with self.subTest("Check persistence"):
+            loaded = NetLiqHistoryStore("st-abcabc123123", self.API_URL, "5WX01234", self.path)
+            self.assertEqual(loaded.intervals, [300, 86400])
+            self.assertEqual(len(loaded), len(self.store))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import unittest
+import requests_mock
+from tastytrade_api.account.order_archive import OrderHistoryArchive
+
+API_URL = "https://api.tastytrade.com"
+ORDERS_URL = f"{API_URL}/accounts/5WX01234/orders"
+
+
+def order(order_id, status, received_at, updated_at=None, fill_price=None):
+    leg = {"symbol": "SPY", "instrument-type": "Equity", "action": "Buy to Open", "quantity": "1", "fills": []}
+    if fill_price is not None:
+        leg["fills"] = [{"quantity": "1", "fill-price": str(fill_price), "filled-at": updated_at}]
+    return {"id": order_id, "account-number": "5WX01234", "underlying-symbol": "SPY", "status": status,
+            "order-type": "Limit", "received-at": received_at, "updated-at": updated_at or received_at,
+            "size": "1", "legs": [leg]}
+
+
+class TestOrderHistoryArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.archive = OrderHistoryArchive("st-abcabc123123", API_URL, per_page=2)
+
+    def tearDown(self):
+        self.archive.close()
+
+    @requests_mock.Mocker()
+    def test_first_sync_downloads_every_page(self, mock):
+        mock.get(ORDERS_URL, [
+            {"json": {"data": {"items": [order(1, "Filled", "2023-10-02T14:00:00.000+00:00", fill_price=1.0),
+                                         order(2, "Live", "2023-10-03T14:00:00.000+00:00")]},
+                      "pagination": {"total-pages": 2}}},
+            {"json": {"data": {"items": [order(3, "Cancelled", "2023-10-04T14:00:00.000+00:00")]}}},
+        ])
+
+        self.assertEqual(self.archive.sync("5WX01234", "2023-10-01"), 3)
+
+        self.assertEqual(mock.request_history[0].qs["start-at"], ["2023-10-01t00:00:00z"])
+        self.assertEqual([o["id"] for o in self.archive.get_orders("5WX01234")], [1, 2, 3])
+        self.assertEqual(len(self.archive.get_fills(symbol="SPY")), 1)
+
+    @requests_mock.Mocker()
+    def test_incremental_sync_refetches_working_orders(self, mock):
+        self.archive.store([order(1, "Filled", "2023-10-02T14:00:00.000+00:00"),
+                            order(2, "Live", "2023-10-03T14:00:00.000+00:00"),
+                            order(3, "Live", "2023-10-01T14:00:00.000+00:00", "2023-10-05T14:00:00.000+00:00")])
+        pages = mock.get(ORDERS_URL, json={"data": {"items": [
+            order(4, "Routed", "2023-10-06T14:00:00.000+00:00")
+        ]}})
+        # Received before the newest archived order but filled afterwards, so no page includes it
+        mock.get(f"{ORDERS_URL}/2", json={"data": order(2, "Filled", "2023-10-03T14:00:00.000+00:00",
+                                                        "2023-10-07T14:00:00.000+00:00", 1.5)})
+        mock.get(f"{ORDERS_URL}/3", json={"data": order(3, "Live", "2023-10-01T14:00:00.000+00:00",
+                                                        "2023-10-05T14:00:00.000+00:00")})
+
+        self.assertEqual(self.archive.sync("5WX01234"), 3)
+
+        with self.subTest("Check window starts at the newest received order"):
+            self.assertEqual(pages.last_request.qs["start-at"], ["2023-10-03t14:00:00.000+00:00"])
+        with self.subTest("Check working order updated"):
+            self.assertEqual(self.archive.get_orders(status="Filled")[1]["id"], 2)
+            self.assertEqual(self.archive.get_fills()[0]["fill_price"], 1.5)
+        with self.subTest("Check new order archived"):
+            self.assertEqual(self.archive.working_order_ids("5WX01234"), [3, 4])
+
+    @requests_mock.Mocker()
+    def test_failed_request_archives_nothing(self, mock):
+        self.archive.store([order(2, "Live", "2023-10-03T14:00:00.000+00:00")])
+        mock.get(ORDERS_URL, json={"data": {"items": [order(4, "Routed", "2023-10-06T14:00:00.000+00:00")]}})
+        mock.get(f"{ORDERS_URL}/2", status_code=500)
+
+        with self.assertRaises(Exception):
+            self.archive.sync("5WX01234")
+        self.assertEqual([o["id"] for o in self.archive.get_orders()], [2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import datetime
+import unittest
+from tastytrade_api.account.order import TastytradeOrder
+
+EXP = datetime.date(2023, 10, 20)
+
+
+def leg(action, symbol, quantity=1):
+    return {"action": action, "symbol": symbol, "quantity": quantity, "instrument-type": "Equity Option"}
+
+
+SC = "SPXW  231020C04400000"
+LC = "SPXW  231020C04420000"
+SP = "SPXW  231020P04200000"
+LP = "SPXW  231020P04180000"
+
+
+def limit_order(price, price_effect, legs):
+    return {"time-in-force": "Day", "order-type": "Limit", "price": price, "price-effect": price_effect,
+            "legs": legs}
+
+
+class TestOrderBuilders(unittest.TestCase):
+    """Pins the wire format of the order builders of TastytradeOrder."""
+
+    def setUp(self):
+        self.client = TastytradeOrder("st-abcabc123123")
+
+    def test_build1leg(self):
+        self.assertEqual(self.client.build1leg("Sell to Open", "SPY", "P", 400.5, EXP, 2),
+                         leg("Sell to Open", "SPY   231020P00400500", 2))
+        self.assertEqual(self.client.build1leg("Buy to Open", "SPY", "C", 420, EXP, instrument_type="Future Option"),
+                         {"action": "Buy to Open", "symbol": "SPY   231020C00420000", "quantity": 1,
+                          "instrument-type": "Future Option"})
+
+    def test_build1leg_defaults_to_todays_expiry(self):
+        today = datetime.date.today().strftime("%y%m%d")
+        self.assertEqual(self.client.build1leg("Sell to Open", "SPXW", "C", 4400),
+                         leg("Sell to Open", f"SPXW  {today}C04400000"))
+
+    def test_build_Any_Trade(self):
+        with self.subTest("Iron condor for a credit"):
+            self.assertEqual(
+                self.client.build_Any_Trade(4400, 4420, 4200, 4180, EXP, 1.5, "Credit"),
+                limit_order(1.5, "Credit", [leg("Sell to Open", SC), leg("Buy to Open", LC),
+                                            leg("Sell to Open", SP), leg("Buy to Open", LP)]))
+        with self.subTest("Iron condor for a debit"):
+            self.assertEqual(
+                self.client.build_Any_Trade(4400, 4420, 4200, 4180, EXP, 1.5, "Debit"),
+                limit_order(1.5, "Debit", [leg("Buy to Open", SC), leg("Sell to Open", LC),
+                                           leg("Buy to Open", SP), leg("Sell to Open", LP)]))
+        with self.subTest("Strangle"):
+            self.assertEqual(self.client.build_Any_Trade(4400, 0, 4200, 0, EXP, 2.0, "Credit"),
+                             limit_order(2.0, "Credit", [leg("Sell to Open", SC), leg("Sell to Open", SP)]))
+        with self.subTest("Put vertical"):
+            self.assertEqual(self.client.build_Any_Trade(0, 0, 4200, 4180, EXP, 0.8, "Credit"),
+                             limit_order(0.8, "Credit", [leg("Sell to Open", SP), leg("Buy to Open", LP)]))
+        with self.subTest("Single put"):
+            self.assertEqual(self.client.build_Any_Trade(0, 0, 4200, 0, EXP, 0.8, "Credit"),
+                             limit_order(0.8, "Credit", [leg("Sell to Open", SP)]))
+        with self.subTest("Call vertical"):
+            self.assertEqual(self.client.build_Any_Trade(4400, 4420, 0, 0, EXP, 0.8, "Credit"),
+                             limit_order(0.8, "Credit", [leg("Sell to Open", SC), leg("Buy to Open", LC)]))
+        with self.subTest("Single call"):
+            self.assertEqual(self.client.build_Any_Trade(4400, 0, 0, 0, EXP, 0.8, "Credit"),
+                             limit_order(0.8, "Credit", [leg("Sell to Open", SC)]))
+        with self.subTest("Market order has no price"):
+            self.assertEqual(
+                self.client.build_Any_Trade(0, 0, 4200, 4180, EXP, 0.8, "Debit", "SPXW", "Market"),
+                {"time-in-force": "Day", "order-type": "Market",
+                 "legs": [leg("Buy to Open", SP), leg("Sell to Open", LP)]})
+
+    def test_build_Cr_IF(self):
+        self.assertEqual(self.client.build_Cr_IF(4400, 4420, 4200, 4180, EXP, 1.5),
+                         limit_order(1.5, "Credit", [leg("Sell to Open", SC), leg("Buy to Open", LC),
+                                                     leg("Sell to Open", SP), leg("Buy to Open", LP)]))
+        self.assertEqual(self.client.build_Cr_IF(4400, 4420, 4200, 4180, EXP, 1.5, No_Wings=True),
+                         limit_order(1.5, "Credit", [leg("Sell to Open", SC), leg("Sell to Open", SP)]))
+
+    def test_build_Db_IF(self):
+        self.assertEqual(self.client.build_Db_IF(4400, 4420, 4200, 4180, EXP, 1.5),
+                         limit_order(1.5, "Debit", [leg("Buy to Open", SC), leg("Sell to Open", LC),
+                                                    leg("Buy to Open", SP), leg("Sell to Open", LP)]))
+        self.assertEqual(self.client.build_Db_IF(4400, 4420, 4200, 4180, EXP, 1.5, No_Wings=True),
+                         limit_order(1.5, "Debit", [leg("Buy to Open", SC), leg("Buy to Open", SP)]))
+
+    def test_build_Cr_IF_Shorts(self):
+        self.assertEqual(self.client.build_Cr_IF_Shorts(4400, 4200, EXP, 2.0),
+                         limit_order(2.0, "Credit", [leg("Sell to Open", SC), leg("Sell to Open", SP)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
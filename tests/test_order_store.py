@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import unittest
+import requests_mock
+from tastytrade_api.account.order_store import LiveOrderStore
+
+
+def order(order_id, status, underlying="SPY", symbol="SPY", updated_at="2023-10-19T14:00:00.000+00:00"):
+    return {
+        "id": order_id,
+        "account-number": "5WX01234",
+        "status": status,
+        "underlying-symbol": underlying,
+        "updated-at": updated_at,
+        "legs": [{"symbol": symbol, "action": "Buy to Open", "quantity": 1}],
+    }
+
+
+class TestLiveOrderStore(unittest.TestCase):
+    API_URL = "https://api.tastytrade.com"
+    LIVE_URL = f"{API_URL}/accounts/5WX01234/orders/live"
+
+    @requests_mock.Mocker()
+    def setUp(self, mock):
+        mock.get(self.LIVE_URL, json={"data": {"items": [
+            order(1, "Live"), order(2, "Filled"), order(3, "Live", "QQQ", "QQQ   231020P00350000"),
+        ]}})
+        self.store = LiveOrderStore("st-abcabc123123", self.API_URL, ["5WX01234"])
+        self.store.resync()
+
+    def test_snapshot_is_indexed(self):
+        with self.subTest("Check underlying index"):
+            self.assertEqual([o["id"] for o in self.store.get_orders(underlying_symbol="SPY")], [1, 2])
+        with self.subTest("Check leg symbol index"):
+            self.assertEqual([o["id"] for o in self.store.get_orders(symbol="QQQ   231020P00350000")], [3])
+        with self.subTest("Check working only"):
+            self.assertEqual([o["id"] for o in self.store.get_orders(working_only=True)], [1, 3])
+        with self.subTest("Check status"):
+            self.assertEqual(self.store.get_status(2), "Filled")
+
+    def test_order_messages_are_applied(self):
+        changes = []
+        self.store.add_listener(lambda kind, key, data: changes.append((kind, key)))
+
+        self.store.on_order_message({"type": "Order", "data": order(1, "Filled",
+                                                                     updated_at="2023-10-19T15:00:00.000+00:00")})
+        self.store.on_order_message({"type": "Order", "data": order(3, "Cancelled", "QQQ",
+                                                                     updated_at="2023-10-19T13:00:00.000+00:00")})
+        self.store.on_order_message({"type": "Order", "data": dict(order(4, "Live"), **{"account-number": "X"})})
+
+        with self.subTest("Check update"):
+            self.assertEqual(self.store.get_status(1), "Filled")
+        with self.subTest("Check older message ignored"):
+            self.assertEqual(self.store.get_status(3), "Live")
+        with self.subTest("Check other account ignored"):
+            self.assertIsNone(self.store.get_order(4))
+        self.assertEqual(changes, [("order", "1")])
+
+    @requests_mock.Mocker()
+    def test_messages_during_resync_are_replayed(self, mock):
+        def snapshot(request, context):
+            # An order placed while the snapshot is in flight
+            self.store.on_order_message({"type": "Order", "data": order(6, "Routed")})
+            return {"data": {"items": [order(5, "Live")]}}
+
+        mock.get(self.LIVE_URL, json=snapshot)
+
+        self.store.on_connection_state("close")
+        with self.subTest("Check stale"):
+            self.assertTrue(self.store.stale)
+
+        self.store.on_connection_state("open")
+        self.assertTrue(self.store.wait_synced(5))
+        self.assertEqual([o["id"] for o in self.store.get_orders()], [5, 6])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import unittest
+import numpy as np
+from tastytrade_api.streamer.pairs_engine import PairsSpreadEngine, pairs_from_watchlists
+
+
+class TestPairsSpreadEngine(unittest.TestCase):
+    def setUp(self):
+        response = {"data": {"items": [{"name": "Indexes", "pairs-equations": [
+            {"left-action": "BUY", "left-symbol": "SPY", "left-quantity": 1,
+             "right-action": "SELL", "right-symbol": "QQQ", "right-quantity": 2},
+            {"left-action": "BUY", "left-symbol": "IWM", "left-quantity": 1,
+             "right-action": "SELL", "right-symbol": "SPY", "right-quantity": 1},
+        ]}]}}
+        self.pairs = pairs_from_watchlists(response)
+        self.engine = PairsSpreadEngine(self.pairs, window=10, min_periods=3)
+
+    def test_pairs_from_watchlists(self):
+        self.assertEqual(self.pairs[0]["left-ratio"], 1.0)
+        self.assertEqual(self.pairs[0]["right-ratio"], -2.0)
+        self.assertEqual(self.engine.symbols, ["SPY", "IWM", "QQQ"])
+
+    def test_rolling_zscore_matches_reference(self):
+        rng = np.random.default_rng(0)
+        spreads = []
+        for _ in range(25):
+            for symbol in self.engine.symbols:
+                mid = rng.normal(100, 1)
+                self.engine.on_quote(symbol, mid - 0.05, mid + 0.05)
+            zscore = self.engine.tick()
+            spreads.append(self.engine.spread.copy())
+
+        window = np.array(spreads)[-10:]
+        expected = (window[-1] - window.mean(axis=0)) / window.std(axis=0)
+        np.testing.assert_allclose(zscore, expected)
+
+    def test_zscore_waits_for_min_periods(self):
+        self.engine.on_quote("SPY", 400.0, 400.2)
+        self.assertIsNone(self.engine.handle_data(["Quote", ["AAPL", 0, 0, 0, 0, "Q", 1.0, 1, 0, "Q", 1.1, 1]]))
+        zscore = self.engine.handle_data(["Quote", ["QQQ", 0, 0, 0, 0, "Q", 350.0, 1, 0, "Q", 350.2, 1]])
+        self.assertAlmostEqual(self.engine.spread[0], 400.1 - 2 * 350.1)
+        self.assertTrue(np.all(np.isnan(zscore)))
+
+    def test_handle_data_samples_quoted_pairs_only(self):
+        for symbol, mid in (("SPY", 400.0), ("QQQ", 350.0), ("IWM", 180.0)):
+            self.engine.on_quote(symbol, mid - 0.05, mid + 0.05)
+        self.engine.tick()
+        self.assertEqual(self.engine._count.tolist(), [1.0, 1.0])
+
+        for bid in (180.0, 181.0, 182.0):
+            self.engine.handle_data(["Quote", ["IWM", 0, 0, 0, 0, "Q", bid, 1, 0, "Q", bid + 0.1, 1]])
+
+        self.assertEqual(self.engine._count.tolist(), [1.0, 4.0])
+        self.assertAlmostEqual(self.engine.spread[0], 400.0 - 2 * 350.0)
+        self.assertAlmostEqual(self.engine.spread[1], 182.05 - 400.0)
+
+        with self.subTest("A shared leg samples both pairs"):
+            self.engine.handle_data(["Quote", ["SPY", 0, 0, 0, 0, "Q", 401.0, 1, 0, "Q", 401.1, 1]])
+            self.assertEqual(self.engine._count.tolist(), [2.0, 5.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
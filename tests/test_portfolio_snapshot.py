@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import unittest
+from unittest.mock import patch
+import requests_mock
+from tastytrade_api.account import portfolio_snapshot
+from tastytrade_api.account.portfolio_snapshot import TastytradePortfolioSnapshot
+
+API_URL = "https://api.tastytrade.com"
+ACCOUNTS = ["5WX01234", "5WX05678", "5WX09999"]
+
+
+def mock_account(mock, account_number, position_limit_status=200):
+    mock.get(f"{API_URL}/accounts/{account_number}/balances",
+             json={"data": {"account-number": account_number, "net-liquidating-value": "1000.0"}})
+    mock.get(f"{API_URL}/accounts/{account_number}/positions",
+             json={"data": {"items": [{"account-number": account_number, "symbol": "SPY"}]}})
+    mock.get(f"{API_URL}/margin/accounts/{account_number}/requirements",
+             json={"data": {"account-number": account_number, "margin-requirement": "50.0"}})
+    mock.get(f"{API_URL}/accounts/{account_number}/position-limit", status_code=position_limit_status,
+             json={"data": {"positionLimit": 10}})
+
+
+class TestPortfolioSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.snapshot = TastytradePortfolioSnapshot("st-abcabc123123", API_URL)
+
+    @requests_mock.Mocker()
+    def test_every_part_of_every_account(self, mock):
+        for account_number in ACCOUNTS:
+            mock_account(mock, account_number)
+
+        with patch.object(portfolio_snapshot, "fan_out", wraps=portfolio_snapshot.fan_out) as fan_out:
+            snapshots = self.snapshot.get_snapshots(ACCOUNTS)
+
+        self.assertEqual(fan_out.call_args[0][1], 4 * len(ACCOUNTS))
+        self.assertEqual(list(snapshots), ACCOUNTS)
+        for account_number, snapshot in snapshots.items():
+            with self.subTest(account_number=account_number):
+                self.assertTrue(snapshot.complete)
+                self.assertEqual(snapshot.balances["account-number"], account_number)
+                self.assertEqual(snapshot.positions[0]["account-number"], account_number)
+                self.assertEqual(snapshot.margin_requirements["account-number"], account_number)
+                self.assertEqual(snapshot.position_limit, 10)
+                self.assertLessEqual(snapshot.requested_at, snapshot.received_at)
+
+    @requests_mock.Mocker()
+    def test_failed_requests_are_reported_per_part(self, mock):
+        mock_account(mock, "5WX01234")
+        mock_account(mock, "5WX05678", position_limit_status=500)
+
+        snapshots = self.snapshot.get_snapshots(["5WX01234", "5WX05678"])
+
+        self.assertTrue(snapshots["5WX01234"].complete)
+        failed = snapshots["5WX05678"]
+        self.assertFalse(failed.complete)
+        self.assertEqual(list(failed.errors), ["position_limit"])
+        self.assertIsNone(failed.position_limit)
+        self.assertEqual(failed.balances["account-number"], "5WX05678")
+
+    @requests_mock.Mocker()
+    def test_accounts_default_to_the_customer(self, mock):
+        mock.get(f"{API_URL}/customers/me/accounts",
+                 json={"data": {"items": [{"account": {"account-number": "5WX01234"}}]}})
+        mock_account(mock, "5WX01234")
+
+        snapshots = self.snapshot.get_snapshots()
+
+        self.assertEqual(list(snapshots), ["5WX01234"])
+        self.assertTrue(snapshots["5WX01234"].complete)
+
+
+if __name__ == '__main__':
+    unittest.main()
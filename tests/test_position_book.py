@@ -0,0 +1,158 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import json
+import unittest
+import requests_mock
+from tastytrade_api.account.position_book import TastytradePositionBook
+from tastytrade_api.account.streamed_state import StreamedAccountState
+from tastytrade_api.streamer.streamer import TastytradeStreamer
+
+
+def position(symbol, underlying, quantity, direction="Long", updated_at="2023-10-19T14:00:00.000+00:00"):
+    return {
+        "account-number": "5WX01234",
+        "symbol": symbol,
+        "underlying-symbol": underlying,
+        "quantity": quantity,
+        "quantity-direction": direction,
+        "updated-at": updated_at,
+    }
+
+
+class TestTastytradePositionBook(unittest.TestCase):
+    API_URL = "https://api.tastytrade.com"
+
+    @requests_mock.Mocker()
+    def setUp(self, mock):
+        mock.get(f"{self.API_URL}/accounts/5WX01234/positions", json={
+            "data": {"items": [position("SPY", "SPY", 100), position("QQQ", "QQQ", 10, "Short")]}
+        })
+        mock.get(f"{self.API_URL}/accounts/5WX01234/balances", json={"data": {"cash-balance": "1000.0"}})
+        self.book = TastytradePositionBook("st-abcabc123123", self.API_URL, ["5WX01234"])
+        self.book.resync()
+
+    def test_snapshot_is_indexed(self):
+        with self.subTest("Check account index"):
+            self.assertEqual(len(self.book.get_positions("5WX01234")), 2)
+        with self.subTest("Check underlying index"):
+            self.assertEqual(self.book.get_positions(underlying_symbol="QQQ")[0]["symbol"], "QQQ")
+        with self.subTest("Check balances"):
+            self.assertEqual(self.book.get_balances("5WX01234")["cash-balance"], "1000.0")
+
+    def test_position_deltas_are_applied(self):
+        self.book.on_position_message({
+            "type": "CurrentPosition",
+            "data": position("SPY", "SPY", 200, updated_at="2023-10-19T15:00:00.000+00:00"),
+        })
+        self.book.on_position_message({
+            "type": "CurrentPosition",
+            "data": position("QQQ", "QQQ", 0, "Zero", updated_at="2023-10-19T15:00:00.000+00:00"),
+        })
+
+        with self.subTest("Check update"):
+            self.assertEqual(self.book.get_position("5WX01234", "SPY")["quantity"], 200)
+        with self.subTest("Check close"):
+            self.assertEqual(self.book.get_positions(underlying_symbol="QQQ"), [])
+
+    def test_older_deltas_are_ignored(self):
+        self.book.on_position_message({
+            "type": "CurrentPosition",
+            "data": position("SPY", "SPY", 5, updated_at="2023-10-19T13:00:00.000+00:00"),
+        })
+        self.assertEqual(self.book.get_position("5WX01234", "SPY")["quantity"], 100)
+
+    @requests_mock.Mocker()
+    def test_resync_after_reconnect(self, mock):
+        mock.get(f"{self.API_URL}/accounts/5WX01234/positions", json={"data": {"items": [position("IWM", "IWM", 1)]}})
+        mock.get(f"{self.API_URL}/accounts/5WX01234/balances", json={"data": {}})
+
+        self.book.on_connection_state("close")
+        with self.subTest("Check stale"):
+            self.assertTrue(self.book.stale)
+
+        self.book.on_connection_state("open")
+        with self.subTest("Check resynced"):
+            self.assertTrue(self.book.wait_synced(5))
+            self.assertFalse(self.book.stale)
+            self.assertEqual([p["symbol"] for p in self.book.get_positions()], ["IWM"])
+
+    def test_messages_during_resync_are_replayed(self):
+        class ReplayingBook(TastytradePositionBook):
+            def _fetch(self):
+                # A message that arrives while the snapshot is in flight
+                self.on_position_message({
+                    "type": "CurrentPosition",
+                    "data": position("SPY", "SPY", 300, updated_at="2023-10-19T16:00:00.000+00:00"),
+                })
+                return {("5WX01234", "positions"): [position("SPY", "SPY", 100)], ("5WX01234", "balances"): {}}
+
+        book = ReplayingBook("st-abcabc123123", self.API_URL, ["5WX01234"])
+        events = []
+        book.add_listener(lambda kind, key, data: events.append(kind))
+        book.resync()
+
+        self.assertEqual(book.get_position("5WX01234", "SPY")["quantity"], 300)
+        self.assertEqual(events, ["resync", "position"])
+
+    def test_older_buffered_messages_are_dropped(self):
+        class ReplayingBook(TastytradePositionBook):
+            def _fetch(self):
+                # Messages sent before the snapshot was taken, but received while it was in flight
+                self.on_position_message({
+                    "type": "CurrentPosition",
+                    "data": position("SPY", "SPY", 50, updated_at="2023-10-19T13:00:00.000+00:00"),
+                })
+                self.on_balance_message({
+                    "type": "AccountBalance",
+                    "data": {"account-number": "5WX01234", "cash-balance": "500.0",
+                             "updated-at": "2023-10-19T13:00:00.000+00:00"},
+                })
+                return {("5WX01234", "positions"): [position("SPY", "SPY", 100)],
+                        ("5WX01234", "balances"): {"account-number": "5WX01234", "cash-balance": "1000.0",
+                                                   "updated-at": "2023-10-19T14:00:00Z"}}
+
+        book = ReplayingBook("st-abcabc123123", self.API_URL, ["5WX01234"])
+        events = []
+        book.add_listener(lambda kind, key, data: events.append(kind))
+        book.resync()
+
+        self.assertEqual(book.get_position("5WX01234", "SPY")["quantity"], 100)
+        self.assertEqual(book.get_balances("5WX01234")["cash-balance"], "1000.0")
+        self.assertEqual(events, ["resync"])
+
+    def test_state_is_abstract(self):
+        with self.assertRaises(TypeError):
+            StreamedAccountState(["5WX01234"])
+
+    def test_detach_removes_the_listeners(self):
+        streamer = TastytradeStreamer("st-abcabc123123", "wss://streamer.tastyworks.com")
+        self.book.attach(streamer)
+        self.book.detach()
+        message = {"type": "CurrentPosition",
+                   "data": position("SPY", "SPY", 150, updated_at="2023-10-19T15:00:00.000+00:00")}
+
+        streamer.handle_message(None, json.dumps(message))
+
+        self.assertEqual(self.book.get_position("5WX01234", "SPY")["quantity"], 100)
+        self.assertEqual(streamer.listeners["CurrentPosition"], [])
+        self.assertEqual(streamer.connection_listeners, [])
+
+    def test_streamer_listeners_run_with_custom_message_callback(self):
+        received = []
+        streamer = TastytradeStreamer("st-abcabc123123", "wss://streamer.tastyworks.com",
+                                      message_callback=lambda ws, message: received.append(message))
+        self.book.attach(streamer)
+        message = {"type": "CurrentPosition",
+                   "data": position("SPY", "SPY", 150, updated_at="2023-10-19T15:00:00.000+00:00")}
+
+        streamer.handle_message(None, json.dumps(message))
+
+        self.assertEqual(len(received), 1)
+        self.assertEqual(self.book.get_position("5WX01234", "SPY")["quantity"], 150)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import math
+import time
+import unittest
+from tastytrade_api.streamer.dx_mapping import Greeks, Quote, parse_events
+from tastytrade_api.streamer.quote_book import QuoteBook
+
+SPY_PUT = "SPY   231020P00400000"
+SPY_PUT_STREAMER = ".SPY231020P400"
+QUOTE_FIELDS = ["eventSymbol", "eventTime", "sequence", "timeNanoPart", "bidTime", "bidExchangeCode", "bidPrice",
+                "bidSize", "askTime", "askExchangeCode", "askPrice", "askSize"]
+
+
+def quote_values(symbol, bid, ask):
+    return [symbol, 0, 0, 0, 0, "Q", bid, 10, 0, "Q", ask, "NaN"]
+
+
+class TestParseEvents(unittest.TestCase):
+
+    def test_header_message(self):
+        events = parse_events([["Quote", QUOTE_FIELDS], quote_values("SPY", 430.1, 430.2)])
+        self.assertEqual(len(events), 1)
+        self.assertIsInstance(events[0], Quote)
+        self.assertEqual((events[0].symbol, events[0].bid_price, events[0].ask_price), ("SPY", 430.1, 430.2))
+        self.assertIsNone(events[0].ask_size)
+
+    def test_compact_message_holds_several_events(self):
+        events = parse_events(["Quote", quote_values("SPY", 430.1, 430.2) + quote_values("QQQ", 350.0, 350.1)])
+        self.assertEqual([event.symbol for event in events], ["SPY", "QQQ"])
+
+    def test_greeks(self):
+        events = parse_events(["Greeks", [SPY_PUT_STREAMER, 0, 0, 0, 0, 0, 2.5, 0.2, -0.3, 0.01, -0.05, "NaN",
+                                          0.1]])
+        self.assertIsInstance(events[0], Greeks)
+        self.assertEqual(events[0].delta, -0.3)
+        self.assertTrue(math.isnan(events[0].rho))
+
+    def test_other_messages_are_ignored(self):
+        self.assertEqual(parse_events(["Trade", ["SPY", 0, 1.0]]), [])
+        self.assertEqual(parse_events([]), [])
+        self.assertEqual(parse_events(["Quote", [["SPY", 1.0]]]), [])
+
+
+class TestQuoteBook(unittest.TestCase):
+
+    def setUp(self):
+        self.book = QuoteBook()
+
+    def test_lookup_by_tastytrade_or_streamer_symbol(self):
+        self.book.handle_data(["Quote", quote_values(SPY_PUT_STREAMER, "2.10", "2.20")])
+        self.assertEqual(self.book.get(SPY_PUT), (2.1, 2.2))
+        self.assertEqual(self.book.get(SPY_PUT_STREAMER), (2.1, 2.2))
+
+    def test_invalid_quotes_are_ignored(self):
+        self.book.on_quote("SPY", 430.1, 430.2)
+        self.book.on_quote("SPY", "NaN", 430.3)
+        self.book.on_quote("SPY", None, 430.3)
+        self.assertEqual(self.book.get("SPY"), (430.1, 430.2))
+        self.assertIsNone(self.book.get("QQQ"))
+
+    def test_old_quotes_are_missing(self):
+        self.book.on_quote("SPY", 430.1, 430.2)
+        time.sleep(0.02)
+        self.assertIsNone(self.book.get("SPY", max_age=0.01))
+        self.assertEqual(self.book.get("SPY", max_age=5), (430.1, 430.2))
+
+
+if __name__ == '__main__':
+    unittest.main()
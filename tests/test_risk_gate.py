@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import unittest
+import requests_mock
+from tastytrade_api.account.order_builder import build_leg, build_order
+from tastytrade_api.account.risk_gate import PreTradeRiskGate
+
+
+class TestPreTradeRiskGate(unittest.TestCase):
+    API_URL = "https://api.tastytrade.com"
+
+    @requests_mock.Mocker()
+    def setUp(self, mock):
+        mock.get(f"{self.API_URL}/accounts/5WX01234/position-limit", status_code=404)
+        mock.get(f"{self.API_URL}/instruments/quantity-decimal-precisions", json={
+            "data": {"items": [{"instrument-type": "Equity", "symbol": None, "value": 0}]}
+        })
+        mock.get(f"{self.API_URL}/accounts/5WX01234/balances", json={
+            "data": {"net-liquidating-value": "10000.0", "equity-buying-power": "2000.0"}
+        })
+        mock.get(f"{self.API_URL}/accounts/5WX01234/positions", json={"data": {"items": [{
+            "symbol": "SPY", "underlying-symbol": "SPY", "quantity": 5, "quantity-direction": "Long",
+            "instrument-type": "Equity", "close-price": "400.0", "multiplier": 1,
+        }]}})
+        self.gate = PreTradeRiskGate("st-abcabc123123", self.API_URL, "5WX01234", max_notional=5000,
+                                     max_concentration=0.25)
+        self.gate.refresh()
+
+    def test_valid_order_passes(self):
+        order = build_order(100.0, [build_leg("Buy to Open", "QQQ", 2, "Equity")], price_effect="Debit")
+        self.assertEqual(self.gate.check(order), [])
+
+    def test_violations_are_reported(self):
+        with self.subTest("Check quantity precision"):
+            order = build_order(100.0, [build_leg("Buy to Open", "QQQ", 1.5, "Equity")], price_effect="Debit")
+            self.assertIn("decimal places", self.gate.check(order)[0])
+        with self.subTest("Check buying power"):
+            order = build_order(300.0, [build_leg("Buy to Open", "QQQ", 10, "Equity")], price_effect="Debit")
+            self.assertIn("equity-buying-power", self.gate.check(order)[0])
+        with self.subTest("Check concentration"):
+            order = build_order(400.0, [build_leg("Buy to Open", "SPY", 2, "Equity")], price_effect="Debit")
+            self.assertIn("SPY exposure", self.gate.check(order)[0])
+
+    def test_validate_raises(self):
+        order = build_order(6000.0, [build_leg("Buy to Open", "QQQ", 1, "Equity")], price_effect="Debit")
+        with self.assertRaises(Exception):
+            self.gate.validate(order)
+
+
+    @requests_mock.Mocker()
+    def test_closing_order_is_allowed(self, mock):
+        mock.get(f"{self.API_URL}/accounts/5WX01234/position-limit", status_code=404)
+        mock.get(f"{self.API_URL}/instruments/quantity-decimal-precisions", json={"data": {"items": []}})
+        mock.get(f"{self.API_URL}/accounts/5WX01234/balances", json={
+            "data": {"net-liquidating-value": "10000.0", "derivative-buying-power": "100.0"}
+        })
+        mock.get(f"{self.API_URL}/accounts/5WX01234/positions", json={"data": {"items": [{
+            "symbol": "SPY   231020P00400000", "underlying-symbol": "SPY", "quantity": 3,
+            "quantity-direction": "Short", "instrument-type": "Equity Option", "mark": "8.0", "multiplier": 100,
+        }]}})
+        gate = PreTradeRiskGate("st-abcabc123123", self.API_URL, "5WX01234", max_concentration=0.25)
+        gate.refresh()
+
+        with self.subTest("Closing the position passes"):
+            order = build_order(8.0, [build_leg("Buy to Close", "SPY   231020P00400000", 3)], price_effect="Debit")
+            self.assertEqual(gate.check(order), [])
+        with self.subTest("Closing more than held is checked"):
+            order = build_order(8.0, [build_leg("Buy to Close", "SPY   231020P00400000", 4)], price_effect="Debit")
+            self.assertIn("derivative-buying-power", gate.check(order)[0])
+        with self.subTest("Adding to the position is checked"):
+            order = build_order(8.0, [build_leg("Sell to Open", "SPY   231020P00400000", 1)])
+            self.assertIn("SPY exposure", gate.check(order)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import unittest
+import requests_mock
+from tastytrade_api.account.risk_off import TastytradeRiskOff, closing_order
+
+API_URL = "https://api.tastytrade.com"
+ACCOUNT_URL = f"{API_URL}/accounts/5WX01234"
+SHORT_PUT = {"account-number": "5WX01234", "symbol": "SPY   231020P00400000", "underlying-symbol": "SPY",
+             "instrument-type": "Equity Option", "quantity": 3, "quantity-direction": "Short"}
+LONG_STOCK = {"account-number": "5WX01234", "symbol": "SPY", "underlying-symbol": "SPY",
+              "instrument-type": "Equity", "quantity": 100, "quantity-direction": "Long"}
+WORKING = {"id": 7, "account-number": "5WX01234", "status": "Live", "underlying-symbol": "SPY"}
+
+
+class TestClosingOrder(unittest.TestCase):
+
+    def test_market_order_has_no_price(self):
+        order = closing_order(SHORT_PUT)
+        self.assertEqual(order["order-type"], "Market")
+        self.assertNotIn("price", order)
+        self.assertEqual(order["legs"][0]["action"], "Buy to Close")
+        self.assertEqual(order["legs"][0]["quantity"], 3)
+
+    def test_limit_order_requires_a_price(self):
+        with self.assertRaises(Exception):
+            closing_order(SHORT_PUT, "Limit")
+
+    def test_limit_price_effect_follows_the_side(self):
+        self.assertEqual(closing_order(SHORT_PUT, "Limit", 8.0)["price-effect"], "Debit")
+        self.assertEqual(closing_order(LONG_STOCK, "Limit", 400.0)["price-effect"], "Credit")
+
+
+class TestFlatten(unittest.TestCase):
+
+    def setUp(self):
+        self.risk_off = TastytradeRiskOff("st-abcabc123123", API_URL)
+
+    def mock_accounts(self, mock, cancel_status=200, cancelled_status="Cancelled"):
+        mock.get(f"{ACCOUNT_URL}/orders/live", json={"data": {"items": [WORKING]}})
+        mock.delete(f"{ACCOUNT_URL}/orders/7", status_code=cancel_status,
+                    json={"data": dict(WORKING, status="Cancel Requested")})
+        mock.get(f"{ACCOUNT_URL}/orders/7", json={"data": dict(WORKING, status=cancelled_status)})
+        mock.get(f"{ACCOUNT_URL}/positions", json={"data": {"items": [SHORT_PUT]}})
+        return mock.post(f"{ACCOUNT_URL}/orders", json={"data": {"order": {"id": 8, "status": "Routed"}}})
+
+    @requests_mock.Mocker()
+    def test_closes_after_cancels_are_confirmed(self, mock):
+        create = self.mock_accounts(mock)
+
+        result = self.risk_off.flatten(["5WX01234"])
+
+        self.assertTrue(result.ok)
+        self.assertIn(("cancel", "5WX01234", 7), result.results)
+        self.assertIn(("close", "5WX01234", SHORT_PUT["symbol"]), result.results)
+        self.assertEqual(create.call_count, 1)
+        self.assertEqual(create.last_request.json()["legs"][0]["action"], "Buy to Close")
+        self.assertNotIn("price", create.last_request.json())
+
+    @requests_mock.Mocker()
+    def test_failed_cancel_stops_before_closing(self, mock):
+        create = self.mock_accounts(mock, cancel_status=422)
+
+        result = self.risk_off.flatten(["5WX01234"])
+
+        self.assertFalse(result.ok)
+        self.assertIn(("cancel", "5WX01234", 7), result.errors)
+        self.assertIn(("flatten", None, None), result.errors)
+        self.assertEqual(create.call_count, 0)
+
+    @requests_mock.Mocker()
+    def test_unconfirmed_cancel_stops_before_closing(self, mock):
+        create = self.mock_accounts(mock, cancelled_status="Cancel Requested")
+
+        result = self.risk_off.flatten(["5WX01234"], cancel_timeout=0.05, poll_interval=0.01)
+
+        self.assertIn(("cancel", "5WX01234", 7), result.errors)
+        self.assertEqual(create.call_count, 0)
+
+    @requests_mock.Mocker()
+    def test_limit_without_prices_sends_nothing(self, mock):
+        create = self.mock_accounts(mock)
+        with self.assertRaises(Exception):
+            self.risk_off.flatten(["5WX01234"], order_type="Limit")
+        self.assertEqual(create.call_count, 0)
+        self.assertFalse(any(request.method == "DELETE" for request in mock.request_history))
+
+        with self.subTest("Without cancel_first"):
+            with self.assertRaises(Exception):
+                self.risk_off.flatten(["5WX01234"], order_type="Limit", cancel_first=False)
+            self.assertEqual(mock.call_count, 0)
+
+    @requests_mock.Mocker()
+    def test_limit_closing_order_uses_the_price(self, mock):
+        create = self.mock_accounts(mock)
+
+        result = self.risk_off.flatten(["5WX01234"], order_type="Limit", prices={SHORT_PUT["symbol"]: 8.0})
+
+        self.assertTrue(result.ok)
+        self.assertEqual(create.last_request.json()["price"], 8.0)
+        self.assertEqual(create.last_request.json()["price-effect"], "Debit")
+
+
+if __name__ == '__main__':
+    unittest.main()
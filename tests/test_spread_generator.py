@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import unittest
+import numpy as np
+from tastytrade_api.account.spread_generator import ChainArrays, iron_condor_candidates, vertical_candidates
+
+
+class TestSpreadGenerator(unittest.TestCase):
+    def setUp(self):
+        chain = {"root-symbol": "SPY", "expirations": [{"expiration-date": "2023-10-20", "strikes": [
+            {"strike-price": f"{strike}.0", "call": f"SPY   231020C{strike * 1000:08d}",
+             "put": f"SPY   231020P{strike * 1000:08d}"}
+            for strike in range(420, 399, -1)
+        ]}]}
+        self.chain = ChainArrays.from_nested_chain(chain, "2023-10-20")
+        strikes = self.chain.strikes
+        self.chain.call_bid[:] = np.maximum(415 - strikes, 0) + 0.1 * (420 - strikes)
+        self.chain.call_ask[:] = self.chain.call_bid + 0.1
+        self.chain.put_bid[:] = np.maximum(strikes - 405, 0) + 0.1 * (strikes - 400)
+        self.chain.put_ask[:] = self.chain.put_bid + 0.1
+        self.chain.call_delta[:] = np.linspace(0.9, 0.1, len(strikes))
+
+    def test_chain_is_sorted_by_strike(self):
+        self.assertEqual(self.chain.strikes[0], 400.0)
+        self.assertEqual(self.chain.put_symbols[0], "SPY   231020P00400000")
+
+    def test_vertical_candidates(self):
+        verticals = vertical_candidates(self.chain, "C", widths=[1, 2], short_strike_range=(416, None))
+        self.assertEqual(len(verticals), 7)
+        self.assertTrue(np.all(verticals.strikes[:, 1] > verticals.strikes[:, 0]))
+        first = verticals.strikes.tolist().index([416.0, 417.0])
+        self.assertAlmostEqual(verticals.natural[first], 0.0)
+        self.assertAlmostEqual(verticals.mid[first], 0.1)
+
+        with self.subTest("Filter by delta"):
+            verticals = vertical_candidates(self.chain, "C", widths=[1], short_delta_range=(None, 0.2))
+            self.assertTrue(np.all(verticals.short_delta <= 0.2))
+
+    def test_iron_condors_and_orders(self):
+        calls = vertical_candidates(self.chain, "C", widths=[5], short_strike_range=(410, None))
+        puts = vertical_candidates(self.chain, "P", widths=[5], short_strike_range=(None, 410))
+        condors = iron_condor_candidates(calls, puts)
+        self.assertTrue(np.all(condors.strikes[:, 2] < condors.strikes[:, 0]))
+
+        best = condors.select(np.argsort(-condors.mid)[:1])
+        order = best.to_order(0)
+        self.assertEqual([leg["action"] for leg in order["legs"]],
+                         ["Sell to Open", "Buy to Open", "Sell to Open", "Buy to Open"])
+        self.assertEqual(order["price"], round(float(best.mid[0]), 2))
+        self.assertEqual(order["price-effect"], "Credit")
+
+    def test_debit_candidate_order(self):
+        verticals = vertical_candidates(self.chain, "C", widths=[1], short_strike_range=(416, 416))
+        verticals.mid[0] = -0.35
+
+        order = verticals.to_order(0)
+
+        self.assertEqual(order["price"], 0.35)
+        self.assertEqual(order["price-effect"], "Debit")
+        self.assertEqual([leg["action"] for leg in order["legs"]], ["Sell to Open", "Buy to Open"])
+
+    def test_unquoted_candidate_order_raises(self):
+        verticals = vertical_candidates(self.chain, "C", widths=[1], short_strike_range=(416, 416))
+        verticals.mid[0] = np.nan
+
+        with self.assertRaises(Exception):
+            verticals.to_order(0)
+        self.assertEqual(verticals.to_order(0, price=0.35)["price"], 0.35)
+        self.assertNotIn("price", verticals.to_order(0, order_type="Market"))
+
+
+if __name__ == '__main__':
+    unittest.main()
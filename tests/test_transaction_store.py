@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import datetime
+import math
+import unittest
+import requests_mock
+from tastytrade_api.account.transaction_store import TransactionStore, transaction_row
+from tastytrade_api.account.transactions import signed_amount
+
+API_URL = "https://api.tastytrade.com"
+TRANSACTIONS_URL = f"{API_URL}/accounts/5WX01234/transactions"
+
+
+def transaction(transaction_id, date, transaction_type="Trade", net_value="98.0", net_value_effect="Credit"):
+    return {
+        "id": transaction_id, "account-number": "5WX01234", "transaction-date": date,
+        "executed-at": f"{date}T14:00:00.000+00:00", "transaction-type": transaction_type, "symbol": "SPY",
+        "underlying-symbol": "SPY", "quantity": "1", "price": "1.0", "value": "100.0", "value-effect": "Credit",
+        "net-value": net_value, "net-value-effect": net_value_effect, "commission": "1.0",
+        "commission-effect": "Debit", "clearing-fees": "1.0", "clearing-fees-effect": "Debit",
+    }
+
+
+class TestTransactionStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = TransactionStore("st-abcabc123123", API_URL, "5WX01234")
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_signed_amount(self):
+        self.assertEqual(signed_amount("1.5", "Debit"), -1.5)
+        self.assertEqual(signed_amount("1.5", "Credit"), 1.5)
+        self.assertTrue(math.isnan(signed_amount(None, "Debit")))
+
+    def test_transaction_row_signs_amounts(self):
+        row = transaction_row(transaction(1, "2023-10-02", net_value="102.0", net_value_effect="Debit"))
+        self.assertEqual(row[11:14], (100.0, -102.0, -2.0))
+
+    @requests_mock.Mocker()
+    def test_sync_only_fetches_missing_days(self, mock):
+        mock.get(TRANSACTIONS_URL, json={"data": {"items": [
+            transaction(1, "2023-10-02"), transaction(2, "2023-10-03", "Money Movement", "500.0")
+        ]}})
+
+        self.assertEqual(self.store.sync(datetime.date(2023, 10, 2), datetime.date(2023, 10, 3)), 2)
+        with self.subTest("Check nothing missing"):
+            self.assertEqual(self.store.missing_ranges(datetime.date(2023, 10, 1), datetime.date(2023, 10, 4)),
+                             [(datetime.date(2023, 10, 1), datetime.date(2023, 10, 1)),
+                              (datetime.date(2023, 10, 4), datetime.date(2023, 10, 4))])
+
+        self.store.sync(datetime.date(2023, 10, 2), datetime.date(2023, 10, 3))
+        with self.subTest("Check synced days are not fetched again"):
+            self.assertEqual(mock.call_count, 1)
+        with self.subTest("Check totals"):
+            self.assertEqual(self.store.totals(), {"Trade": {"count": 1, "net-value": 98.0, "fees": -2.0},
+                                                   "Money Movement": {"count": 1, "net-value": 500.0, "fees": -2.0}})
+        with self.subTest("Check filters"):
+            self.assertEqual([t["id"] for t in self.store.get_transactions(transaction_type="Trade")], [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
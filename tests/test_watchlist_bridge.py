@@ -0,0 +1,111 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import asyncio
+import json
+import unittest
+from tastytrade_api.streamer.dxfeed_handler import CometdWebsocketClient
+from tastytrade_api.streamer.watchlist_bridge import WatchlistFeedBridge, entry_streamer_symbol
+
+
+class FakeWebsocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message)[0])
+
+
+class FakeInstruments:
+    def get_futures(self, symbols):
+        return [{"symbol": symbol, "streamer-symbol": f"{symbol}:XCME"} for symbol in symbols]
+
+    def get_future_options(self, symbols):
+        return []
+
+
+def watchlist(name, symbols):
+    return {"name": name, "watchlist-entries": [{"symbol": symbol} for symbol in symbols]}
+
+
+class TestWatchlistFeedBridge(unittest.TestCase):
+    def setUp(self):
+        self.client = CometdWebsocketClient("wss://example", "token", None)
+        self.client.client_id = "client"
+        self.client.websocket = FakeWebsocket()
+        self.bridge = WatchlistFeedBridge(self.client, batch_size=2)
+
+    @property
+    def sent(self):
+        return self.client.websocket.sent
+
+    def test_entry_streamer_symbol(self):
+        self.assertEqual(entry_streamer_symbol({"symbol": "SPY   231020P00400000"}), ".SPY231020P400")
+        self.assertEqual(entry_streamer_symbol({"symbol": "/ESZ3", "streamer-symbol": "/ESZ23:XCME"}), "/ESZ23:XCME")
+        self.assertEqual(entry_streamer_symbol({"symbol": "/ESZ3"}, {"/ESZ3": "/ESZ23:XCME"}), "/ESZ23:XCME")
+        self.assertIsNone(entry_streamer_symbol({"symbol": "/ESZ3"}))
+
+    def test_batches_are_split(self):
+        self.bridge.set_watchlist(watchlist("Main", ["AAPL", "MSFT", "QQQ", "SPY", "TSLA"]))
+
+        self.assertEqual(asyncio.run(self.bridge.sync()), 3)
+
+        self.assertEqual([message["data"]["add"]["Quote"] for message in self.sent],
+                         [["AAPL", "MSFT"], ["QQQ", "SPY"], ["TSLA"]])
+        self.assertTrue(all(message["clientId"] == "client" and message["channel"] == "/service/sub"
+                            for message in self.sent))
+        self.assertEqual(len({message["id"] for message in self.sent}), 3)
+
+    def test_removes_are_sent_before_adds(self):
+        self.bridge.set_watchlist(watchlist("Main", ["AAPL", "MSFT"]))
+        asyncio.run(self.bridge.sync())
+        self.sent.clear()
+
+        asyncio.run(self.bridge.update(watchlist("Main", ["MSFT", "QQQ", "SPY"])))
+
+        self.assertEqual([message["data"] for message in self.sent], [
+            {"reset": False, "remove": {"Quote": ["AAPL"]}, "add": {"Quote": ["QQQ"]}},
+            {"reset": False, "add": {"Quote": ["SPY"]}},
+        ])
+        self.assertEqual(self.bridge.subscribed, {"MSFT", "QQQ", "SPY"})
+
+    def test_shared_symbol_stays_subscribed(self):
+        self.bridge.set_watchlists([watchlist("Main", ["AAPL", "SPY"]), watchlist("Indexes", ["SPY", "QQQ"])])
+        asyncio.run(self.bridge.sync())
+        self.sent.clear()
+
+        self.bridge.remove_watchlist("Indexes")
+        asyncio.run(self.bridge.sync())
+
+        self.assertEqual([message["data"] for message in self.sent], [{"reset": False, "remove": {"Quote": ["QQQ"]}}])
+        self.assertEqual(self.bridge.subscribed, {"AAPL", "SPY"})
+
+        with self.subTest("Nothing changed"):
+            self.sent.clear()
+            self.assertEqual(asyncio.run(self.bridge.sync()), 0)
+            self.assertEqual(self.sent, [])
+
+    def test_resubscribe_sends_every_symbol(self):
+        self.bridge.set_watchlist(watchlist("Main", ["AAPL", "SPY"]))
+        asyncio.run(self.bridge.sync())
+        self.sent.clear()
+
+        self.assertEqual(asyncio.run(self.bridge.resubscribe()), 1)
+
+        self.assertEqual([message["data"] for message in self.sent], [{"reset": False, "add": {"Quote": ["AAPL", "SPY"]}}])
+
+    def test_futures_are_resolved(self):
+        self.bridge.set_watchlist(watchlist("Futures", ["/ESZ3", "SPY"]))
+        self.assertEqual(self.bridge.unresolved, ["/ESZ3"])
+        self.assertEqual(self.bridge.desired, {"SPY"})
+
+        self.assertEqual(self.bridge.resolve_streamer_symbols(FakeInstruments()), [])
+        asyncio.run(self.bridge.sync())
+
+        self.assertEqual(self.sent[0]["data"]["add"]["Quote"], ["/ESZ3:XCME", "SPY"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import unittest
+import requests_mock
+from tastytrade_api.account.watchlist_cache import TastytradeWatchlistCache
+
+API_URL = "https://api.tastytrade.com"
+MAIN = {"name": "Main", "watchlist-entries": [{"symbol": "SPY", "instrument-type": "Equity"}]}
+
+
+def entries(*symbols):
+    return [{"symbol": symbol, "instrument-type": "Equity"} for symbol in symbols]
+
+
+class TestWatchlistCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = TastytradeWatchlistCache("st-abcabc123123", API_URL)
+
+    def load(self, mock, *watchlists):
+        mock.get(f"{API_URL}/watchlists", json={"data": {"items": [dict(w, id=i) for i, w in enumerate(watchlists)]}})
+        self.cache.load()
+
+    @requests_mock.Mocker()
+    def test_create(self, mock):
+        self.load(mock)
+        create = mock.post(f"{API_URL}/watchlists", status_code=201, json={"data": MAIN})
+
+        self.cache.put(MAIN)
+        self.assertEqual(self.cache.version("Main"), 1)
+        self.assertEqual(self.cache.diff(), {"Main": "create"})
+
+        _, errors = self.cache.sync()
+
+        self.assertEqual(errors, {})
+        self.assertEqual(create.last_request.json(), MAIN)
+        self.assertEqual(self.cache.diff(), {})
+        self.assertEqual(self.cache.sync(), ({}, {}))
+        self.assertEqual(create.call_count, 1)
+
+    @requests_mock.Mocker()
+    def test_update(self, mock):
+        self.load(mock, MAIN)
+        update = mock.put(f"{API_URL}/watchlists/Main", json={"data": {}})
+
+        self.cache.add_entries("Main", entries("SPY", "QQQ"))
+        self.assertEqual(self.cache.diff(), {"Main": "update"})
+        self.cache.sync()
+
+        self.assertEqual([entry["symbol"] for entry in update.last_request.json()["watchlist-entries"]],
+                         ["SPY", "QQQ"])
+        self.assertEqual(self.cache.diff(), {})
+
+        with self.subTest("Edited back to the synced content"):
+            self.cache.add_entries("Main", entries("IWM"))
+            self.cache.remove_symbols("Main", ["IWM"])
+            self.assertEqual(self.cache.diff(), {})
+            self.cache.sync()
+            self.assertEqual(update.call_count, 1)
+
+    @requests_mock.Mocker()
+    def test_delete(self, mock):
+        self.load(mock, MAIN)
+        delete = mock.delete(f"{API_URL}/watchlists/Main", status_code=204)
+
+        self.cache.delete("Main")
+        self.assertEqual(self.cache.diff(), {"Main": "delete"})
+        self.assertEqual(self.cache.names, [])
+        self.cache.sync()
+
+        self.assertEqual(delete.call_count, 1)
+        self.assertEqual(self.cache.diff(), {})
+        self.assertEqual(self.cache.version("Main"), 0)
+
+    @requests_mock.Mocker()
+    def test_change_during_sync_stays_changed(self, mock):
+        self.load(mock, MAIN)
+
+        def update_response(request, context):
+            self.cache.add_entries("Main", entries("IWM"))
+            return {"data": {}}
+        update = mock.put(f"{API_URL}/watchlists/Main", json=update_response)
+
+        self.cache.add_entries("Main", entries("QQQ"))
+        self.cache.sync()
+
+        self.assertEqual(self.cache.version("Main"), 2)
+        self.assertEqual(self.cache.diff(), {"Main": "update"})
+        mock.put(f"{API_URL}/watchlists/Main", json={"data": {}})
+        self.cache.sync()
+        self.assertEqual([entry["symbol"] for entry in mock.last_request.json()["watchlist-entries"]],
+                         ["SPY", "QQQ", "IWM"])
+        self.assertEqual(update.call_count, 1)
+        self.assertEqual(self.cache.diff(), {})
+
+    @requests_mock.Mocker()
+    def test_failed_sync_is_retried(self, mock):
+        self.load(mock)
+        mock.post(f"{API_URL}/watchlists", status_code=500)
+
+        self.cache.put(MAIN)
+        _, errors = self.cache.sync()
+
+        self.assertEqual(list(errors), ["Main"])
+        self.assertEqual(self.cache.diff(), {"Main": "create"})
+
+    @requests_mock.Mocker()
+    def test_create_then_delete_sends_nothing(self, mock):
+        self.load(mock)
+
+        self.cache.put(MAIN)
+        self.cache.delete("Main")
+
+        self.assertEqual(self.cache.diff(), {})
+        self.assertEqual(self.cache.version("Main"), 0)
+        self.assertEqual(self.cache.sync(), ({}, {}))
+        self.assertEqual(mock.call_count, 1)
+        self.assertNotIn("Main", self.cache._local)
+
+    @requests_mock.Mocker()
+    def test_delete_during_create_is_sent(self, mock):
+        self.load(mock)
+
+        def create_response(request, context):
+            self.cache.delete("Main")
+            context.status_code = 201
+            return {"data": MAIN}
+        mock.post(f"{API_URL}/watchlists", json=create_response)
+        delete = mock.delete(f"{API_URL}/watchlists/Main", status_code=204)
+
+        self.cache.put(MAIN)
+        self.cache.sync()
+        self.assertEqual(self.cache.diff(), {"Main": "delete"})
+        self.cache.sync()
+
+        self.assertEqual(delete.call_count, 1)
+        self.assertNotIn("Main", self.cache._local)
+
+
+if __name__ == '__main__':
+    unittest.main()